@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Maintenance script to benchmark validation of book language codes.
+
+This script:
+- Builds language metadata for a given number of books, mixing single and
+  multi-language books as well as unsupported codes
+- Validates them with per-code pycountry lookups (previous approach) and with the
+  precomputed set of supported codes
+- Checks both approaches agree and reports per-book validation cost
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+
+import pycountry
+
+from cms_backend import logger
+from cms_backend.utils.language import (
+    get_supported_language_codes,
+    is_supported_language_code,
+)
+
+NB_RUNS = 5
+
+
+def legacy_unsupported_languages(language: str) -> list[str]:
+    """Validation used before the precomputed set, kept as a reference"""
+    return [
+        code
+        for code in language.split(",")
+        if pycountry.languages.get(alpha_3=code) is None  # pyright: ignore[reportUnknownMemberType]
+    ]
+
+
+def unsupported_languages(language: str) -> list[str]:
+    return [
+        code for code in language.split(",") if not is_supported_language_code(code)
+    ]
+
+
+def generate_languages(nb_books: int) -> list[str]:
+    rng = random.Random(42)  # noqa: S311
+    codes = sorted(get_supported_language_codes())
+    return [
+        ",".join(
+            rng.choice(codes) if rng.random() > 0.05 else "zz9"  # noqa: PLR2004
+            for _ in range(rng.choice((1, 1, 1, 2, 3)))
+        )
+        for _ in range(nb_books)
+    ]
+
+
+def main(nb_books: int) -> int:
+    languages = generate_languages(nb_books)
+    for language in languages:
+        if legacy_unsupported_languages(language) != unsupported_languages(language):
+            logger.error(f"Validation results differ for '{language}'")
+            return 1
+
+    durations: dict[str, float] = {}
+    for name, validate in (
+        ("pycountry lookups", legacy_unsupported_languages),
+        ("precomputed set", unsupported_languages),
+    ):
+        durations[name] = min(
+            timeit.repeat(
+                lambda validate=validate: [validate(lang) for lang in languages],
+                number=1,
+                repeat=NB_RUNS,
+            )
+        )
+        logger.info(
+            f"{name}: {durations[name] * 1_000_000 / nb_books:.2f}µs per book "
+            f"({nb_books} books)"
+        )
+    logger.info(
+        f"speedup: {durations['pycountry lookups'] / durations['precomputed set']:.1f}x"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark validation of book language codes"
+    )
+    parser.add_argument(
+        "--nb-books",
+        type=int,
+        default=100_000,
+        help="Number of books to validate",
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(main(nb_books=args.nb_books))
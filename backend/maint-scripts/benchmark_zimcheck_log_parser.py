@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Maintenance script to benchmark the parser of raw zimcheck logs.
+
+This script:
+- Loads zimcheck results with a "log" entry from files given on the command line,
+  or generates a synthetic one of the requested size
+- Parses each log with the previous approach (one regex scan per extracted value)
+  and with the current single-scan parser
+- Checks both return the same summary and reports their timings
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import Any
+
+from cms_backend import logger
+from cms_backend.context import parse_bool
+from cms_backend.schemas.orms import ZimcheckSummarySchema
+from cms_backend.utils.zim import parse_zimcheck_log
+
+NB_RUNS = 5
+
+
+def legacy_parse_zimcheck_log(log: str, retcode: int | None) -> ZimcheckSummarySchema:
+    """Parser used before the single-scan one, kept as a reference"""
+    zimcheck_version_match = re.search(
+        r'[\\]*"zimcheck_version[\\]*"\s*:\s*[\\]*"([^"\\]+)[\\]*"',
+        log,
+    )
+    status_match = re.search(
+        r'[\\]*"status[\\]*"\s*:\s*([\\]*"?(?:true|false|[^,}]+)[\\]*"?)',
+        log,
+    )
+    checks_match = re.search(
+        r'[\\]*"checks[\\]*"\s*:\s*\[(.*?)\](?=[,\}]|$)',
+        log,
+        re.DOTALL,
+    )
+
+    warning_count = 0
+    error_count = 0
+    for match in re.findall(
+        r'[\\]*"level[\\]*"\s*:\s*[\\]*["\']?([A-Z]+)[\\]*["\']?',
+        log,
+        re.IGNORECASE,
+    ):
+        level = match.upper()
+        if level == "ERROR":
+            error_count += 1
+        elif level == "WARNING":
+            warning_count += 1
+
+    return ZimcheckSummarySchema(
+        zimcheck_version=zimcheck_version_match.group(1)
+        if zimcheck_version_match
+        else None,
+        status=parse_bool(status_match.group(1)) if status_match else None,
+        error_count=error_count,
+        warning_count=warning_count,
+        checks=[check.strip().strip('"') for check in checks_match[1].split(",")]
+        if checks_match
+        else None,
+        retcode=retcode,
+    )
+
+
+def generate_zimcheck_result(nb_logs: int) -> dict[str, Any]:
+    """A zimcheck result whose JSON output could not be decoded, with nb_logs logs"""
+    logs = [
+        {
+            "check": "url_internal",
+            "level": "ERROR" if index % 3 else "WARNING",
+            "message": f"The following links:\n- ../links/{index}.xml were not found",
+            "links": [f"../links/{index}.xml"],
+            "normalized_link": f"example.com/links/{index}.xml",
+            "path": f"example.com/site/{index}.html",
+        }
+        for index in range(nb_logs)
+    ]
+    output = json.dumps(
+        {
+            "zimcheck_version": "3.6.0",
+            "checks": ["checksum", "integrity", "url_internal", "redirect"],
+            "status": False,
+            "logs": logs,
+        },
+        indent=2,
+    )
+    # truncated output, as happens when zimcheck is interrupted
+    return {"log": output[: -len(output) // 100], "retcode": 1}
+
+
+def benchmark(name: str, zimcheck: dict[str, Any]) -> bool:
+    log, retcode = zimcheck["log"], zimcheck.get("retcode")
+    legacy_summary = legacy_parse_zimcheck_log(log, retcode)
+    summary = parse_zimcheck_log(log, retcode=retcode)
+    if summary != legacy_summary:
+        logger.error(f"{name}: summaries differ\n{legacy_summary}\n{summary}")
+        return False
+
+    legacy_duration = (
+        min(
+            timeit.repeat(
+                lambda: legacy_parse_zimcheck_log(log, retcode),
+                number=1,
+                repeat=NB_RUNS,
+            )
+        )
+        * 1000
+    )
+    duration = (
+        min(
+            timeit.repeat(
+                lambda: parse_zimcheck_log(log, retcode=retcode),
+                number=1,
+                repeat=NB_RUNS,
+            )
+        )
+        * 1000
+    )
+    logger.info(
+        f"{name}: {len(log) / 1_000_000:.1f}MB, {summary.error_count} errors, "
+        f"{summary.warning_count} warnings; legacy: {legacy_duration:.1f}ms, "
+        f"single scan: {duration:.1f}ms ({legacy_duration / duration:.1f}x)"
+    )
+    return True
+
+
+def main(files: list[Path], nb_logs: int) -> int:
+    zimchecks = (
+        {str(file): json.loads(file.read_text()) for file in files}
+        if files
+        else {f"synthetic ({nb_logs} logs)": generate_zimcheck_result(nb_logs)}
+    )
+    results = [
+        benchmark(name, zimcheck)
+        for name, zimcheck in zimchecks.items()
+        if zimcheck.get("log")
+    ]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the parser of raw zimcheck logs"
+    )
+    parser.add_argument(
+        "files",
+        nargs="*",
+        type=Path,
+        help="Zimcheck result JSON files (default: a synthetic result)",
+    )
+    parser.add_argument(
+        "--nb-logs",
+        type=int,
+        default=200_000,
+        help="Number of logs in the synthetic result",
+    )
+
+    args = parser.parse_args()
+
+    sys.exit(main(files=args.files, nb_logs=args.nb_logs))
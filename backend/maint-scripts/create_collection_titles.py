@@ -22,8 +22,8 @@ from sqlalchemy.orm import sessionmaker
 from cms_backend import logger
 from cms_backend.context import get_mandatory_env
 from cms_backend.db import cms_dumps, cms_loads
+from cms_backend.db.event_log import log_event
 from cms_backend.db.models import Collection, CollectionTitle, Title
-from cms_backend.utils.datetime import getnow
 
 # List of folders to create titles for
 FOLDERS = {
@@ -96,7 +96,7 @@ def create_title_for_folder(
     else:
         # Create new title
         title = Title(name=title_name)
-        title.events.append(f"{getnow()}: maintenance script: title created")
+        log_event(title, "maintenance script: title created")
         session.add(title)
         session.flush()
         logger.info(f"Created title '{title_name}'")
@@ -122,9 +122,10 @@ def create_title_for_folder(
         collection_title.collection = collection
         collection_title.title = title
         session.add(collection_title)
-        title.events.append(
-            f"{getnow()}: maintenance script: associated with "
-            f"collection '{collection.name}' at path {folder_name}"
+        log_event(
+            title,
+            f"maintenance script: associated with "
+            f"collection '{collection.name}' at path {folder_name}",
         )
         logger.info(
             f"Associated title '{title_name}' with collection "
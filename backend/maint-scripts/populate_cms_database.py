@@ -9,6 +9,11 @@ This script:
 - Requires python-libzim to read ZIM metadata
 - Populates title and book events with maintenance script attribution
 
+ZIM metadata is read by a pool of worker processes while the main process records
+books in batches, one transaction per batch. With --checkpoint, files recorded
+(or found already recorded) are saved in a JSON lines file, and skipped without
+being opened on next runs as long as their size and modification time are the same.
+
 Environment variables required:
 - DATABASE_URL: PostgreSQL connection string
 - LOCAL_WAREHOUSE_PATHS: Comma-separated list of warehouse_id:path pairs
@@ -22,9 +27,14 @@ from __future__ import annotations
 
 import base64
 import io
+import itertools
+import json
 import os
 import pathlib
 import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, NamedTuple
 from uuid import UUID
@@ -37,6 +47,7 @@ from sqlalchemy.orm import sessionmaker
 from cms_backend import logger
 from cms_backend.context import get_mandatory_env
 from cms_backend.db import cms_dumps, cms_loads
+from cms_backend.db.event_log import log_event
 from cms_backend.db.models import Book, BookLocation, Collection, CollectionTitle, Title
 from cms_backend.db.title import get_title_by_name_or_none
 from cms_backend.utils.datetime import getnow
@@ -237,7 +248,7 @@ def get_or_create_title(
         # Create new title
         title = Title(name=name)
         title.maturity = title_maturity
-        title.events.append(f"{getnow()}: maintenance script: title created")
+        log_event(title, "maintenance script: title created")
         session.add(title)
 
     # Check if collection association exists
@@ -253,10 +264,11 @@ def get_or_create_title(
         collection_title.collection = collection
         collection_title.title = title
         session.add(collection_title)
-        title.events.append(
-            f"{getnow()}: maintenance script: associated with "
+        log_event(
+            title,
+            f"maintenance script: associated with "
             f"collection '{collection.name}' at path "
-            f"{title_path}"
+            f"{title_path}",
         )
         logger.info(f"Associated title '{name}' with collection '{collection.name}'")
 
@@ -265,24 +277,18 @@ def get_or_create_title(
     return title
 
 
-def book_exists_at_location(
-    session: OrmSession,
-    *,
-    warehouse_id: UUID,
-    path: Path,
-    filename: str,
-) -> Book | None:
-    """Check if a book already exists at a specific location."""
-    stmt = (
-        select(Book)
-        .join(BookLocation)
-        .where(
-            BookLocation.warehouse_id == warehouse_id,
-            BookLocation.path == path,
-            BookLocation.filename == filename,
-        )
-    )
-    return session.scalars(stmt).first()
+def get_warehouse_locations(
+    session: OrmSession, warehouse_id: UUID
+) -> set[tuple[Path, str]]:
+    """(path, filename) of every book location in a warehouse"""
+    return {
+        (path, filename)
+        for path, filename in session.execute(
+            select(BookLocation.path, BookLocation.filename).where(
+                BookLocation.warehouse_id == warehouse_id
+            )
+        ).all()
+    }
 
 
 def determine_location_kind(
@@ -333,15 +339,11 @@ def _create_book_from_zim(
         flavour=zim_metadata.get("Flavour", ""),
         zimfarm_notification=None,
     )
-    book.events.append(
-        f"{getnow()}: maintenance script: book created from existing ZIM file"
-    )
+    log_event(book, "maintenance script: book created from existing ZIM file")
 
     book.title = title
     title.books.append(book)
-    title.events.append(
-        f"{getnow()}: maintenance script: book {book.id} added to title"
-    )
+    log_event(title, f"maintenance script: book {book.id} added to title")
 
     session.add(book)
 
@@ -355,9 +357,8 @@ def _create_book_from_zim(
     )
     session.add(location)
     book.locations.append(location)
-    book.events.append(
-        f"{getnow()}: maintenance script: added current location: "
-        f"{zim_path_in_warehouse}"
+    log_event(
+        book, f"maintenance script: added current location: {zim_path_in_warehouse}"
     )
 
     book.location_kind = determine_location_kind(
@@ -425,66 +426,162 @@ def get_kiwix_path_from_staging_name(name: str) -> Path:
         raise Exception(f"Unexpected staging ZIM name: {name}")
 
 
-def process_zim_file(
-    ctx: Context,
-    session: OrmSession,
-    *,
-    warehouse_id: UUID,
-    warehouse_path: Path,
-    zim_file: Path,
-) -> None:
-    """Process a single ZIM file"""
+class ZimFile(NamedTuple):
+    """A ZIM file found in a warehouse"""
 
-    # Calculate relative path within warehouse
-    zim_path_in_warehouse = zim_file.relative_to(warehouse_path)
+    path: Path
+    path_in_warehouse: Path
+    size: int
+    mtime_ns: int
 
-    if zim_file.with_suffix(".delete").exists():
-        logger.info(f"Ignoring ZIM marked for deletion: {zim_path_in_warehouse}")
-        return
 
-    logger.info(f"Processing: {zim_path_in_warehouse}")
+class ZimFileInfo(NamedTuple):
+    """Metadata read from a ZIM file, None if it could not be read"""
 
-    # Check if book already exists at this location
-    if existing_book := book_exists_at_location(
-        session,
-        warehouse_id=warehouse_id,
-        path=zim_path_in_warehouse.parent,
-        filename=zim_path_in_warehouse.name,
-    ):
-        logger.info(
-            f"Book already exists for '{zim_path_in_warehouse.name}' at "
-            f"{zim_path_in_warehouse.parent} in {warehouse_id=} with ID: "
-            f"{existing_book.id}), skipping"
+    zim_file: ZimFile
+    zim_info: dict[str, Any] | None
+
+
+class Checkpoint:
+    """ZIM files already recorded in the database, persisted as JSON lines"""
+
+    def __init__(self, path: Path | None):
+        self.path = path
+        self.entries: dict[tuple[str, str], tuple[int, int]] = {}
+        if path is None or not path.exists():
+            return
+        with path.open() as fh:
+            for line in fh:
+                entry = json.loads(line)
+                self.entries[(entry["warehouse_id"], entry["path"])] = (
+                    entry["size"],
+                    entry["mtime_ns"],
+                )
+        logger.info(f"Loaded {len(self.entries)} checkpoint entries from {path}")
+
+    @staticmethod
+    def _key(warehouse_id: UUID, zim_file: ZimFile) -> tuple[str, str]:
+        return (str(warehouse_id), str(zim_file.path_in_warehouse))
+
+    def contains(self, warehouse_id: UUID, zim_file: ZimFile) -> bool:
+        """Whether the ZIM file was recorded, unchanged since then"""
+        return self.entries.get(self._key(warehouse_id, zim_file)) == (
+            zim_file.size,
+            zim_file.mtime_ns,
         )
-        return
 
-    # Read ZIM metadata to get the title name
+    def add(self, warehouse_id: UUID, zim_files: Iterable[ZimFile]):
+        """Record ZIM files, to be called once they are committed in the database"""
+        lines: list[str] = []
+        for zim_file in zim_files:
+            self.entries[self._key(warehouse_id, zim_file)] = (
+                zim_file.size,
+                zim_file.mtime_ns,
+            )
+            lines.append(
+                json.dumps(
+                    {
+                        "warehouse_id": str(warehouse_id),
+                        "path": str(zim_file.path_in_warehouse),
+                        "size": zim_file.size,
+                        "mtime_ns": zim_file.mtime_ns,
+                    }
+                )
+                + "\n"
+            )
+        if self.path is None or not lines:
+            return
+        with self.path.open("a") as fh:
+            fh.writelines(lines)
+
+
+def list_zim_files(warehouse_path: Path) -> list[ZimFile]:
+    """ZIM files of a warehouse, except those not to be recorded"""
+    zim_files: list[ZimFile] = []
+    for zim_path in sorted(warehouse_path.rglob("*.zim")):
+        # ignore files specially crafted for DL speed tests, not needed in CMS
+        if zim_path.name.startswith("speedtest_"):
+            continue
+        zim_path_in_warehouse = zim_path.relative_to(warehouse_path)
+        if zim_path.with_suffix(".delete").exists():
+            logger.info(f"Ignoring ZIM marked for deletion: {zim_path_in_warehouse}")
+            continue
+        stat = zim_path.stat()
+        zim_files.append(
+            ZimFile(
+                path=zim_path,
+                path_in_warehouse=zim_path_in_warehouse,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            )
+        )
+    return zim_files
+
+
+def read_zim_file(zim_file: ZimFile) -> ZimFileInfo:
+    """Read metadata of a ZIM file (in a worker process)"""
     try:
-        zim_info = get_zim_info(zim_file)
+        return ZimFileInfo(zim_file=zim_file, zim_info=get_zim_info(zim_file.path))
     except Exception:
-        logger.exception(f"encountered exception while reading {zim_file} metadata")
-        return
+        logger.exception(
+            f"encountered exception while reading {zim_file.path} metadata"
+        )
+        return ZimFileInfo(zim_file=zim_file, zim_info=None)
+
+
+def read_zim_files(
+    executor: Executor, zim_files: Iterable[ZimFile], *, max_pending: int
+) -> Iterator[ZimFileInfo]:
+    """Metadata of ZIM files, in order, read by executor
+
+    At most max_pending files are read ahead so that memory use (illustrations are
+    big) does not depend on the number of files.
+    """
+    pending: deque[Future[ZimFileInfo]] = deque()
+    for zim_file in zim_files:
+        pending.append(executor.submit(read_zim_file, zim_file))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def process_zim_info(
+    ctx: Context,
+    session: OrmSession,
+    *,
+    warehouse_id: UUID,
+    zim_file: ZimFile,
+    zim_info: dict[str, Any],
+) -> bool:
+    """Record a book from metadata of a ZIM file
+
+    Returns whether the book has been recorded.
+    """
+    zim_path_in_warehouse = zim_file.path_in_warehouse
+
+    logger.info(f"Processing: {zim_path_in_warehouse}")
 
     missing_keys = get_missing_keys(zim_info, "metadata", "id", "article_count", "size")
     # Check if media_count is in the zim_info. The get_missing_keys fn considers
     # falsy values as absent but a media_count of 0 is acceptable.
     if zim_info.get("media_count") is None:
-        logger.warning(f"{zim_file} is missing media_count information.")
-        return
+        logger.warning(f"{zim_file.path} is missing media_count information.")
+        return False
 
     if missing_keys:
         logger.warning(
-            f"{zim_file} is missing mandatory keys: {','.join(missing_keys)}"
+            f"{zim_file.path} is missing mandatory keys: {','.join(missing_keys)}"
         )
-        return
+        return False
 
     missing_metadata_keys = get_missing_metadata_keys(zim_info["metadata"])
     if missing_metadata_keys:
         logger.warning(
-            f"{zim_file} is missing mandatory metadata: "
+            f"{zim_file.path} is missing mandatory metadata: "
             f"{','.join(missing_metadata_keys)}"
         )
-        return
+        return False
 
     normalized_name = normalize_zim_name(zim_info["id"], zim_info["metadata"]["Name"])
 
@@ -514,13 +611,13 @@ def process_zim_file(
             f"No collection found for warehouse {warehouse_id}. Skipping "
             f"{zim_path_in_warehouse}..."
         )
-        return
+        return False
     if len(collections) > 1:
         logger.error(
             f"Multiple collections found for warehouse {warehouse_id}. "
             f"Unsure how to handle. Skipping {zim_path_in_warehouse}..."
         )
-        return
+        return False
 
     title = get_or_create_title(
         session,
@@ -538,14 +635,19 @@ def process_zim_file(
         title=title,
         zim_info=zim_info,
     )
+    return True
 
 
 def scan_warehouse(
     ctx: Context,
     db_session: sessionmaker[OrmSession],
+    executor: Executor,
+    checkpoint: Checkpoint,
     *,
     local_warehouse_id: UUID,
     local_warehouse_path: Path,
+    batch_size: int,
+    max_pending: int,
 ) -> None:
     """Scan a warehouse for ZIM files and process them."""
     logger.info(f"Scanning warehouse {local_warehouse_id}:{local_warehouse_path}...")
@@ -554,28 +656,65 @@ def scan_warehouse(
         logger.warning(f"Warehouse path does not exist: {local_warehouse_path}")
         return
 
-    zim_files = sorted(local_warehouse_path.rglob("*.zim"))
+    zim_files = list_zim_files(local_warehouse_path)
 
     logger.info(f"Found {len(zim_files)} ZIM file(s) in {local_warehouse_path}")
 
+    with db_session.begin() as session:
+        known_locations = get_warehouse_locations(session, local_warehouse_id)
+
+    zim_files_to_read: list[ZimFile] = []
+    already_recorded: list[ZimFile] = []
+    nb_checkpointed = 0
     for zim_file in zim_files:
-        # ignore files specially crafted for DL speed tests, not needed in CMS
-        if zim_file.name.startswith("speedtest_"):
-            continue
+        if checkpoint.contains(local_warehouse_id, zim_file):
+            nb_checkpointed += 1
+        elif (
+            zim_file.path_in_warehouse.parent,
+            zim_file.path_in_warehouse.name,
+        ) in known_locations:
+            already_recorded.append(zim_file)
+        else:
+            zim_files_to_read.append(zim_file)
+    checkpoint.add(local_warehouse_id, already_recorded)
+    logger.info(
+        f"Skipping {nb_checkpointed} checkpointed and {len(already_recorded)} "
+        f"already recorded ZIM file(s), {len(zim_files_to_read)} to process"
+    )
+
+    nb_recorded = 0
+    for batch in itertools.batched(
+        read_zim_files(executor, zim_files_to_read, max_pending=max_pending),
+        batch_size,
+        strict=False,
+    ):
+        recorded: list[ZimFile] = []
         with db_session.begin() as session:
-            try:
-                process_zim_file(
-                    ctx,
-                    session,
-                    warehouse_id=local_warehouse_id,
-                    warehouse_path=local_warehouse_path,
-                    zim_file=zim_file,
-                )
-            except Exception:
-                logger.exception(f"error processing {zim_file}")
+            for zim_file, zim_info in batch:
+                if zim_info is None:
+                    continue
+                try:
+                    # a savepoint per file so that an error does not lose the batch
+                    with session.begin_nested():
+                        if process_zim_info(
+                            ctx,
+                            session,
+                            warehouse_id=local_warehouse_id,
+                            zim_file=zim_file,
+                            zim_info=zim_info,
+                        ):
+                            recorded.append(zim_file)
+                except Exception:
+                    logger.exception(f"error processing {zim_file.path}")
+        checkpoint.add(local_warehouse_id, recorded)
+        nb_recorded += len(recorded)
+        logger.info(
+            f"Recorded {nb_recorded} book(s) out of "
+            f"{len(zim_files_to_read)} ZIM file(s) to process"
+        )
 
 
-def main():
+def main(*, nb_workers: int, batch_size: int, checkpoint_path: Path | None):
     ctx = Context()
 
     if not ctx.local_warehouse_paths:
@@ -591,24 +730,61 @@ def main():
         )
     )
 
-    for (
-        local_warehouse_id,
-        local_warehouse_path,
-    ) in ctx.local_warehouse_paths.items():
-        try:
-            scan_warehouse(
-                ctx,
-                db_session,
-                local_warehouse_id=local_warehouse_id,
-                local_warehouse_path=local_warehouse_path,
-            )
-        except Exception:
-            logger.exception(
-                "encountered exception scanning local warehouse "
-                f"{local_warehouse_id}:{local_warehouse_path}"
-            )
-            logger.info("Continuing with next warehouse...")
+    checkpoint = Checkpoint(checkpoint_path)
+
+    with ProcessPoolExecutor(max_workers=nb_workers) as executor:
+        for (
+            local_warehouse_id,
+            local_warehouse_path,
+        ) in ctx.local_warehouse_paths.items():
+            try:
+                scan_warehouse(
+                    ctx,
+                    db_session,
+                    executor,
+                    checkpoint,
+                    local_warehouse_id=local_warehouse_id,
+                    local_warehouse_path=local_warehouse_path,
+                    batch_size=batch_size,
+                    # keep workers busy while a batch is recorded
+                    max_pending=nb_workers * 2 + batch_size,
+                )
+            except Exception:
+                logger.exception(
+                    "encountered exception scanning local warehouse "
+                    f"{local_warehouse_id}:{local_warehouse_path}"
+                )
+                logger.info("Continuing with next warehouse...")
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Populate CMS database with existing ZIM books"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes reading ZIM metadata (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=100,
+        help="Number of ZIM files recorded per transaction",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        help="JSON lines file of ZIM files already recorded, updated as they are",
+    )
+
+    args = parser.parse_args()
+
+    main(
+        nb_workers=args.workers,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint,
+    )
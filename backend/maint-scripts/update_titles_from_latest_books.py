@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
 from cms_backend.db import Session
+from cms_backend.db.book import update_title_metadata_from_book
 from cms_backend.db.models import Book, Title
 from cms_backend.db.rules import title_is_missing_mandatory_metadata
 from cms_backend.db.title import get_title_by_id
@@ -51,16 +52,7 @@ def process_title(session: OrmSession, title: Title) -> tuple[bool, str]:
         return (False, "No prod/staging book found meet constraints")
 
     if title_is_missing_mandatory_metadata(title):
-        title.title = book.zim_metadata["Title"]
-        title.creator = book.zim_metadata["Creator"]
-        title.publisher = book.zim_metadata["Publisher"]
-        title.description = book.zim_metadata["Description"]
-        title.language = book.zim_metadata["Language"]
-        title.illustration_48x48_at_1 = book.zim_metadata["Illustration_48x48@1"]
-        title.long_description = book.zim_metadata.get("LongDescription")
-        title.license = book.zim_metadata.get("License")
-        title.relation = book.zim_metadata.get("Relation")
-        title.source = book.zim_metadata.get("Source")
+        update_title_metadata_from_book(session, title, book)
         logger.info(f"✓ Updated title {title.id} ({title.name}) from book {book.id}")
         return (True, "")
     else:
@@ -1,9 +1,8 @@
 import logging
 from uuid import UUID
 
-import pycountry
-
 from cms_backend.context import Context
+from cms_backend.utils.language import get_supported_language_codes
 
 logger = logging.getLogger("backend")
 
@@ -15,14 +14,8 @@ if not logger.hasHandlers():
 
 
 def update_language_codes():
-    for code in Context.disallowed_language_codes:
-        try:
-            pycountry.languages.remove_entry(alpha_3=code)  # pyright: ignore[reportUnknownMemberType]
-        except Exception as exc:
-            logger.warning(f"failed to remove language code '{code}': {exc}")
-
-    for code in Context.custom_language_codes:
-        pycountry.languages.add_entry(alpha_3=code)  # pyright: ignore[reportUnknownMemberType]
+    """Take changes of custom and disallowed language codes into account"""
+    get_supported_language_codes.cache_clear()
 
 
 def construct_recipe_link(recipe_id: UUID | None) -> str | None:
@@ -35,6 +28,3 @@ def construct_recipe_api_link(recipe_id: UUID | None) -> str | None:
     if recipe_id is None:
         return None
     return f"{Context.zimfarm_api_url}/recipes/{recipe_id}"
-
-
-update_language_codes()
@@ -47,3 +47,21 @@ class Context:
     refresh_token_expiry_duration = parse_timespan(
         os.getenv("REFRESH_TOKEN_EXPIRY_DURATION", default="30d")
     )
+
+    # Claims of verified tokens are cached so that the many requests made with the
+    # same token are not verified again, until the token expires or the TTL elapses
+    token_claims_cache_size = int(os.getenv("TOKEN_CLAIMS_CACHE_SIZE", default="1024"))
+    token_claims_cache_ttl = parse_timespan(
+        os.getenv("TOKEN_CLAIMS_CACHE_TTL", default="5m")
+    )
+
+    # Maximum number of requests handled concurrently by sync routes, which FastAPI
+    # runs in a threadpool not to block the event loop
+    threadpool_size = int(os.getenv("API_THREADPOOL_SIZE", default="40"))
+
+    # Public URL of the illustrations endpoint, e.g.
+    # https://api.cms.openzim.org/v1/illustrations. When set, XML catalogs reference
+    # title illustrations by URL instead of embedding their base64 content
+    catalog_illustrations_base_url: str | None = (
+        os.getenv("CATALOG_ILLUSTRATIONS_BASE_URL") or None
+    )
@@ -3,6 +3,7 @@ from collections import defaultdict
 from contextlib import asynccontextmanager
 from http import HTTPStatus
 
+from anyio import to_thread
 from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -10,6 +11,7 @@ from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 
+from cms_backend.api.context import Context as ApiContext
 from cms_backend.api.routes.account import router as account_router
 from cms_backend.api.routes.auth import router as auth_router
 from cms_backend.api.routes.books import router as books_router
@@ -18,6 +20,8 @@ from cms_backend.api.routes.config import router as config_router
 from cms_backend.api.routes.events import router as events_router
 from cms_backend.api.routes.healthcheck import router as healthcheck_router
 from cms_backend.api.routes.http_errors import BadRequestError
+from cms_backend.api.routes.illustrations import router as illustrations_router
+from cms_backend.api.routes.models import ORJSONResponse
 from cms_backend.api.routes.staging import router as staging_router
 from cms_backend.api.routes.titles import router as titles_router
 from cms_backend.api.routes.warehouse import router as warehouse_router
@@ -39,6 +43,7 @@ from cms_backend.utils.database import (
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
+    to_thread.current_default_thread_limiter().total_tokens = ApiContext.threadpool_size
     if Context.alembic_upgrade_head_on_start:
         upgrade_db_schema()
     check_if_schema_is_up_to_date()
@@ -54,6 +59,7 @@ def create_app(*, debug: bool = True):
         version="1.0.0",
         description="CMS API for managing titles, books, and other resources",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
@@ -78,6 +84,7 @@ def create_app(*, debug: bool = True):
     main_router.include_router(router=account_router)
     main_router.include_router(router=staging_router)
     main_router.include_router(router=warehouse_router)
+    main_router.include_router(router=illustrations_router)
 
     app.include_router(router=main_router)
 
@@ -1,10 +1,10 @@
 from collections.abc import Sequence
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Path, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import Field
 from sqlalchemy.orm import Session as OrmSession
 
@@ -13,17 +13,26 @@ from cms_backend.api.routes.dependencies import (
     get_current_account,
     require_permission,
 )
-from cms_backend.api.routes.models import ListResponse, calculate_pagination_metadata
+from cms_backend.api.routes.models import (
+    ListResponse,
+    calculate_pagination_metadata,
+    create_cached_response,
+    create_list_response,
+    create_ndjson_response,
+)
 from cms_backend.db import book as db_book
 from cms_backend.db import book_actions as db_book_actions
 from cms_backend.db import books as db_books
-from cms_backend.db import gen_dbsession
+from cms_backend.db import dbsession_generator, gen_dbsession
+from cms_backend.db import event_log as db_event_log
 from cms_backend.db.models import Account
 from cms_backend.schemas import BaseModel
 from cms_backend.schemas.fields import LimitFieldMax200, NotEmptyString, SkipField
 from cms_backend.schemas.models import (
     BaseBookPromotionAction,
+    BookActionResultSchema,
     BookLanguagesSchema,
+    BooksFilterSchema,
     BookUpdateSchema,
     GetBooksSchema,
     ZimUrlsSchema,
@@ -36,26 +45,37 @@ from cms_backend.schemas.orms import (
 
 router = APIRouter(prefix="/books", tags=["books"])
 
+# maximum number of books a bulk action is applied to at once
+MAX_BULK_BOOKS = 500
+
 
 class RevertBookSchema(BaseModel):
     comment: NotEmptyString | None = None
 
 
-@router.get("")
+class BooksBulkActionSchema(BaseModel):
+    book_ids: list[UUID] = Field(min_length=1, max_length=MAX_BULK_BOOKS)
+
+
+class BooksBulkMoveSchema(BooksBulkActionSchema):
+    destination: Literal["staging", "prod"]
+
+
+@router.get("", response_model=ListResponse[BookLightSchema])
 def get_books(
     params: Annotated[GetBooksSchema, Query()],
     session: Annotated[OrmSession, Depends(gen_dbsession)],
     accessible_collection_ids: Annotated[
         Sequence[UUID] | None, Depends(get_accessible_collection_ids)
     ],
-) -> ListResponse[BookLightSchema]:
+) -> Response:
     """Get a list of books"""
 
     results = db_books.get_books(
         session, params=params, accessible_collection_ids=accessible_collection_ids
     )
 
-    return ListResponse[BookLightSchema](
+    return create_list_response(
         meta=calculate_pagination_metadata(
             nb_records=results.nb_records,
             skip=params.skip,
@@ -66,6 +86,111 @@ def get_books(
     )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK: {
+            "description": "Books as newline-delimited JSON, one per line",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+def export_books(
+    params: Annotated[BooksFilterSchema, Query()],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+) -> StreamingResponse:
+    """Export all books matching filters, in the order of the list of books"""
+
+    return create_ndjson_response(
+        dbsession_generator(db_books.export_books)(
+            params=params, accessible_collection_ids=accessible_collection_ids
+        )
+    )
+
+
+@router.post(
+    "/bulk/delete",
+    dependencies=[Depends(require_permission(namespace="book", name="delete"))],
+)
+def delete_books(
+    request: BooksBulkActionSchema,
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+    *,
+    force_delete: Annotated[bool, Query()] = False,
+) -> list[BookActionResultSchema]:
+    """Mark many books as deleted, reporting the outcome for each of them"""
+    return db_book.delete_books(
+        session,
+        book_ids=request.book_ids,
+        force_delete=force_delete,
+        accessible_collection_ids=accessible_collection_ids,
+    )
+
+
+@router.post(
+    "/bulk/move",
+    dependencies=[Depends(require_permission(namespace="book", name="update"))],
+)
+def move_books(
+    request: BooksBulkMoveSchema,
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+) -> list[BookActionResultSchema]:
+    """Move many books to staging or prod, reporting the outcome for each of them"""
+    return db_book.move_books(
+        session,
+        book_ids=request.book_ids,
+        destination=request.destination,
+        accessible_collection_ids=accessible_collection_ids,
+    )
+
+
+@router.post(
+    "/bulk/recover",
+    dependencies=[Depends(require_permission(namespace="book", name="update"))],
+)
+def recover_books(
+    request: BooksBulkActionSchema,
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+) -> list[BookActionResultSchema]:
+    """Recover many books, reporting the outcome for each of them"""
+    return db_book.recover_books(
+        session,
+        book_ids=request.book_ids,
+        accessible_collection_ids=accessible_collection_ids,
+    )
+
+
+@router.post(
+    "/bulk/backup",
+    dependencies=[Depends(require_permission(namespace="book", name="update"))],
+)
+def backup_books(
+    request: BooksBulkActionSchema,
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+) -> list[BookActionResultSchema]:
+    """Back up many books, reporting the outcome for each of them"""
+    return db_book.backup_books(
+        session,
+        book_ids=request.book_ids,
+        accessible_collection_ids=accessible_collection_ids,
+    )
+
+
 @router.get("/zims")
 def get_zim_urls(
     zim_ids: Annotated[list[UUID], Query()],
@@ -74,45 +199,92 @@ def get_zim_urls(
     return db_books.get_zim_urls(session, zim_ids)
 
 
-@router.get("/languages")
+@router.get("/languages", response_model=BookLanguagesSchema)
 def get_book_languages(
+    request: Request,
     session: Annotated[OrmSession, Depends(gen_dbsession)],
-) -> BookLanguagesSchema:
-    return db_books.get_book_languages(session)
+) -> Response:
+    return create_cached_response(
+        request,
+        kinds=("book",),
+        render=lambda: db_books.get_book_languages(session),
+    )
 
 
-@router.get("/flavours")
+@router.get("/flavours", response_model=ListResponse[str])
 def get_book_flavours(
+    request: Request,
     session: Annotated[OrmSession, Depends(gen_dbsession)],
     title_id: Annotated[UUID | None, Query()] = None,
-) -> ListResponse[str]:
-    results = db_books.get_book_flavours(session, title_id=title_id)
-    return ListResponse[str](
-        meta=calculate_pagination_metadata(
-            nb_records=results.nb_records,
-            skip=0,
-            limit=len(results.records),
-            page_size=len(results.records),
-        ),
-        items=results.records,
-    )
+) -> Response:
+    def _render() -> ListResponse[str]:
+        results = db_books.get_book_flavours(session, title_id=title_id)
+        return ListResponse[str](
+            meta=calculate_pagination_metadata(
+                nb_records=results.nb_records,
+                skip=0,
+                limit=len(results.records),
+                page_size=len(results.records),
+            ),
+            items=results.records,
+        )
+
+    # flavours are those of titles, not of books
+    return create_cached_response(request, kinds=("title",), render=_render)
 
 
-@router.get("/{book_id}")
+@router.get("/{book_id}", response_model=BookFullSchema)
 def get_book(
+    request: Request,
     book_id: Annotated[UUID, Path()],
     session: Annotated[OrmSession, Depends(gen_dbsession)],
     accessible_collection_ids: Annotated[
         Sequence[UUID] | None, Depends(get_accessible_collection_ids)
     ],
-) -> BookFullSchema:
+) -> Response:
     """Get a book by ID"""
-    return db_book.create_book_full_schema(
-        db_book.get_book(
-            session=session,
-            book_id=book_id,
-            accessible_collection_ids=accessible_collection_ids,
-        )
+    return create_cached_response(
+        request,
+        kinds=("book", "title", "collection"),
+        render=lambda: db_book.create_book_full_schema(
+            session,
+            db_book.get_book(
+                session=session,
+                book_id=book_id,
+                accessible_collection_ids=accessible_collection_ids,
+            ),
+        ),
+        accessible_collection_ids=accessible_collection_ids,
+        # state of books is mostly written by the mill and the shuttle
+        shared_only=True,
+    )
+
+
+@router.get("/{book_id}/events")
+def get_book_events(
+    book_id: Annotated[UUID, Path()],
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+    skip: Annotated[SkipField, Query()] = 0,
+    limit: Annotated[LimitFieldMax200, Query()] = 200,
+) -> ListResponse[str]:
+    """Get a book's events, in chronological order"""
+    book = db_book.get_book(
+        session=session,
+        book_id=book_id,
+        accessible_collection_ids=accessible_collection_ids,
+    )
+    results = db_event_log.get_events(session, book, skip=skip, limit=limit)
+    return ListResponse(
+        items=results.records,
+        meta=calculate_pagination_metadata(
+            nb_records=results.nb_records,
+            skip=skip,
+            limit=limit,
+            page_size=len(results.records),
+        ),
     )
 
 
@@ -130,13 +302,14 @@ def update_book(
     current_account: Account = Depends(get_current_account),
 ) -> BookFullSchema:
     return db_book.create_book_full_schema(
+        session,
         db_book.update_book(
             session,
             book_id=book_id,
             payload=request,
             author_id=current_account.id,
             accessible_collection_ids=accessible_collection_ids,
-        )
+        ),
     )
 
 
@@ -154,12 +327,13 @@ def delete_book(
     force_delete: Annotated[bool, Query()] = False,
 ) -> BookFullSchema:
     return db_book.create_book_full_schema(
+        session,
         db_book.delete_book(
             session,
             book_id=book_id,
             force_delete=force_delete,
             accessible_collection_ids=accessible_collection_ids,
-        )
+        ),
     )
 
 
@@ -175,11 +349,12 @@ def recover_book(
     ],
 ) -> BookFullSchema:
     return db_book.create_book_full_schema(
+        session,
         db_book.recover_book(
             session,
             book_id=book_id,
             accessible_collection_ids=accessible_collection_ids,
-        )
+        ),
     )
 
 
@@ -195,12 +370,13 @@ def unpromote_book(
     ],
 ) -> BookFullSchema:
     return db_book.create_book_full_schema(
+        session,
         db_book.move_book(
             session,
             book_id=book_id,
             destination="staging",
             accessible_collection_ids=accessible_collection_ids,
-        )
+        ),
     )
 
 
@@ -216,11 +392,12 @@ def backup_book(
     ],
 ) -> BookFullSchema:
     return db_book.create_book_full_schema(
+        session,
         db_book.backup_book(
             session,
             book_id=book_id,
             accessible_collection_ids=accessible_collection_ids,
-        )
+        ),
     )
 
 
@@ -236,7 +413,10 @@ def get_book_issues(
     session: OrmSession = Depends(gen_dbsession),
 ) -> JSONResponse:
     book = db_book.get_book(
-        session, book_id, accessible_collection_ids=accessible_collection_ids
+        session,
+        book_id,
+        accessible_collection_ids=accessible_collection_ids,
+        load_profile="processing",
     )
     return JSONResponse(
         content=db_book.update_book_issues(session, book),
@@ -383,9 +563,10 @@ def remove_book_backup(
     ],
 ) -> BookFullSchema:
     return db_book.create_book_full_schema(
+        session,
         db_book.remove_book_backup(
             session,
             book_id=book_id,
             accessible_collection_ids=accessible_collection_ids,
-        )
+        ),
     )
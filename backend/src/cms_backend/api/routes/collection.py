@@ -4,17 +4,22 @@ from typing import Annotated
 from uuid import UUID
 
 import xxhash
-from fastapi import APIRouter, Depends, Path, Query
+from fastapi import APIRouter, Depends, Path, Query, Request
 from fastapi.responses import JSONResponse, Response
 from pydantic import AnyUrl, Field
 from sqlalchemy.orm import Session as OrmSession
 
+from cms_backend.api.context import Context as ApiContext
 from cms_backend.api.routes.dependencies import (
     get_accessible_collection_ids,
     get_current_account,
     require_permission,
 )
-from cms_backend.api.routes.models import ListResponse, calculate_pagination_metadata
+from cms_backend.api.routes.models import (
+    ListResponse,
+    calculate_pagination_metadata,
+    create_cached_response,
+)
 from cms_backend.api.routes.utils import build_library_xml
 from cms_backend.db import collection as db_collection
 from cms_backend.db import gen_dbsession
@@ -44,34 +49,42 @@ class RevertCollectionSchema(BaseModel):
     comment: NotEmptyString | None = None
 
 
-@router.get("")
+@router.get("", response_model=ListResponse[CollectionLightSchema])
 def get_collections(
+    request: Request,
     params: Annotated[CollectionsGetSchema, Query()],
     session: Annotated[OrmSession, Depends(gen_dbsession)],
     accessible_collection_ids: Annotated[
         Sequence[UUID] | None, Depends(get_accessible_collection_ids)
     ],
-) -> ListResponse[CollectionLightSchema]:
+) -> Response:
     """Get a list of collections"""
 
-    results = db_collection.get_collections(
-        session,
-        skip=params.skip,
-        limit=params.limit,
-        name=params.name,
-        accessible_collection_ids=accessible_collection_ids,
-        accessible_by=params.accessible_by,
-        is_private=params.is_private,
-    )
-
-    return ListResponse[CollectionLightSchema](
-        meta=calculate_pagination_metadata(
-            nb_records=results.nb_records,
+    def _render() -> ListResponse[CollectionLightSchema]:
+        results = db_collection.get_collections(
+            session,
             skip=params.skip,
             limit=params.limit,
-            page_size=len(results.records),
-        ),
-        items=results.records,
+            name=params.name,
+            accessible_collection_ids=accessible_collection_ids,
+            accessible_by=params.accessible_by,
+            is_private=params.is_private,
+        )
+        return ListResponse[CollectionLightSchema](
+            meta=calculate_pagination_metadata(
+                nb_records=results.nb_records,
+                skip=params.skip,
+                limit=params.limit,
+                page_size=len(results.records),
+            ),
+            items=results.records,
+        )
+
+    return create_cached_response(
+        request,
+        kinds=("collection",),
+        render=_render,
+        accessible_collection_ids=accessible_collection_ids,
     )
 
 
@@ -191,9 +204,16 @@ def _get_catalog_xml_content(
         )
 
     entries = db_collection.get_latest_books_for_collection(
-        session, collection.id, accessible_collection_ids
+        session,
+        collection.id,
+        accessible_collection_ids,
+        load_illustrations=ApiContext.catalog_illustrations_base_url is None,
+    )
+    xml_content = build_library_xml(
+        entries,
+        path_prefix=path_prefix,
+        illustrations_base_url=ApiContext.catalog_illustrations_base_url,
     )
-    xml_content = build_library_xml(entries, path_prefix=path_prefix)
 
     return xml_content, HTTPStatus.OK
 
@@ -1,5 +1,6 @@
 from collections.abc import Sequence
-from typing import Annotated, Literal
+from dataclasses import dataclass
+from typing import Annotated
 from uuid import UUID
 
 from fastapi import Depends
@@ -12,7 +13,7 @@ from cms_backend.api.routes.http_errors import UnauthorizedError
 from cms_backend.api.token import JWTClaims, token_decoder
 from cms_backend.db import account as db_account
 from cms_backend.db import collection_permission as db_collection_permission
-from cms_backend.db import gen_dbsession, gen_manual_dbsession
+from cms_backend.db import gen_dbsession
 from cms_backend.db.models import Account
 from cms_backend.roles import RoleEnum
 
@@ -44,21 +45,32 @@ def get_jwt_claims_or_none(
         raise UnauthorizedError("Unable to verify token") from exc
 
 
-def get_current_account_or_none_with_session(
-    session_type: Literal["auto", "manual"] = "auto",
-):
-    def _get_current_account_or_none(
-        claims: Annotated[JWTClaims | None, Depends(get_jwt_claims_or_none)],
-        session: Annotated[
-            OrmSession,
-            Depends(gen_dbsession if session_type == "auto" else gen_manual_dbsession),
-        ],
-    ) -> Account | None:
-        if claims is None:
-            return None
-        account = db_account.get_account_by_id_or_none(session, account_id=claims.sub)
+@dataclass
+class AuthorizationContext:
+    """Account of the request and the collections it may access"""
+
+    account: Account | None
+    # None means all collections, see get_accessible_collection_ids
+    accessible_collection_ids: Sequence[UUID] | None
+
+
+def get_authorization_context(
+    claims: Annotated[JWTClaims | None, Depends(get_jwt_claims_or_none)],
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+) -> AuthorizationContext:
+    """
+    Resolve the account and its accessible collections once per request.
+
+    Other authorization dependencies derive from this one, which FastAPI caches for
+    the duration of the request.
+    """
+    result = None
+    if claims is not None:
+        result = db_collection_permission.get_account_with_collection_ids_or_none(
+            session, account_id=claims.sub
+        )
         # If this claim has a "name" property, we create a new account account
-        if account is None and Context.create_new_oauth_account:
+        if result is None and Context.create_new_oauth_account:
             if not claims.name:
                 raise UnauthorizedError("Token is missing 'profile' scope")
             db_account.create_account(
@@ -67,48 +79,46 @@ def get_current_account_or_none_with_session(
                 role=RoleEnum.VIEWER,
                 idp_sub=claims.sub,
             )
-            account = db_account.get_account_by_id_or_none(
+            result = db_collection_permission.get_account_with_collection_ids_or_none(
                 session, account_id=claims.sub
             )
 
-        return account
-
-    return _get_current_account_or_none
-
-
-def get_current_account_with_session(
-    session_type: Literal["auto", "manual"] = "auto",
-):
-    def _get_current_account(
-        account: Annotated[
-            Account | None,
-            Depends(
-                get_current_account_or_none_with_session(session_type=session_type)
+    if result is None:
+        return AuthorizationContext(
+            account=None,
+            accessible_collection_ids=(
+                db_collection_permission.get_accessible_collection_ids(session, None)
             ),
-        ],
-    ) -> Account:
-        # If we get here, it means the token was valid but the account being None
-        # means their idp_sub or id doesn't exist on the database or they have been
-        # marked as deleted.
-        if account is None:
-            raise UnauthorizedError(
-                "This account is not yet authorized on the CMS. "
-                "Please contact CMS admins."
-            )
+        )
+    account, accessible_collection_ids = result
+    return AuthorizationContext(
+        account=account, accessible_collection_ids=accessible_collection_ids
+    )
+
 
-        if account.deleted:
-            raise UnauthorizedError("This account does not exist on the CMS.")
+def get_current_account_or_none(
+    authorization_context: Annotated[
+        AuthorizationContext, Depends(get_authorization_context)
+    ],
+) -> Account | None:
+    return authorization_context.account
 
-        return account
 
-    return _get_current_account
+def get_current_account(
+    account: Annotated[Account | None, Depends(get_current_account_or_none)],
+) -> Account:
+    # If we get here, it means the token was valid but the account being None
+    # means their idp_sub or id doesn't exist on the database or they have been
+    # marked as deleted.
+    if account is None:
+        raise UnauthorizedError(
+            "This account is not yet authorized on the CMS. Please contact CMS admins."
+        )
 
+    if account.deleted:
+        raise UnauthorizedError("This account does not exist on the CMS.")
 
-# Convenience functions for common cases
-get_current_account_or_none = get_current_account_or_none_with_session(
-    session_type="auto"
-)
-get_current_account = get_current_account_with_session(session_type="auto")
+    return account
 
 
 def require_permission(*, namespace: str, name: str):
@@ -131,9 +141,8 @@ def require_permission(*, namespace: str, name: str):
 
 
 def get_accessible_collection_ids(
-    session: Annotated[OrmSession, Depends(gen_dbsession)],
-    current_account: Annotated[Account | None, Depends(get_current_account_or_none)],
+    authorization_context: Annotated[
+        AuthorizationContext, Depends(get_authorization_context)
+    ],
 ) -> Sequence[UUID] | None:
-    return db_collection_permission.get_accessible_collection_ids(
-        session, current_account
-    )
+    return authorization_context.accessible_collection_ids
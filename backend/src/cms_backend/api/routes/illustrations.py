@@ -0,0 +1,35 @@
+import base64
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, Path
+from fastapi.responses import Response
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db import gen_dbsession
+from cms_backend.db import illustration as db_illustration
+
+router = APIRouter(prefix="/illustrations", tags=["illustrations"])
+
+# illustrations are identified by the hash of their content, they never change
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{illustration_id}")
+def get_illustration(
+    illustration_id: Annotated[str, Path()],
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    """Get an illustration as a PNG image"""
+    etag = f'"{illustration_id}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if if_none_match == etag:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    illustration = db_illustration.get_illustration(session, illustration_id)
+    return Response(
+        content=base64.b64decode(illustration.content),
+        media_type="image/png",
+        headers=headers,
+    )
@@ -1,12 +1,36 @@
 import math
-from typing import TypeVar
+from collections.abc import Callable, Iterable, Sequence
+from http import HTTPStatus
+from typing import Any, TypeVar
+from uuid import UUID
 
+import orjson
+import pydantic
+import xxhash
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import Field
 
+from cms_backend import logger
+from cms_backend.db.response_cache import get_response_cache, get_response_cache_key
 from cms_backend.schemas import BaseModel
 
 T = TypeVar("T")
 
+# cached responses depend on the client (accessible collections), and must be
+# revalidated with their ETag since they change as soon as records are modified
+CACHED_RESPONSE_CACHE_CONTROL = "private, no-cache"
+
+# naive datetimes are UTC and, like in schemas, rendered to the second with a Z suffix
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_OMIT_MICROSECONDS
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
 
 class Paginator(BaseModel):
     nb_records: int = Field(serialization_alias="count")
@@ -44,3 +68,95 @@ def calculate_pagination_metadata(
         page_size=min(page_size, nb_records),
         page=page,
     )
+
+
+def create_list_response(
+    *, meta: Paginator, items: Sequence[pydantic.BaseModel]
+) -> ORJSONResponse:
+    """Render a list response of flat items without validating them again
+
+    Returning a response bypasses FastAPI validation and serialization of the
+    response model. Items must hence already be valid (e.g. built from typed DB rows
+    with `model_construct`) and only hold values orjson natively serializes: their
+    fields are dumped as is, without going through their serializers.
+    """
+    return ORJSONResponse(
+        content={
+            "meta": meta.model_dump(mode="json"),
+            "items": [dict(item) for item in items],
+        }
+    )
+
+
+def create_ndjson_response(items: Iterable[pydantic.BaseModel]) -> StreamingResponse:
+    """Stream flat items as newline-delimited JSON, one item per line
+
+    Items are rendered as they are iterated, like in `create_list_response`, so a
+    lazy iterable is never held in memory at once.
+    """
+    return StreamingResponse(
+        (
+            orjson.dumps(dict(item), option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+            for item in items
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+def create_cached_response(
+    request: Request,
+    *,
+    kinds: Sequence[str],
+    render: Callable[[], pydantic.BaseModel],
+    accessible_collection_ids: Sequence[UUID] | None = None,
+    shared_only: bool = False,
+) -> Response:
+    """Render a JSON response through the response cache, with an ETag
+
+    `render` is only called when no response of the same route, query parameters and
+    accessible collections has been cached since records of `kinds` were modified.
+    Errors raised by `render` are not cached. A 304 is returned when the client
+    already has the response. Errors of the cache are logged and the response is
+    rendered as if it was not cached.
+
+    With `shared_only`, the response is only cached when the cache is shared by all
+    processes: writes of the mill and the shuttle are not seen by the cache of the
+    API process, and responses showing their changes must not be stale.
+    """
+    key: str | None = None
+    content: bytes | None = None
+    try:
+        store = get_response_cache()
+        if store.shared or not shared_only:
+            key = get_response_cache_key(
+                kinds,
+                request.url.path,
+                str(sorted(request.query_params.multi_items())),
+                (
+                    "*"
+                    if accessible_collection_ids is None
+                    else ",".join(sorted(str(id_) for id_ in accessible_collection_ids))
+                ),
+            )
+            content = store.get(key)
+    except Exception:
+        logger.exception(f"Failed to get cached response of {request.url.path}")
+
+    if content is None:
+        content = orjson.dumps(
+            render().model_dump(mode="json", by_alias=True), option=ORJSON_OPTIONS
+        )
+        if key is not None:
+            try:
+                get_response_cache().set(key, content)
+            except Exception:
+                logger.exception(f"Failed to cache response of {request.url.path}")
+
+    etag = f'"{xxhash.xxh64_hexdigest(content)}"'
+    headers = {"ETag": etag, "Cache-Control": CACHED_RESPONSE_CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in (
+        value.strip().removeprefix("W/") for value in if_none_match.split(",")
+    ):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
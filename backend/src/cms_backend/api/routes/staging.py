@@ -8,6 +8,7 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.responses import Response
 from sqlalchemy.orm import Session as OrmSession
 
+from cms_backend.api.context import Context as ApiContext
 from cms_backend.api.routes.dependencies import get_accessible_collection_ids
 from cms_backend.api.routes.utils import build_library_xml
 from cms_backend.db import gen_dbsession
@@ -17,7 +18,7 @@ router = APIRouter(prefix="/staging", tags=["staging"])
 
 
 @router.get("/catalog.xml")
-async def get_library_catalog_xml(
+def get_library_catalog_xml(
     session: Annotated[OrmSession, Depends(gen_dbsession)],
     accessible_collection_ids: Annotated[
         Sequence[UUID] | None, Depends(get_accessible_collection_ids)
@@ -27,9 +28,15 @@ async def get_library_catalog_xml(
     """Get staging catalog as XML library."""
 
     entries = db_staging.get_staging_books_library_data(
-        session, accessible_collection_ids=accessible_collection_ids
+        session,
+        accessible_collection_ids=accessible_collection_ids,
+        load_illustrations=ApiContext.catalog_illustrations_base_url is None,
+    )
+    xml_content = build_library_xml(
+        entries,
+        path_prefix=path_prefix,
+        illustrations_base_url=ApiContext.catalog_illustrations_base_url,
     )
-    xml_content = build_library_xml(entries, path_prefix=path_prefix)
     etag = xxhash.xxh64(xml_content.encode("utf-8")).hexdigest()
 
     return Response(
@@ -41,7 +48,7 @@ async def get_library_catalog_xml(
 
 
 @router.head("/catalog.xml")
-async def head_library_catalog_xml(
+def head_library_catalog_xml(
     session: Annotated[OrmSession, Depends(gen_dbsession)],
     accessible_collection_ids: Annotated[
         Sequence[UUID] | None, Depends(get_accessible_collection_ids)
@@ -49,9 +56,15 @@ async def head_library_catalog_xml(
     path_prefix: Annotated[str | None, Query()] = None,
 ):
     entries = db_staging.get_staging_books_library_data(
-        session, accessible_collection_ids=accessible_collection_ids
+        session,
+        accessible_collection_ids=accessible_collection_ids,
+        load_illustrations=ApiContext.catalog_illustrations_base_url is None,
+    )
+    xml_content = build_library_xml(
+        entries,
+        path_prefix=path_prefix,
+        illustrations_base_url=ApiContext.catalog_illustrations_base_url,
     )
-    xml_content = build_library_xml(entries, path_prefix=path_prefix)
     etag = xxhash.xxh64(xml_content.encode("utf-8")).hexdigest()
     return Response(
         status_code=HTTPStatus.OK,
@@ -3,8 +3,8 @@ from http import HTTPStatus
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query, Response
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.api.routes.dependencies import (
@@ -14,10 +14,17 @@ from cms_backend.api.routes.dependencies import (
     require_permission,
 )
 from cms_backend.api.routes.http_errors import ForbiddenError
-from cms_backend.api.routes.models import ListResponse, calculate_pagination_metadata
+from cms_backend.api.routes.models import (
+    ListResponse,
+    calculate_pagination_metadata,
+    create_cached_response,
+    create_list_response,
+    create_ndjson_response,
+)
 from cms_backend.db import account as db_account
+from cms_backend.db import dbsession_generator, gen_dbsession
+from cms_backend.db import event_log as db_event_log
 from cms_backend.db import flavour as db_flavour
-from cms_backend.db import gen_dbsession
 from cms_backend.db import title as db_title
 from cms_backend.db.models import Account
 from cms_backend.schemas import BaseModel
@@ -36,20 +43,34 @@ from cms_backend.schemas.orms import (
     TitleFlavourSchema,
     TitleFullSchema,
     TitleHistorySchema,
+    TitleLightField,
     TitleLightSchema,
 )
 from cms_backend.utils import is_valid_uuid
 
 router = APIRouter(prefix="/titles", tags=["titles"])
 
+# maximum number of titles accepted by the bulk endpoint at once
+MAX_BULK_TITLES = 500
 
-class TitlesGetSchema(BaseModel):
-    skip: SkipField = 0
-    limit: LimitFieldMax200 = 20
+
+class TitlesFilterSchema(BaseModel):
     name: NotEmptyString | None = None
     collection_name: NotEmptyString | None = None
     archived: bool = False
     is_rotten: bool | None = None
+    # only return these fields of titles (all when not set)
+    fields: list[TitleLightField] | None = None
+
+
+class TitlesGetSchema(TitlesFilterSchema):
+    skip: SkipField = 0
+    limit: LimitFieldMax200 = 20
+
+
+class TitlesBulkUpsertResponse(BaseModel):
+    created_ids: list[UUID]
+    updated_ids: list[UUID]
 
 
 class RevertTitleSchema(BaseModel):
@@ -61,15 +82,10 @@ class MergeTitlesSchema(BaseModel):
     sources: list[NotEmptyString]
 
 
-@router.get("")
-def get_titles(
-    params: Annotated[TitlesGetSchema, Query()],
-    accessible_collection_ids: Annotated[
-        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
-    ],
-    session: OrmSession = Depends(gen_dbsession),
-    current_account: Account | None = Depends(get_current_account_or_none),
-) -> ListResponse[TitleLightSchema]:
+def check_can_view_titles(
+    params: TitlesFilterSchema, current_account: Account | None
+) -> None:
+    """Check that archived titles are only listed by accounts allowed to archive"""
     if params.archived and not (
         current_account
         and db_account.check_account_permission(
@@ -77,6 +93,18 @@ def get_titles(
         )
     ):
         raise ForbiddenError("You are not allowed to view archived titles.")
+
+
+@router.get("", response_model=ListResponse[TitleLightSchema])
+def get_titles(
+    params: Annotated[TitlesGetSchema, Query()],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+    session: OrmSession = Depends(gen_dbsession),
+    current_account: Account | None = Depends(get_current_account_or_none),
+) -> Response:
+    check_can_view_titles(params, current_account)
     results = db_title.get_titles(
         session,
         accessible_collection_ids=accessible_collection_ids,
@@ -86,8 +114,9 @@ def get_titles(
         collection_name=params.collection_name,
         archived=params.archived,
         is_rotten=params.is_rotten,
+        fields=params.fields,
     )
-    return ListResponse[TitleLightSchema](
+    return create_list_response(
         meta=calculate_pagination_metadata(
             nb_records=results.nb_records,
             skip=params.skip,
@@ -98,6 +127,38 @@ def get_titles(
     )
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        HTTPStatus.OK: {
+            "description": "Titles as newline-delimited JSON, one per line",
+            "content": {"application/x-ndjson": {}},
+        }
+    },
+)
+def export_titles(
+    params: Annotated[TitlesFilterSchema, Query()],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+    current_account: Account | None = Depends(get_current_account_or_none),
+) -> StreamingResponse:
+    """Export all titles matching filters, in the order of the list of titles"""
+
+    check_can_view_titles(params, current_account)
+    return create_ndjson_response(
+        dbsession_generator(db_title.export_titles)(
+            accessible_collection_ids=accessible_collection_ids,
+            name=params.name,
+            collection_name=params.collection_name,
+            archived=params.archived,
+            is_rotten=params.is_rotten,
+            fields=params.fields,
+        )
+    )
+
+
 @router.post(
     "/merge",
     dependencies=[
@@ -124,28 +185,40 @@ def merge_titles(
     )
 
 
-@router.get("/{title_identifier}")
+@router.get("/{title_identifier}", response_model=TitleFullSchema)
 def get_title(
+    request: Request,
     title_identifier: Annotated[NotEmptyString, Path()],
     accessible_collection_ids: Annotated[
         Sequence[UUID] | None, Depends(get_accessible_collection_ids)
     ],
     session: OrmSession = Depends(gen_dbsession),
-) -> TitleFullSchema:
+) -> Response:
     """Get a title by ID with full details including books"""
-    if is_valid_uuid(title_identifier):
-        title = db_title.get_title_by_id(
-            session,
-            title_id=UUID(title_identifier),
-            accessible_collection_ids=accessible_collection_ids,
-        )
-    else:
-        title = db_title.get_title_by_name(
-            session,
-            name=title_identifier,
-            accessible_collection_ids=accessible_collection_ids,
-        )
-    return db_title.create_title_full_schema(title)
+
+    def _render() -> TitleFullSchema:
+        if is_valid_uuid(title_identifier):
+            title = db_title.get_title_by_id(
+                session,
+                title_id=UUID(title_identifier),
+                accessible_collection_ids=accessible_collection_ids,
+            )
+        else:
+            title = db_title.get_title_by_name(
+                session,
+                name=title_identifier,
+                accessible_collection_ids=accessible_collection_ids,
+            )
+        return db_title.create_title_full_schema(session, title)
+
+    return create_cached_response(
+        request,
+        kinds=("book", "title", "collection"),
+        render=_render,
+        accessible_collection_ids=accessible_collection_ids,
+        # state of books is mostly written by the mill and the shuttle
+        shared_only=True,
+    )
 
 
 @router.post(
@@ -169,6 +242,36 @@ def create_title(
     return db_title.create_title_light_schema(title)
 
 
+@router.put(
+    "/bulk",
+    dependencies=[
+        Depends(require_permission(namespace="title", name="create")),
+        Depends(require_permission(namespace="title", name="update")),
+    ],
+)
+def upsert_titles(
+    titles_data: Annotated[
+        list[TitleCreateSchema], Body(min_length=1, max_length=MAX_BULK_TITLES)
+    ],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+    session: OrmSession = Depends(gen_dbsession),
+    current_account: Account = Depends(get_current_account),
+) -> TitlesBulkUpsertResponse:
+    """Create or update many titles at once, identified by their name"""
+    created_titles, updated_titles = db_title.upsert_titles(
+        session,
+        author_id=current_account.id,
+        payloads=titles_data,
+        accessible_collection_ids=accessible_collection_ids,
+    )
+    return TitlesBulkUpsertResponse(
+        created_ids=[title.id for title in created_titles],
+        updated_ids=[title.id for title in updated_titles],
+    )
+
+
 @router.patch(
     "/{title_identifier}",
     dependencies=[Depends(require_permission(namespace="title", name="update"))],
@@ -310,6 +413,34 @@ def get_title_history(
     )
 
 
+@router.get("/{title_identifier}/events")
+def get_title_events(
+    title_identifier: Annotated[NotEmptyString, Path()],
+    accessible_collection_ids: Annotated[
+        Sequence[UUID] | None, Depends(get_accessible_collection_ids)
+    ],
+    session: OrmSession = Depends(gen_dbsession),
+    skip: Annotated[SkipField, Query()] = 0,
+    limit: Annotated[LimitFieldMax200, Query()] = 200,
+) -> ListResponse[str]:
+    """Get a title's events, in chronological order"""
+    title = db_title.get_title(
+        session,
+        title_identifier=title_identifier,
+        accessible_collection_ids=accessible_collection_ids,
+    )
+    results = db_event_log.get_events(session, title, skip=skip, limit=limit)
+    return ListResponse(
+        items=results.records,
+        meta=calculate_pagination_metadata(
+            nb_records=results.nb_records,
+            skip=skip,
+            limit=limit,
+            page_size=len(results.records),
+        ),
+    )
+
+
 @router.get(
     "/{title_identifier}/flavours",
 )
@@ -7,9 +7,16 @@ from cms_backend.utils.zim import convert_tags
 
 
 def build_library_xml(
-    entries: list[db_collection.LibraryBookData], *, path_prefix: str | None = None
+    entries: list[db_collection.LibraryBookData],
+    *,
+    path_prefix: str | None = None,
+    illustrations_base_url: str | None = None,
 ) -> str:
-    """Build XML library catalog from books."""
+    """Build XML library catalog from books.
+
+    When illustrations_base_url is set, illustrations are referenced by URL (and need
+    not be loaded) instead of being embedded.
+    """
     library_elem = ET.Element("library")
     library_elem.set("version", "20110515")
 
@@ -44,10 +51,17 @@ def build_library_xml(
         tags = zim_meta.get("Tags", "")
         book_elem.set("tags", ";".join(convert_tags(tags)))
 
-        favicon = title.illustration_48x48_at_1 or zim_meta.get(
-            "Illustration_48x48@1", ""
-        )
-        if favicon:
+        # book illustration is only loaded when title has none
+        if illustrations_base_url:
+            if illustration_id := (
+                title.illustration_48x48_at_1_id or book.illustration_48x48_at_1_id
+            ):
+                book_elem.set(
+                    "faviconUrl",
+                    f"{illustrations_base_url.rstrip('/')}/{illustration_id}",
+                )
+                book_elem.set("faviconMimeType", "image/png")
+        elif favicon := (title.illustration_48x48_at_1 or book.illustration_48x48_at_1):
             book_elem.set("favicon", favicon)
             book_elem.set("faviconMimeType", "image/png")
 
@@ -1,14 +1,19 @@
 from datetime import datetime
 from http import HTTPStatus
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Path, Query, Response
+from fastapi import APIRouter, Body, Depends, Path, Query, Response
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
 from cms_backend.api.routes.dependencies import require_permission
-from cms_backend.api.routes.models import ListResponse, calculate_pagination_metadata
+from cms_backend.api.routes.models import (
+    ListResponse,
+    calculate_pagination_metadata,
+    create_list_response,
+)
+from cms_backend.db import event_log as db_event_log
 from cms_backend.db import gen_dbsession
 from cms_backend.db import zimfarm_notification as db_zimfarm_notification
 from cms_backend.schemas import BaseModel, WithExtraModel
@@ -20,6 +25,9 @@ from cms_backend.schemas.orms import (
 
 router = APIRouter(prefix="/zimfarm-notifications", tags=["zimfarm-notifications"])
 
+# maximum number of notifications accepted by the bulk endpoint at once
+MAX_BULK_NOTIFICATIONS = 1000
+
 
 class ZimfarmNotificationsGetSchema(BaseModel):
     skip: SkipField = 0
@@ -37,11 +45,16 @@ class ZimfarmNotificationCreateSchema(WithExtraModel):
     id: UUID
 
 
-@router.get("")
-async def get_zimfarm_notifications(
+class ZimfarmNotificationsBulkCreateResponse(BaseModel):
+    # IDs of notifications which were not already received
+    created_ids: list[UUID]
+
+
+@router.get("", response_model=ListResponse[ZimfarmNotificationLightSchema])
+def get_zimfarm_notifications(
     params: Annotated[ZimfarmNotificationsGetSchema, Query()],
     session: Annotated[OrmSession, Depends(gen_dbsession)],
-) -> ListResponse[ZimfarmNotificationLightSchema]:
+) -> Response:
     """Get a list of zimfarm notifications"""
 
     results = db_zimfarm_notification.get_zimfarm_notifications(
@@ -55,7 +68,7 @@ async def get_zimfarm_notifications(
         received_before=params.received_before,
     )
 
-    return ListResponse[ZimfarmNotificationLightSchema](
+    return create_list_response(
         meta=calculate_pagination_metadata(
             nb_records=results.nb_records,
             skip=params.skip,
@@ -72,31 +85,54 @@ async def get_zimfarm_notifications(
         Depends(require_permission(namespace="zimfarm_notification", name="create"))
     ],
 )
-async def create_zimfarm_notification(
+def create_zimfarm_notification(
     request: ZimfarmNotificationCreateSchema,
     session: Annotated[OrmSession, Depends(gen_dbsession)],
 ) -> Response:
     """Create a zimfarm notification"""
 
-    if db_zimfarm_notification.get_zimfarm_notification_or_none(
-        session=session, notification_id=request.id
+    content = request.model_dump()
+    content.pop("id")
+    if not db_zimfarm_notification.create_zimfarm_notifications(
+        session, [(request.id, content)]
     ):
         logger.warning(f"Ignoring duplicate Zimfarm notification for id {request.id}")
-        return Response(status_code=HTTPStatus.ACCEPTED)
 
-    content = request.model_dump()
-    content.pop("id")
-    db_zimfarm_notification.create_zimfarm_notification(
-        session,
-        notification_id=request.id,
-        content=content,
+    return Response(status_code=HTTPStatus.ACCEPTED)
+
+
+@router.post(
+    "/bulk",
+    status_code=HTTPStatus.ACCEPTED,
+    dependencies=[
+        Depends(require_permission(namespace="zimfarm_notification", name="create"))
+    ],
+)
+def create_zimfarm_notifications(
+    request: Annotated[
+        list[ZimfarmNotificationCreateSchema],
+        Body(min_length=1, max_length=MAX_BULK_NOTIFICATIONS),
+    ],
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+) -> ZimfarmNotificationsBulkCreateResponse:
+    """Create many zimfarm notifications at once, ignoring already received ones"""
+
+    notifications: list[tuple[UUID, dict[str, Any]]] = []
+    for notification in request:
+        content = notification.model_dump()
+        content.pop("id")
+        notifications.append((notification.id, content))
+    created_ids = db_zimfarm_notification.create_zimfarm_notifications(
+        session, notifications
     )
+    if nb_ignored := len(notifications) - len(created_ids):
+        logger.warning(f"Ignoring {nb_ignored} duplicate Zimfarm notifications")
 
-    return Response(status_code=HTTPStatus.ACCEPTED)
+    return ZimfarmNotificationsBulkCreateResponse(created_ids=created_ids)
 
 
 @router.get("/{notification_id}")
-async def get_zimfarm_notification(
+def get_zimfarm_notification(
     notification_id: Annotated[UUID, Path()],
     session: Annotated[OrmSession, Depends(gen_dbsession)],
 ) -> ZimfarmNotificationFullSchema:
@@ -112,5 +148,28 @@ async def get_zimfarm_notification(
         status=db_notification.status,
         received_at=db_notification.received_at,
         content=db_notification.content,
-        events=db_notification.events,
+        events=db_event_log.get_latest_events(session, db_notification),
+    )
+
+
+@router.get("/{notification_id}/events")
+def get_zimfarm_notification_events(
+    notification_id: Annotated[UUID, Path()],
+    session: Annotated[OrmSession, Depends(gen_dbsession)],
+    skip: Annotated[SkipField, Query()] = 0,
+    limit: Annotated[LimitFieldMax200, Query()] = 200,
+) -> ListResponse[str]:
+    """Get a zimfarm notification's events, in chronological order"""
+    db_notification = db_zimfarm_notification.get_zimfarm_notification(
+        session=session, notification_id=notification_id
+    )
+    results = db_event_log.get_events(session, db_notification, skip=skip, limit=limit)
+    return ListResponse(
+        items=results.records,
+        meta=calculate_pagination_metadata(
+            nb_records=results.nb_records,
+            skip=skip,
+            limit=limit,
+            page_size=len(results.records),
+        ),
     )
@@ -1,6 +1,11 @@
 import abc
 import datetime
+import hashlib
+import threading
+import time
 import uuid
+from collections import OrderedDict
+from typing import Any
 
 import jwt
 from jwt import PyJWKClient
@@ -40,9 +45,10 @@ class TokenDecoder(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def can_decode(self, token: str) -> bool:
+    def can_decode(self, payload: dict[str, Any]) -> bool:
         """
-        Check if this decoder can potentially decode the given token.
+        Check if this decoder can potentially decode a token, given its unverified
+        payload.
         """
         pass
 
@@ -65,21 +71,9 @@ class LocalTokenDecoder(TokenDecoder):
     def name(self) -> str:
         return "local"
 
-    def can_decode(self, token: str) -> bool:
+    def can_decode(self, payload: dict[str, Any]) -> bool:
         if "local" not in Context.auth_modes:
             return False
-        try:
-            payload = jwt.decode(
-                token,
-                options={
-                    "verify_signature": False,
-                    "verify_exp": False,
-                    "verify_aud": False,
-                    "verify_iss": False,
-                },
-            )
-        except Exception:
-            return False
 
         if payload.get("iss") != Context.jwt_token_issuer:
             return False
@@ -137,21 +131,9 @@ class OAuthTokenDecoder(TokenDecoder):
     def name(self) -> str:
         return "oauth"
 
-    def can_decode(self, token: str) -> bool:
+    def can_decode(self, payload: dict[str, Any]) -> bool:
         if "oauth" not in Context.auth_modes:
             return False
-        try:
-            payload = jwt.decode(
-                token,
-                options={
-                    "verify_signature": False,
-                    "verify_exp": False,
-                    "verify_aud": False,
-                    "verify_iss": False,
-                },
-            )
-        except Exception:
-            return False
 
         if (
             payload.get("iss") != Context.oauth_issuer
@@ -161,6 +143,52 @@ class OAuthTokenDecoder(TokenDecoder):
         return True
 
 
+class TokenClaimsCache:
+    """Bounded LRU cache of the claims of verified tokens, keyed by token hash
+
+    Entries expire after `ttl` seconds or when their token expires, whichever comes
+    first. Tokens themselves are never stored.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, JWTClaims]] = OrderedDict()
+        # routes (and thus token decoding) run in a threadpool
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> JWTClaims | None:
+        key = self._get_key(token)
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, token: str, claims: JWTClaims):
+        if self.max_size <= 0:
+            return
+        expires_at = min(time.time() + self.ttl, claims.exp.timestamp())
+        key = self._get_key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
 class TokenDecoderChain:
     """Chain of responsibility for token decoders."""
 
@@ -169,13 +197,44 @@ class TokenDecoderChain:
         Initialize decoder chain.
         """
         self.decoders = decoders
+        self.claims_cache = TokenClaimsCache(
+            max_size=Context.token_claims_cache_size,
+            ttl=Context.token_claims_cache_ttl,
+        )
 
     def decode(self, token: str) -> JWTClaims:
+        """
+        Decode token, from cache if it was already verified.
+        """
+        if (claims := self.claims_cache.get(token)) is not None:
+            return claims
+        claims = self._decode(token)
+        self.claims_cache.set(token, claims)
+        return claims
+
+    def _decode(self, token: str) -> JWTClaims:
         """
         Try to decode token using each decoder in order.
         """
         exc_cls: Exception | None = None
-        decoders = [decoder for decoder in self.decoders if decoder.can_decode(token)]
+        # token is parsed once to find out which decoders might verify it
+        try:
+            payload = jwt.decode(
+                token,
+                options={
+                    "verify_signature": False,
+                    "verify_exp": False,
+                    "verify_aud": False,
+                    "verify_iss": False,
+                },
+            )
+        except Exception:
+            payload = None
+        decoders = (
+            [decoder for decoder in self.decoders if decoder.can_decode(payload)]
+            if payload is not None
+            else []
+        )
         if not decoders:
             raise ValueError("No decoders registered for decoding token.")
 
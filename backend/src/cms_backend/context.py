@@ -7,9 +7,10 @@ from pathlib import Path
 from typing import Any, ClassVar, TypeVar
 from uuid import UUID
 
-import pycountry
 from humanfriendly import parse_timespan
 
+from cms_backend.utils.language import is_iso_language_code
+
 T = TypeVar("T")
 
 
@@ -39,7 +40,7 @@ def _parse_custom_language_codes(language_code: str | None) -> list[str]:
 
 def _validate_language_codes(language_codes: list[str]) -> list[str]:
     for code in language_codes:
-        if pycountry.languages.get(alpha_3=code) is None:  # pyright: ignore[reportUnknownMemberType]
+        if not is_iso_language_code(code):
             raise ValueError(f"Code '{code}' is not a valid ISO 639-3 code.")
     return language_codes
 
@@ -129,6 +130,22 @@ class Context:
     requests_timeout: int = field(
         default=int(parse_timespan(os.getenv("REQUESTS_TIMEOUT", default="30s")))
     )
+    # folder where downloaded zimcheck results are cached, results are only kept in
+    # memory if not set
+    zimcheck_cache_path: Path | None = field(
+        default=Path(os.environ["ZIMCHECK_CACHE_PATH"])
+        if os.getenv("ZIMCHECK_CACHE_PATH")
+        else None
+    )
+    zimcheck_cache_ttl: timedelta = field(
+        default=timedelta(
+            seconds=parse_timespan(os.getenv("ZIMCHECK_CACHE_TTL", default="7d"))
+        )
+    )
+    # number of zimcheck results downloaded concurrently
+    zimcheck_fetch_concurrency: int = field(
+        default=int(os.getenv("ZIMCHECK_FETCH_CONCURRENCY", "4"))
+    )
     # Regex of scrapers to ignore when running checks for zimcheck quality
     # e.g mwoflliner*|sotoki*
     zimcheck_scrapers_whitelist_regex: ClassVar[re.Pattern[str] | None] = (
@@ -143,6 +160,53 @@ class Context:
         default=os.getenv("ZIMFARM_API_URL", "https://api.farm.openzim.org/v2")
     )
 
+    # how long rarely changing reference data (accounts, warehouses, collections)
+    # is cached by each process
+    reference_data_cache_ttl: timedelta = field(
+        default=timedelta(
+            seconds=parse_timespan(os.getenv("REFERENCE_DATA_CACHE_TTL", default="5m"))
+        )
+    )
+
+    # public collections grant access to their content, changes made by other
+    # processes must be seen quickly
+    public_collection_ids_cache_ttl: timedelta = field(
+        default=timedelta(
+            seconds=parse_timespan(
+                os.getenv("PUBLIC_COLLECTION_IDS_CACHE_TTL", default="5s")
+            )
+        )
+    )
+
+    # history entries only store changes since the previous entry, a full copy is
+    # stored every history_checkpoint_interval entries to bound rebuilding cost
+    history_checkpoint_interval: int = field(
+        default=int(os.getenv("HISTORY_CHECKPOINT_INTERVAL", "20"))
+    )
+
+    # number of latest events of books, titles and notifications in full schemas,
+    # all events are available through a paginated endpoint
+    latest_events_limit: int = field(
+        default=int(os.getenv("LATEST_EVENTS_LIMIT", "100"))
+    )
+
+    # rendered responses of read endpoints are cached in an LRU of each process,
+    # or shared by all processes when set to the URL of a local Redis-compatible
+    # server (e.g. redis://localhost:6379/0); full books and titles, mostly modified
+    # by the mill and the shuttle, are only cached by a shared server
+    response_cache_url: str = field(default=os.getenv("RESPONSE_CACHE_URL", ""))
+    response_cache_max_entries: int = field(
+        default=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000"))
+    )
+    response_cache_ttl: timedelta = field(
+        default=timedelta(
+            seconds=parse_timespan(os.getenv("RESPONSE_CACHE_TTL", default="1m"))
+        )
+    )
+
+    # number of rows fetched at once from the server-side cursor of exports
+    export_batch_size: int = field(default=int(os.getenv("EXPORT_BATCH_SIZE", "1000")))
+
     rotten_flavour_threshold: timedelta = field(
         default=timedelta(
             seconds=parse_timespan(os.getenv("ROTTEN_FLAVOUR_THRESHOLD", default="56w"))
@@ -1,13 +1,30 @@
-from collections.abc import Callable, Generator
+import datetime
+from collections.abc import Callable, Generator, Iterable, Sequence
+from functools import cache
 from typing import Any
+from uuid import UUID
 
 from bson.json_util import RELAXED_JSON_OPTIONS, dumps, loads
-from sqlalchemy import SelectBase, create_engine, func, select
+from sqlalchemy import (
+    Engine,
+    Select,
+    SelectBase,
+    create_engine,
+    func,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.orm import InstrumentedAttribute, sessionmaker
 from sqlalchemy.orm import Session as OrmSession
-from sqlalchemy.orm import sessionmaker
 
 from cms_backend.context import Context
 
+# registers the session listeners invalidating cached responses on writes
+from cms_backend.db import (
+    response_cache,  # noqa: F401  # pyright: ignore[reportUnusedImport]
+)
+
 
 # custom overload of bson deserializer to make naive datetime
 # this is needed to have objects from the DB with naive datetime properties
@@ -27,19 +44,36 @@ def cms_dumps(obj: Any, *args: Any, **kwargs: Any):
     return dumps(obj, *args, json_options=RELAXED_JSON_OPTIONS, **kwargs)
 
 
+@cache
+def get_engine() -> Engine:
+    """Engine of the CMS database, created on first use
+
+    Creating it loads the DB driver, which is slow to import and useless to processes
+    (CLI help, tests) which never connect.
+    """
+    return create_engine(
+        Context.database_url,
+        echo=False,
+        json_serializer=cms_dumps,
+        json_deserializer=cms_loads,
+    )
+
+
+class LazySessionmaker(sessionmaker[OrmSession]):
+    """sessionmaker binding its sessions to the engine only when the first is made"""
+
+    def __call__(self, **local_kw: Any) -> OrmSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
 if (
     Context.database_url == "nodb"
 ):  # this is a hack for cases where we do not need the DB, e.g. unit tests
     Session = None
 else:
-    Session = sessionmaker(
-        bind=create_engine(
-            Context.database_url,
-            echo=False,
-            json_serializer=cms_dumps,
-            json_deserializer=cms_loads,
-        )
-    )
+    Session = LazySessionmaker()
 
 
 def gen_dbsession() -> Generator[OrmSession]:
@@ -107,8 +141,80 @@ def dbsession_manual(
     return inner
 
 
+def dbsession_generator(
+    func: Callable[..., Iterable[Any]],
+) -> Callable[..., Generator[Any]]:
+    """Decorator to create an SQLAlchemy ORM session object and wrap the generator
+    function inside the session. A `session` argument is automatically set.
+
+    The session only opens on first iteration and lives until the generator is
+    exhausted or closed, e.g. while a streaming response is sent, after FastAPI
+    dependencies are closed. Nothing is committed, the generator must only read.
+    """
+
+    def inner(*args: Any, **kwargs: Any) -> Generator[Any]:
+        if Session is None:
+            raise RuntimeError("DB is disabled")
+
+        with Session() as session:
+            kwargs["session"] = session
+            yield from func(*args, **kwargs)
+
+    return inner
+
+
 def count_from_stmt(session: OrmSession, stmt: SelectBase) -> int:
     """Count all records returned by any statement `stmt` passed as parameter"""
     return session.execute(
         select(func.count()).select_from(stmt.subquery())
     ).scalar_one()
+
+
+def iter_batches[T](
+    session: OrmSession,
+    stmt: Select[tuple[T]],
+    *,
+    created_at_column: InstrumentedAttribute[datetime.datetime],
+    id_column: InstrumentedAttribute[UUID],
+    batch_size: int = 50,
+    commit_every: int | None = None,
+) -> Generator[Sequence[T]]:
+    """Iterate over the records of `stmt` in batches ordered by (created_at, id)
+
+    Batches are fetched with keyset pagination: each query resumes after the last
+    record of the previous batch instead of using an offset or a list of IDs to
+    omit, so every query has the same cost whatever the progress of the job.
+
+    If `commit_every` is set, the session is committed every `commit_every`
+    batches once they have been processed by the caller, and at the end.
+    """
+    last_key: tuple[datetime.datetime, UUID] | None = None
+    nb_uncommitted_batches = 0
+    while True:
+        batch_stmt = (
+            stmt.order_by(None).order_by(created_at_column, id_column).limit(batch_size)
+        )
+        if last_key is not None:
+            last_created_at, last_id = last_key
+            batch_stmt = batch_stmt.where(
+                tuple_(created_at_column, id_column)
+                > tuple_(literal(last_created_at), literal(last_id))
+            )
+        batch = session.scalars(batch_stmt).all()
+        if not batch:
+            break
+
+        # read the key before yielding since a commit expires the record
+        last_key = (
+            getattr(batch[-1], created_at_column.key),
+            getattr(batch[-1], id_column.key),
+        )
+        yield batch
+
+        nb_uncommitted_batches += 1
+        if commit_every is not None and nb_uncommitted_batches >= commit_every:
+            session.commit()
+            nb_uncommitted_batches = 0
+
+    if commit_every is not None and nb_uncommitted_batches:
+        session.commit()
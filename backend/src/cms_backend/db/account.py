@@ -14,6 +14,7 @@ from cms_backend.db.exceptions import (
     RecordDoesNotExistError,
 )
 from cms_backend.db.models import Account
+from cms_backend.db.reference_data import invalidate_reference_data
 from cms_backend.roles import ROLES, RoleEnum, merge_scopes
 from cms_backend.schemas.fields import NotEmptyString
 from cms_backend.schemas.models import AccountUpdateSchema
@@ -150,6 +151,7 @@ def delete_account(
     session.execute(
         update(Account).where(Account.id == account_id).values(deleted=True)
     )
+    invalidate_reference_data(session)
 
 
 def get_accounts(
@@ -233,6 +235,7 @@ def update_account(
             .values(**values)
             .returning(Account)
         ).one()
+        invalidate_reference_data(session)
 
     if request.role is not None:
         delete_collection_permissions(session, account_id=account.id)
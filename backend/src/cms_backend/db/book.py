@@ -1,34 +1,58 @@
 import datetime
 import re
-from collections.abc import Sequence
-from typing import Any, Literal
+from collections.abc import Callable, Sequence
+from typing import Any, Literal, TypedDict
 from uuid import UUID
 
-import pycountry
-import regex
-from sqlalchemy import exists, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Select,
+    and_,
+    bindparam,
+    case,
+    cast,
+    exists,
+    false,
+    func,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
 from sqlalchemy.orm import Session as OrmSession
-from sqlalchemy.orm import selectinload
 
 from cms_backend import logger
 from cms_backend.context import Context
 from cms_backend.db import count_from_stmt
 from cms_backend.db.book_location import create_book_target_locations
+from cms_backend.db.event_log import get_latest_events, log_event, log_events
 from cms_backend.db.exceptions import RecordDoesNotExistError
-from cms_backend.db.flavour import get_title_flavour_or_none
+from cms_backend.db.history import get_history_entry_values, resolve_history_entries
+from cms_backend.db.illustration import (
+    ILLUSTRATION_48X48_AT_1_KEY,
+    get_book_zim_metadata,
+    set_book_zim_metadata,
+    set_title_illustration_48x48_at_1_from_book,
+)
+from cms_backend.db.loader_options import LoadProfile, book_loader_options
 from cms_backend.db.models import (
     Book,
     BookHistory,
+    Collection,
     CollectionTitle,
     Title,
     ZimfarmNotification,
 )
+from cms_backend.db.reference_data import get_collection_warehouse_id
 from cms_backend.db.rules import (
+    TITLE_MANDATORY_METADATA_FIELDS,
     apply_retention_rules,
     title_is_missing_mandatory_metadata,
 )
 from cms_backend.schemas.models import (
     ZIM_TITLE_NAME_REGEX,
+    BookActionResultSchema,
     BookUpdateSchema,
     FileLocation,
 )
@@ -39,39 +63,73 @@ from cms_backend.schemas.orms import (
     ListResult,
     ZimcheckSummarySchema,
 )
+from cms_backend.utils import get_grapheme_length
 from cms_backend.utils.datetime import getnow
 from cms_backend.utils.filename import compute_target_filename
-from cms_backend.utils.requests import query_api
+from cms_backend.utils.language import is_supported_language_code
 from cms_backend.utils.zim import (
+    MANDATORY_METADATA_KEYS,
     get_missing_keys,
     get_missing_metadata_keys,
     parse_zimcheck_result,
 )
-
-
-def get_book_or_none(
-    session: OrmSession,
-    book_id: UUID,
+from cms_backend.utils.zimcheck_fetcher import fetch_zimcheck_result, zimcheck_fetcher
+
+
+class BookCriteria(TypedDict, total=False):
+    """Criteria a book must meet for an action, as filters of `get_book_or_none`"""
+
+    needs_file_operation: bool
+    needs_processing: bool
+    locations: list[str]
+    has_error: bool
+
+
+# books which can be marked for deletion
+DELETABLE_BOOK_CRITERIA: BookCriteria = {
+    "needs_processing": False,
+    "needs_file_operation": False,
+    "locations": ["staging", "prod", "quarantine"],
+}
+# books which can be moved between staging and prod
+MOVABLE_BOOK_CRITERIA: BookCriteria = {
+    "needs_file_operation": False,
+    "needs_processing": False,
+    "locations": ["staging", "prod"],
+    "has_error": False,
+}
+# books which can be recovered after being marked for deletion
+RECOVERABLE_BOOK_CRITERIA: BookCriteria = {
+    "needs_processing": False,
+    "locations": ["to_delete", "deleted"],
+}
+# books which can be backed up
+BACKUPABLE_BOOK_CRITERIA: BookCriteria = {
+    "has_error": False,
+    "needs_processing": False,
+    "needs_file_operation": False,
+    "locations": ["staging", "quarantine", "prod"],
+}
+
+
+def _select_books(
+    book_ids: Sequence[UUID],
     *,
-    accessible_collection_ids: Sequence[UUID] | None = None,
-    needs_file_operation: bool | None = None,
-    needs_processing: bool | None = None,
-    locations: list[str] | None = None,
-    has_error: bool | None = None,
-) -> Book | None:
-    """Get a book by ID if possible else None
-
-    Only returns books whose title belongs to at least one of the
-    accessible_collection_ids.
-    """
-    return session.scalars(
+    accessible_collection_ids: Sequence[UUID] | None,
+    needs_file_operation: bool | None,
+    needs_processing: bool | None,
+    locations: list[str] | None,
+    has_error: bool | None,
+    load_profile: LoadProfile,
+) -> Select[tuple[Book]]:
+    return (
         select(Book)
         .where(
             # If a client provides an argument i.e it is not None,
             # we compare the corresponding model field against the argument,
             # otherwise, we compare the argument to its default which translates
             # to a SQL true i.e we don't filter based on this argument (a no-op).
-            (Book.id == book_id),
+            (Book.id.in_(book_ids)),
             (Book.needs_file_operation.is_(needs_file_operation))
             | (needs_file_operation is None),
             (Book.needs_processing.is_(needs_processing)) | (needs_processing is None),
@@ -83,19 +141,77 @@ def get_book_or_none(
             )
             | (accessible_collection_ids is None),
         )
-        .options(
-            selectinload(Book.title),
-            selectinload(Book.zimfarm_notification),
-            selectinload(Book.locations),
+        .options(*book_loader_options(load_profile))
+    )
+
+
+def get_book_or_none(
+    session: OrmSession,
+    book_id: UUID,
+    *,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+    needs_file_operation: bool | None = None,
+    needs_processing: bool | None = None,
+    locations: list[str] | None = None,
+    has_error: bool | None = None,
+    load_profile: LoadProfile = "full_schema",
+) -> Book | None:
+    """Get a book by ID if possible else None
+
+    Only returns books whose title belongs to at least one of the
+    accessible_collection_ids. Relationships needed by `load_profile` are eagerly
+    loaded.
+    """
+    return session.scalars(
+        _select_books(
+            [book_id],
+            accessible_collection_ids=accessible_collection_ids,
+            needs_file_operation=needs_file_operation,
+            needs_processing=needs_processing,
+            locations=locations,
+            has_error=has_error,
+            load_profile=load_profile,
         )
     ).one_or_none()
 
 
+def get_books_by_id(
+    session: OrmSession,
+    book_ids: Sequence[UUID],
+    *,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+    needs_file_operation: bool | None = None,
+    needs_processing: bool | None = None,
+    locations: list[str] | None = None,
+    has_error: bool | None = None,
+    load_profile: LoadProfile = "full_schema",
+) -> dict[UUID, Book]:
+    """Get books by ID in a single query, with the same filters as get_book_or_none
+
+    Books which do not exist or do not match filters are missing from the result.
+    """
+    return {
+        book.id: book
+        for book in session.scalars(
+            _select_books(
+                book_ids,
+                accessible_collection_ids=accessible_collection_ids,
+                needs_file_operation=needs_file_operation,
+                needs_processing=needs_processing,
+                locations=locations,
+                has_error=has_error,
+                load_profile=load_profile,
+            )
+        )
+    }
+
+
 def get_book(
     session: OrmSession,
     book_id: UUID,
     *,
     accessible_collection_ids: Sequence[UUID] | None = None,
+    load_profile: LoadProfile = "full_schema",
 ) -> Book:
     """Get a book by ID if possible else raise an exception"""
     if (
@@ -103,6 +219,7 @@ def get_book(
             session,
             book_id=book_id,
             accessible_collection_ids=accessible_collection_ids,
+            load_profile=load_profile,
         )
     ) is None:
         raise RecordDoesNotExistError(
@@ -111,7 +228,7 @@ def get_book(
     return book
 
 
-def create_book_full_schema(book: Book) -> BookFullSchema:
+def create_book_full_schema(session: OrmSession, book: Book) -> BookFullSchema:
     # Separate current and target locations
     current_locations = [
         BookLocationSchema(
@@ -155,8 +272,8 @@ def create_book_full_schema(book: Book) -> BookFullSchema:
         media_count=book.media_count,
         size=book.size,
         zimcheck_result_url=book.zimcheck_result_url,
-        zim_metadata=book.zim_metadata,
-        events=book.events,
+        zim_metadata=get_book_zim_metadata(book),
+        events=get_latest_events(session, book),
         current_locations=current_locations,
         target_locations=target_locations,
         title_archived=book.title.archived if book.title else False,
@@ -197,7 +314,7 @@ def create_book(
         article_count=article_count,
         media_count=media_count,
         size=size,
-        zim_metadata=zim_metadata,
+        zim_metadata={},
         zimcheck_result_url=zimcheck_result_url,
         name=name,
         date=date,
@@ -207,13 +324,10 @@ def create_book(
         if zimfarm_notification.content.get("recipe_id")
         else None,
     )
+    set_book_zim_metadata(session, book, zim_metadata)
     session.add(book)
-    zimfarm_notification.events.append(
-        f"{getnow()}: notification transformed into book"
-    )
-    book.events.append(
-        f"{getnow()}: created from Zimfarm notification {zimfarm_notification.id}"
-    )
+    log_event(zimfarm_notification, "notification transformed into book")
+    log_event(book, f"created from Zimfarm notification {zimfarm_notification.id}")
 
     create_book_history_entry(
         session, book, author_id, comment="Create initial history"
@@ -234,6 +348,7 @@ def get_next_book_to_move_files_or_none(
         )
         .order_by(Book.created_at)
         .limit(1)
+        .options(*book_loader_options("processing"))
     ).one_or_none()
 
 
@@ -247,6 +362,7 @@ def get_next_book_to_process_or_none(
         .where(Book.has_error.is_(False))
         .order_by(Book.created_at)
         .limit(1)
+        .options(*book_loader_options("processing"))
     ).one_or_none()
 
 
@@ -264,14 +380,11 @@ def delete_book(
     - Setting force_delete makes the book deletion_date to be set to now instead of the
        env BOOK_DELETION_DELAY. This potentially makes the book unrecoverable.
     """
-    now = getnow()
     book = get_book_or_none(
         session,
         book_id=book_id,
         accessible_collection_ids=accessible_collection_ids,
-        needs_processing=False,
-        needs_file_operation=False,
-        locations=["staging", "prod", "quarantine"],
+        **DELETABLE_BOOK_CRITERIA,
     )
     if book is None:
         raise RecordDoesNotExistError(
@@ -279,8 +392,15 @@ def delete_book(
             "is not accessible to you."
         )
 
-    deletion_date = now if force_delete else now + deletion_delay
+    now = getnow()
+    return _mark_book_for_deletion(
+        session, book, deletion_date=now if force_delete else now + deletion_delay
+    )
+
 
+def _mark_book_for_deletion(
+    session: OrmSession, book: Book, *, deletion_date: datetime.datetime
+) -> Book:
     if book.location_kind in ("staging", "prod", "quarantine"):
         book.deletion_date = deletion_date
     else:  # should never get here because of filtering by locations
@@ -290,14 +410,51 @@ def delete_book(
         )
     book.location_kind = "to_delete"
     book.needs_file_operation = True
-    book.events.append(
-        f"{now}: marked for deletion, will be deleted after {deletion_date}"
-    )
+    log_event(book, f"marked for deletion, will be deleted after {deletion_date}")
     session.add(book)
     session.flush()
     return book
 
 
+def expire_staging_books(
+    session: OrmSession,
+    *,
+    created_before: datetime.datetime,
+    deletion_delay: datetime.timedelta,
+) -> list[UUID]:
+    """Mark all staging books created before `created_before` for deletion.
+
+    Eligibility is the same as `delete_book` for staging books (no pending
+    processing or file operation). Books are updated in a single statement and
+    their event logged in another one. Returns the IDs of the books marked for
+    deletion.
+    """
+    now = getnow()
+    deletion_date = now + deletion_delay
+    book_ids = list(
+        session.scalars(
+            update(Book)
+            .where(
+                Book.location_kind == "staging",
+                Book.needs_processing.is_(False),
+                Book.needs_file_operation.is_(False),
+                Book.created_at < created_before,
+            )
+            .values(
+                location_kind="to_delete",
+                needs_file_operation=True,
+                deletion_date=deletion_date,
+            )
+            .returning(Book.id)
+        ).all()
+    )
+    message = f"marked for deletion, will be deleted after {deletion_date}"
+    log_events(
+        session, "book", [(book_id, message) for book_id in book_ids], created_at=now
+    )
+    return book_ids
+
+
 def move_book(
     session: OrmSession,
     *,
@@ -314,10 +471,8 @@ def move_book(
         session,
         book_id=book_id,
         accessible_collection_ids=accessible_collection_ids,
-        needs_file_operation=False,
-        needs_processing=False,
-        locations=["staging", "prod"],
-        has_error=False,
+        load_profile="processing",
+        **MOVABLE_BOOK_CRITERIA,
     )
 
     if book is None:
@@ -330,8 +485,17 @@ def move_book(
 
 
 def move_book_to_destination(
-    session: OrmSession, *, book: Book, destination: Literal["staging", "prod"]
+    session: OrmSession,
+    *,
+    book: Book,
+    destination: Literal["staging", "prod"],
+    apply_rules: bool = True,
 ) -> Book:
+    """Schedule the move of a book to destination
+
+    Retention rules of its title are applied when moved to prod, unless `apply_rules`
+    is False, e.g. to apply them once after moving many books of the same title.
+    """
     if not book.title:
         raise ValueError(f"Book {book.id} has no associated title.")
 
@@ -366,7 +530,11 @@ def move_book_to_destination(
         ]
         if goes_to_staging
         else [
-            FileLocation(tc.collection.warehouse_id, tc.path, existing_filename)
+            FileLocation(
+                get_collection_warehouse_id(session, collection_id=tc.collection_id),
+                tc.path,
+                existing_filename,
+            )
             for tc in book.title.collections
         ]
     )
@@ -376,15 +544,15 @@ def move_book_to_destination(
         book=book,
         target_locations=target_locations,
     )
-    book.events.append(
-        f"{getnow()}: Book scheduled to be moved from '{book.location_kind}' to "
-        f"'{destination}'"
+    log_event(
+        book,
+        f"Book scheduled to be moved from '{book.location_kind}' to '{destination}'",
     )
     book.location_kind = "staging" if goes_to_staging else "prod"
     session.add(book)
     session.flush()
 
-    if not goes_to_staging:
+    if not goes_to_staging and apply_rules:
         apply_retention_rules(session, book.title)
 
     return book
@@ -425,13 +593,12 @@ def recover_book(
     accessible_collection_ids: Sequence[UUID] | None = None,
 ) -> Book:
     """Recover a book marked for deletion."""
-    now = getnow()
     book = get_book_or_none(
         session,
         book_id,
         accessible_collection_ids=accessible_collection_ids,
-        needs_processing=False,
-        locations=["to_delete", "deleted"],
+        load_profile="processing",
+        **RECOVERABLE_BOOK_CRITERIA,
     )
 
     if book is None:
@@ -439,6 +606,10 @@ def recover_book(
             f"Book {book_id} is not eligible for recovery or is not accessible to you."
         )
 
+    return _recover_book(session, book)
+
+
+def _recover_book(session: OrmSession, book: Book) -> Book:
     if book.title and book.title.archived:
         raise ValueError(f"Book title {book.title_id} is currently archived")
 
@@ -447,19 +618,17 @@ def recover_book(
 
     if book.location_kind == "to_delete" and book.needs_file_operation is False:
         raise RecordDoesNotExistError(
-            f"Book {book_id} is not eligible for recovery or is not accessible to you."
+            f"Book {book.id} is not eligible for recovery or is not accessible to you."
         )
 
-    if book.deletion_date and book.deletion_date <= now:
+    if book.deletion_date and book.deletion_date <= getnow():
         raise RecordDoesNotExistError(
-            f"Book {book_id} is not eligible for recovery or is not accessible to you."
+            f"Book {book.id} is not eligible for recovery or is not accessible to you."
         )
 
     location_kind = determine_current_location_kind(book)
     book.needs_processing = False
-    book.events.append(
-        f"{now}: Book restored from {book.location_kind} to {location_kind}"
-    )
+    log_event(book, f"Book restored from {book.location_kind} to {location_kind}")
     book.location_kind = location_kind
     book.deletion_date = None
     book.needs_file_operation = False
@@ -485,7 +654,8 @@ def get_differing_metadata_keys(book: Book) -> list[str]:
         "Publisher": book.zim_metadata["Publisher"],
         "Description": book.zim_metadata["Description"],
         "Language": book.zim_metadata["Language"],
-        "Illustration_48x48@1": book.zim_metadata["Illustration_48x48@1"],
+        # illustrations are compared by identifier, their content is not loaded
+        "Illustration_48x48@1": book.illustration_48x48_at_1_id,
         "LongDescription": book.zim_metadata.get("LongDescription"),
         "License": book.zim_metadata.get("License"),
         "Relation": book.zim_metadata.get("Relation"),
@@ -498,7 +668,7 @@ def get_differing_metadata_keys(book: Book) -> list[str]:
         "Publisher": book.title.publisher,
         "Description": book.title.description,
         "Language": book.title.language,
-        "Illustration_48x48@1": book.title.illustration_48x48_at_1,
+        "Illustration_48x48@1": book.title.illustration_48x48_at_1_id,
         "LongDescription": book.title.long_description,
         "License": book.title.license,
         "Relation": book.title.relation,
@@ -512,9 +682,13 @@ def create_book_history_entry(
     session: OrmSession, book: Book, author_id: UUID, comment: str | None = None
 ) -> BookHistory:
     history_entry = BookHistory(
-        name=book.name,
         comment=comment,
-        flavour=book.flavour,
+        **get_history_entry_values(
+            session,
+            BookHistory,
+            book,
+            {"name": book.name, "flavour": book.flavour},
+        ),
     )
     history_entry.book = book
     history_entry.author_id = author_id
@@ -586,14 +760,13 @@ def get_book_history(
         select(BookHistory)
         .where(BookHistory.book_id == book.id)
         .options(selectinload(BookHistory.author))
-        .order_by(BookHistory.created_at.desc())
+        .order_by(BookHistory.created_at.desc(), BookHistory.sequence.desc())
     )
+    entries = session.scalars(stmt.offset(skip).limit(limit)).all()
+    resolve_history_entries(session, entries)
     return ListResult[BookHistorySchema](
         nb_records=count_from_stmt(session, stmt),
-        records=[
-            create_book_history_schema(entry)
-            for entry in session.scalars(stmt.offset(skip).limit(limit)).all()
-        ],
+        records=[create_book_history_schema(entry) for entry in entries],
     )
 
 
@@ -608,11 +781,14 @@ def get_book_history_entry_or_none(
     book = get_book(
         session, book_id, accessible_collection_ids=accessible_collection_ids
     )
-    return session.scalars(
+    entry = session.scalars(
         select(BookHistory).where(
             BookHistory.id == history_id, BookHistory.book_id == book.id
         )
     ).one_or_none()
+    if entry:
+        resolve_history_entries(session, [entry])
+    return entry
 
 
 def get_book_history_entry(
@@ -672,7 +848,7 @@ def get_book_metadata_issues(book: Book) -> list[str]:
     if not re.match(ZIM_TITLE_NAME_REGEX, name):
         issues.append(f"book Name metadata ({name}) does not meet naming conventions")
 
-    title_length = len(regex.findall(r"\X", book.zim_metadata["Title"]))
+    title_length = get_grapheme_length(book.zim_metadata["Title"])
 
     if title_length > Context.zim_title_max_length:
         issues.append(
@@ -680,7 +856,7 @@ def get_book_metadata_issues(book: Book) -> list[str]:
             f"maximum length: {Context.zim_title_max_length}"
         )
 
-    description_length = len(regex.findall(r"\X", book.zim_metadata["Description"]))
+    description_length = get_grapheme_length(book.zim_metadata["Description"])
     if description_length > Context.zim_description_max_length:
         issues.append(
             f"book Description metadata is {description_length} characters long, "
@@ -795,7 +971,7 @@ def get_book_unsupported_languages(book: Book) -> list[str]:
 
     unknown_languages: list[str] = []
     for language_code in book.zim_metadata["Language"].split(","):
-        if pycountry.languages.get(alpha_3=language_code) is None:  # pyright: ignore[reportUnknownMemberType]
+        if not is_supported_language_code(language_code):
             unknown_languages.append(language_code)
     return unknown_languages
 
@@ -820,13 +996,64 @@ def get_latest_prod_book(session: OrmSession, book: Book):
     return latest_book
 
 
+def get_latest_prod_books(
+    session: OrmSession, books: Sequence[Book]
+) -> dict[UUID, Book]:
+    """Get the latest prod book of every book, see get_latest_prod_book
+
+    Retrieves the two latest prod books of each title and flavour in one query since
+    a book can be the latest prod book of its own title and flavour.
+    """
+    title_ids = {book.title_id for book in books if book.title_id is not None}
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=(Book.title_id, Book.flavour),
+            order_by=Book.created_at.desc(),
+        )
+        .label("rank")
+    )
+    ranked_books = (
+        select(Book.id, rank)
+        .where(Book.location_kind == "prod", Book.title_id.in_(title_ids))
+        .subquery()
+    )
+    prod_books: dict[tuple[UUID | None, str], list[Book]] = {}
+    for prod_book in session.scalars(
+        select(Book)
+        .join(ranked_books, ranked_books.c.id == Book.id)
+        .where(ranked_books.c.rank <= 2)  # noqa: PLR2004
+        .order_by(ranked_books.c.rank)
+    ):
+        prod_books.setdefault((prod_book.title_id, prod_book.flavour), []).append(
+            prod_book
+        )
+
+    return {
+        book.id: next(
+            (
+                prod_book
+                for prod_book in prod_books.get((book.title_id, book.flavour), [])
+                if prod_book.id != book.id
+            ),
+            book,
+        )
+        for book in books
+    }
+
+
 def get_book_issues(
-    session: OrmSession, book: Book, *, raise_exceptions: bool = False
+    session: OrmSession,
+    book: Book,
+    *,
+    raise_exceptions: bool = False,
+    latest_book: Book | None = None,
 ) -> dict[str, list[str]]:
     """
     Compute book issues based on it's associated title
 
-    Makes the same assumptions as the update_book_issues function
+    Makes the same assumptions as the update_book_issues function. The latest prod
+    book is retrieved unless passed (when computing issues of many books).
     """
     if book.title is None:
         raise ValueError("Book must have a title in order to compute issues")
@@ -865,7 +1092,8 @@ def get_book_issues(
     if metadata_issues:
         issues["bad metadata"] = metadata_issues
 
-    latest_book = get_latest_prod_book(session, book)
+    if latest_book is None:
+        latest_book = get_latest_prod_book(session, book)
 
     article_count_issues = get_book_article_count_issues(
         book=book, latest_book=latest_book
@@ -884,6 +1112,16 @@ def get_book_issues(
     return issues
 
 
+def get_book_missing_metadata_keys(book: Book) -> list[str]:
+    """Missing mandatory metadata keys of a book, without loading its illustration"""
+    return get_missing_metadata_keys(
+        {
+            **book.zim_metadata,
+            ILLUSTRATION_48X48_AT_1_KEY: book.illustration_48x48_at_1_id,
+        }
+    )
+
+
 def can_compute_book_issues(book: Book) -> bool:
     """Deterimine if a book's issues can be computed.
 
@@ -895,7 +1133,7 @@ def can_compute_book_issues(book: Book) -> bool:
     """
     if (
         not book.title
-        or get_missing_metadata_keys(book.zim_metadata)
+        or get_book_missing_metadata_keys(book)
         or title_is_missing_mandatory_metadata(book.title)
         or book.location_kind in ["deleted", "to_delete"]
     ):
@@ -903,8 +1141,7 @@ def can_compute_book_issues(book: Book) -> bool:
     return True
 
 
-def book_is_whitelisted_from_zimcheck(book: Book) -> bool:
-    scraper = book.zim_metadata.get("Scraper", "")
+def scraper_is_whitelisted_from_zimcheck(scraper: str) -> bool:
     if Context.zimcheck_scrapers_whitelist_regex is not None and re.search(
         Context.zimcheck_scrapers_whitelist_regex, scraper
     ):
@@ -912,6 +1149,10 @@ def book_is_whitelisted_from_zimcheck(book: Book) -> bool:
     return False
 
 
+def book_is_whitelisted_from_zimcheck(book: Book) -> bool:
+    return scraper_is_whitelisted_from_zimcheck(book.zim_metadata.get("Scraper", ""))
+
+
 def update_book_issues(
     session: OrmSession,
     book: Book,
@@ -933,40 +1174,262 @@ def update_book_issues(
     issue_keys = list(issues.keys())
     book.issues = issue_keys
     if update_events and book_is_whitelisted_from_zimcheck(book):
-        book.events.append(f"{getnow()}: book is whitelisted for zimcheck quality")
+        log_event(book, "book is whitelisted for zimcheck quality")
     if update_events and issue_keys:
-        book.events.append(
-            f"{getnow()}: book has the following issues: {','.join(issue_keys)}"
-        )
+        log_event(book, f"book has the following issues: {','.join(issue_keys)}")
 
     session.add(book)
     session.flush()
     return issues
 
 
+def update_books_issues(
+    session: OrmSession, books: Sequence[Book]
+) -> dict[UUID, dict[str, list[str]]]:
+    """Update issues of many books at once
+
+    Same as calling update_book_issues on every book, but inputs of the checks are
+    gathered in bulk: latest prod books are retrieved in one query and missing
+    zimcheck results are downloaded concurrently. Books are flushed once.
+    """
+    books = [book for book in books if can_compute_book_issues(book)]
+    if not books:
+        return {}
+
+    latest_books = get_latest_prod_books(session, books)
+    prefetch_zimcheck_results(books)
+
+    books_issues: dict[UUID, dict[str, list[str]]] = {}
+    for book in books:
+        issues = get_book_issues(session, book, latest_book=latest_books[book.id])
+        book.issues = list(issues.keys())
+        books_issues[book.id] = issues
+        session.add(book)
+
+    session.flush()
+    return books_issues
+
+
+def _can_compute_issues_expression() -> ColumnElement[bool]:
+    """SQL equivalent of can_compute_book_issues, for books joined to their title"""
+    return and_(
+        Book.location_kind.not_in(["deleted", "to_delete"]),
+        *(
+            func.coalesce(Book.zim_metadata[key].as_string(), "") != ""
+            for key in MANDATORY_METADATA_KEYS
+            if key != ILLUSTRATION_48X48_AT_1_KEY
+        ),
+        Book.illustration_48x48_at_1_id.is_not(None),
+        *(
+            getattr(Title, field).is_not(None)
+            for field in TITLE_MANDATORY_METADATA_FIELDS
+        ),
+    )
+
+
+def _count_issue_expression(
+    count: InstrumentedAttribute[int] | ColumnElement[int],
+    latest_count: ColumnElement[int],
+    increase_threshold: ColumnElement[float],
+    decrease_threshold: ColumnElement[float],
+) -> ColumnElement[bool]:
+    """SQL equivalent of the item count check of get_book_*_count_issues"""
+    count_diff = case(
+        # latest book had a count of zero whereas book does not
+        (latest_count == 0, literal(1.0)),
+        else_=func.abs(count - latest_count) / cast(latest_count, Float),
+    )
+    return func.coalesce(
+        case(
+            (count == latest_count, false()),
+            (count > latest_count, count_diff > increase_threshold),
+            else_=count_diff > decrease_threshold,
+        ),
+        false(),
+    )
+
+
+def reevaluate_collection_books_count_issues(
+    session: OrmSession, *, collection_id: UUID
+) -> int:
+    """Recompute article and media count issues of staging books of a collection
+
+    Meant to be called after a collection thresholds change. Books are compared to
+    the latest prod book of their title and flavour in SQL, thresholds being the
+    lowest ones of all collections of the title as in get_book_*_count_issues.
+    Only books whose issues changed are updated, their number is returned.
+
+    Book instances already loaded in the session are expired.
+    """
+    title_ids = select(CollectionTitle.title_id).where(
+        CollectionTitle.collection_id == collection_id
+    )
+    thresholds = (
+        select(
+            CollectionTitle.title_id,
+            *(
+                func.min(func.coalesce(column, default)).label(column.key)
+                for column, default in [
+                    (
+                        Collection.article_count_increase_threshold,
+                        Context.article_count_increase_threshold,
+                    ),
+                    (
+                        Collection.article_count_decrease_threshold,
+                        Context.article_count_decrease_threshold,
+                    ),
+                    (
+                        Collection.media_count_increase_threshold,
+                        Context.media_count_increase_threshold,
+                    ),
+                    (
+                        Collection.media_count_decrease_threshold,
+                        Context.media_count_decrease_threshold,
+                    ),
+                ]
+            ),
+        )
+        .join(Collection, Collection.id == CollectionTitle.collection_id)
+        .where(CollectionTitle.title_id.in_(title_ids))
+        .group_by(CollectionTitle.title_id)
+        .subquery()
+    )
+    latest_books = (
+        select(Book.title_id, Book.flavour, Book.article_count, Book.media_count)
+        .where(Book.location_kind == "prod", Book.title_id.in_(title_ids))
+        .distinct(Book.title_id, Book.flavour)
+        .order_by(Book.title_id, Book.flavour, Book.created_at.desc())
+        .subquery()
+    )
+
+    session.flush()
+    now = getnow()
+    changes: list[dict[str, Any]] = []
+    for book_id, issues, has_article_count_issue, has_media_count_issue in (
+        session.execute(
+            select(
+                Book.id,
+                Book.issues,
+                _count_issue_expression(
+                    Book.article_count,
+                    latest_books.c.article_count,
+                    thresholds.c.article_count_increase_threshold,
+                    thresholds.c.article_count_decrease_threshold,
+                ),
+                _count_issue_expression(
+                    Book.media_count,
+                    latest_books.c.media_count,
+                    thresholds.c.media_count_increase_threshold,
+                    thresholds.c.media_count_decrease_threshold,
+                ),
+            )
+            .join(thresholds, thresholds.c.title_id == Book.title_id)
+            .join(Title, Title.id == Book.title_id)
+            .outerjoin(
+                latest_books,
+                (latest_books.c.title_id == Book.title_id)
+                & (latest_books.c.flavour == Book.flavour),
+            )
+            .where(
+                Book.location_kind == "staging",
+                Book.has_error.is_(False),
+                _can_compute_issues_expression(),
+            )
+        )
+        .tuples()
+        .all()
+    ):
+        new_issues = [
+            issue for issue in issues if issue not in ("article count", "media count")
+        ]
+        # keep issues in the order of get_book_issues
+        index = (
+            new_issues.index("zimcheck error")
+            if "zimcheck error" in new_issues
+            else len(new_issues)
+        )
+        new_issues[index:index] = [
+            issue
+            for issue, has_issue in [
+                ("article count", has_article_count_issue),
+                ("media count", has_media_count_issue),
+            ]
+            if has_issue
+        ]
+        if new_issues != issues:
+            changes.append(
+                {
+                    "book_id": book_id,
+                    "issues": new_issues,
+                    "event": "issues updated after collection thresholds "
+                    f"change: {','.join(new_issues) or 'none'}",
+                }
+            )
+
+    if not changes:
+        return 0
+
+    session.execute(
+        update(Book)
+        .where(Book.id == bindparam("book_id"))
+        .values(issues=bindparam("issues")),
+        [
+            {"book_id": change["book_id"], "issues": change["issues"]}
+            for change in changes
+        ],
+        execution_options={"dml_strategy": "core_only"},
+    )
+    log_events(
+        session,
+        "book",
+        [(change["book_id"], change["event"]) for change in changes],
+        created_at=now,
+    )
+    changed_book_ids = {change["book_id"] for change in changes}
+    for instance in list(session.identity_map.values()):
+        if isinstance(instance, Book) and instance.id in changed_book_ids:
+            session.expire(instance)
+    return len(changes)
+
+
+def book_is_missing_zimcheck_summary(book: Book) -> bool:
+    """Whether zimcheck results of the book have to be downloaded"""
+    return bool(
+        get_missing_keys(
+            book.zimcheck_summary,
+            "zimcheck_version",
+            "status",
+            "checks",
+            "error_count",
+            "warning_count",
+            "retcode",
+        )
+    )
+
+
+def prefetch_zimcheck_results(books: Sequence[Book]):
+    """Concurrently download zimcheck results which are missing for books"""
+    zimcheck_fetcher.prefetch(
+        book.zimcheck_result_url
+        for book in books
+        if book.zimcheck_result_url and book_is_missing_zimcheck_summary(book)
+    )
+
+
 def get_zimcheck_errors(book: Book, *, raise_exceptions: bool = False) -> list[str]:
     """Run checks for zimcheck quality if scraper is not whitelisted.
 
     If book is missing zimcheck summary, results will be downloaded from URL and set.
     """
     issues: list[str] = []
-    # Determine whether we need to fetch zimcheck results or not
-    missing_summary_keys = get_missing_keys(
-        book.zimcheck_summary,
-        "zimcheck_version",
-        "status",
-        "checks",
-        "error_count",
-        "warning_count",
-        "retcode",
-    )
     zimcheck_summary: ZimcheckSummarySchema
-    if missing_summary_keys:
+    # Determine whether we need to fetch zimcheck results or not
+    if book_is_missing_zimcheck_summary(book):
         if not book.zimcheck_result_url:
             issues.append("book has no zimcheck url")
             return issues
 
-        zimcheck_response = query_api(book.zimcheck_result_url)
+        zimcheck_response = fetch_zimcheck_result(book.zimcheck_result_url)
         if zimcheck_response.success:
             zimcheck_summary = parse_zimcheck_result(zimcheck_response.json)
             book.zimcheck_summary = zimcheck_summary.model_dump(mode="json")
@@ -1006,10 +1469,7 @@ def backup_book(
         session,
         book_id=book_id,
         accessible_collection_ids=accessible_collection_ids,
-        has_error=False,
-        needs_processing=False,
-        needs_file_operation=False,
-        locations=["staging", "quarantine", "prod"],
+        **BACKUPABLE_BOOK_CRITERIA,
     )
 
     if book is None:
@@ -1018,6 +1478,10 @@ def backup_book(
             "accessible to you."
         )
 
+    return _backup_book(session, book)
+
+
+def _backup_book(session: OrmSession, book: Book) -> Book:
     if book.title is None:
         raise ValueError("Book has no associated title.")
 
@@ -1029,7 +1493,7 @@ def backup_book(
     )
 
     if not current_location:
-        raise ValueError(f"Book {book_id} has no current location")
+        raise ValueError(f"Book {book.id} has no current location")
 
     existing_backup = next(
         (loc for loc in book.locations if loc.status == "current" and loc.is_backup),
@@ -1057,9 +1521,8 @@ def backup_book(
         book=book,
         target_locations=target_locations,
     )
-    book.events.append(
-        f"{getnow()}: Book scheduled to be copied from '{book.location_kind}' to "
-        f"'backup'"
+    log_event(
+        book, f"Book scheduled to be copied from '{book.location_kind}' to 'backup'"
     )
 
     session.add(book)
@@ -1127,12 +1590,168 @@ def remove_book_backup(
         target_locations=target_locations,
     )
 
-    book.events.append(f"{getnow()}: Book backup scheduled to be removed")
+    log_event(book, "Book backup scheduled to be removed")
     session.add(book)
     session.flush()
     return book
 
 
+def _apply_books_action(
+    session: OrmSession,
+    *,
+    book_ids: Sequence[UUID],
+    books: dict[UUID, Book],
+    action: Callable[[Book], Any],
+    not_eligible_message: str,
+) -> list[BookActionResultSchema]:
+    """Apply an action to already loaded books, one savepoint per book
+
+    Books missing from `books` are reported with `not_eligible_message`. Errors
+    which single book endpoints report to clients only fail their own book, others
+    abort the whole transaction.
+    """
+    results: list[BookActionResultSchema] = []
+    for book_id in book_ids:
+        book = books.get(book_id)
+        if book is None:
+            results.append(
+                BookActionResultSchema(
+                    id=book_id,
+                    success=False,
+                    message=f"Book {book_id} {not_eligible_message}",
+                )
+            )
+            continue
+        try:
+            with session.begin_nested():
+                action(book)
+        except RecordDoesNotExistError as exc:
+            results.append(
+                BookActionResultSchema(id=book_id, success=False, message=exc.detail)
+            )
+        except ValueError as exc:
+            results.append(
+                BookActionResultSchema(id=book_id, success=False, message=exc.args[0])
+            )
+        else:
+            results.append(BookActionResultSchema(id=book_id, success=True))
+    return results
+
+
+def delete_books(
+    session: OrmSession,
+    *,
+    book_ids: Sequence[UUID],
+    force_delete: bool = False,
+    deletion_delay: datetime.timedelta = Context.book_deletion_delay,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> list[BookActionResultSchema]:
+    """Mark many books as deleted, see `delete_book`"""
+    book_ids = list(dict.fromkeys(book_ids))
+    now = getnow()
+    deletion_date = now if force_delete else now + deletion_delay
+    return _apply_books_action(
+        session,
+        book_ids=book_ids,
+        books=get_books_by_id(
+            session,
+            book_ids,
+            accessible_collection_ids=accessible_collection_ids,
+            **DELETABLE_BOOK_CRITERIA,
+        ),
+        action=lambda book: _mark_book_for_deletion(
+            session, book, deletion_date=deletion_date
+        ),
+        not_eligible_message="does not meet criteria to be marked as deleted or "
+        "is not accessible to you.",
+    )
+
+
+def move_books(
+    session: OrmSession,
+    *,
+    book_ids: Sequence[UUID],
+    destination: Literal["staging", "prod"],
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> list[BookActionResultSchema]:
+    """Move many books in staging/prod to prod/staging, see `move_book`
+
+    Retention rules are applied once per title of books moved to prod.
+    """
+    book_ids = list(dict.fromkeys(book_ids))
+    books = get_books_by_id(
+        session,
+        book_ids,
+        accessible_collection_ids=accessible_collection_ids,
+        load_profile="processing",
+        **MOVABLE_BOOK_CRITERIA,
+    )
+    results = _apply_books_action(
+        session,
+        book_ids=book_ids,
+        books=books,
+        action=lambda book: move_book_to_destination(
+            session, book=book, destination=destination, apply_rules=False
+        ),
+        not_eligible_message="does not meet criteria to be moved or is not "
+        "accessible to you.",
+    )
+    if destination == "prod":
+        moved_books = [books[result.id] for result in results if result.success]
+        titles = {book.title.id: book.title for book in moved_books if book.title}
+        for title in titles.values():
+            apply_retention_rules(session, title)
+    return results
+
+
+def recover_books(
+    session: OrmSession,
+    *,
+    book_ids: Sequence[UUID],
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> list[BookActionResultSchema]:
+    """Recover many books marked for deletion, see `recover_book`"""
+    book_ids = list(dict.fromkeys(book_ids))
+    return _apply_books_action(
+        session,
+        book_ids=book_ids,
+        books=get_books_by_id(
+            session,
+            book_ids,
+            accessible_collection_ids=accessible_collection_ids,
+            load_profile="processing",
+            **RECOVERABLE_BOOK_CRITERIA,
+        ),
+        action=lambda book: _recover_book(session, book),
+        not_eligible_message="is not eligible for recovery or is not accessible to "
+        "you.",
+    )
+
+
+def backup_books(
+    session: OrmSession,
+    *,
+    book_ids: Sequence[UUID],
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> list[BookActionResultSchema]:
+    """Create a backup of many books, see `backup_book`"""
+    book_ids = list(dict.fromkeys(book_ids))
+    return _apply_books_action(
+        session,
+        book_ids=book_ids,
+        books=get_books_by_id(
+            session,
+            book_ids,
+            accessible_collection_ids=accessible_collection_ids,
+            load_profile="processing",
+            **BACKUPABLE_BOOK_CRITERIA,
+        ),
+        action=lambda book: _backup_book(session, book),
+        not_eligible_message="does not meet criteria to be backed up or is not "
+        "accessible to you.",
+    )
+
+
 def book_goes_to_staging(book: Book) -> bool:
     """Determine if a book goes to staging.
 
@@ -1205,7 +1824,11 @@ def process_book(
         ]
         if goes_to_staging
         else [
-            FileLocation(tc.collection.warehouse_id, tc.path, book.filename)
+            FileLocation(
+                get_collection_warehouse_id(session, collection_id=tc.collection_id),
+                tc.path,
+                book.filename,
+            )
             for tc in book.title.collections  # pyright: ignore[reportOptionalMemberAccess]
         ]
     )
@@ -1252,7 +1875,11 @@ def _recover_deleted_book(session: OrmSession, book: Book) -> Book:
         ]
         if goes_to_staging
         else [
-            FileLocation(tc.collection.warehouse_id, tc.path, target_filename)
+            FileLocation(
+                get_collection_warehouse_id(session, collection_id=tc.collection_id),
+                tc.path,
+                target_filename,
+            )
             for tc in book.title.collections
         ]
     )
@@ -1275,7 +1902,7 @@ def _recover_deleted_book(session: OrmSession, book: Book) -> Book:
         book=book,
         target_locations=target_locations,
     )
-    book.events.append(f"{getnow()}: Book restored from 'deleted'")
+    log_event(book, "Book restored from 'deleted'")
     session.add(book)
     session.flush()
 
@@ -1315,7 +1942,7 @@ def book_has_flavour_mismatch(
     return False
 
 
-def update_title_metadata_from_book(title: Title, book: Book):
+def update_title_metadata_from_book(session: OrmSession, title: Title, book: Book):
     """Update a title's metadata from book"""
 
     title.title = book.zim_metadata["Title"]
@@ -1323,7 +1950,7 @@ def update_title_metadata_from_book(title: Title, book: Book):
     title.publisher = book.zim_metadata["Publisher"]
     title.description = book.zim_metadata["Description"]
     title.language = book.zim_metadata["Language"]
-    title.illustration_48x48_at_1 = book.zim_metadata["Illustration_48x48@1"]
+    set_title_illustration_48x48_at_1_from_book(session, title, book)
     title.long_description = book.zim_metadata.get("LongDescription")
     title.license = book.zim_metadata.get("License")
     title.relation = book.zim_metadata.get("Relation")
@@ -1342,14 +1969,15 @@ def add_book_to_title(
         if not book.date:
             raise Exception("book date is missing or invalid")
 
-        title.books.append(book)
-        book.events.append(f"{getnow()}: book added to title {title.id}")
-        title.events.append(f"{getnow()}: book {book.id} added to title")
+        # do not append to title.books as it would load every book of the title
+        book.title = title
+        log_event(book, f"book added to title {title.id}")
+        log_event(title, f"book {book.id} added to title")
 
         # Update title name should it have changed (e.g. stackexchange domain updated
         # leading to ZIM name automatically updated as well)
         if title.name != book.name:
-            title.events.append(f"{getnow()}: updating title name to {book.name}")
+            log_event(title, f"updating title name to {book.name}")
             title.name = book.name
 
         # Compute target filename once for this book
@@ -1361,23 +1989,19 @@ def add_book_to_title(
             book_id=book.id,
         )
 
-        tf = get_title_flavour_or_none(session, title.id, book.flavour)
+        tf = next((tf for tf in title.flavours if tf.flavour == book.flavour), None)
         if tf is not None:
             tf.last_book_added_at = getnow()
 
         if title_is_missing_mandatory_metadata(title):
-            update_title_metadata_from_book(title, book)
+            update_title_metadata_from_book(session, title, book)
 
         process_book(session, book, is_new=is_new)
         if book.location_kind == "prod":
             apply_retention_rules(session, title)
 
     except Exception as exc:
-        book.events.append(
-            f"{getnow()}: error encountered while adding to title {title.id}\n{exc}"
-        )
-        title.events.append(
-            f"{getnow()}: error encountered while adding book {book.id}\n{exc}"
-        )
+        log_event(book, f"error encountered while adding to title {title.id}\n{exc}")
+        log_event(title, f"error encountered while adding book {book.id}\n{exc}")
         book.has_error = True
         logger.exception(f"Failed to add book {book.id} to title {title.id}")
@@ -13,6 +13,7 @@ from cms_backend.db.book import (
     get_book,
     get_book_article_count_issues,
     get_book_media_count_issues,
+    get_book_missing_metadata_keys,
     get_book_or_none,
     get_book_unsupported_languages,
     get_differing_metadata_keys,
@@ -26,6 +27,7 @@ from cms_backend.db.flavour import (
     get_title_flavour,
     get_title_flavour_or_none,
 )
+from cms_backend.db.illustration import ILLUSTRATION_48X48_AT_1_KEY
 from cms_backend.db.models import Book
 from cms_backend.db.title import create_title, restore_title, update_title
 from cms_backend.schemas.models import (
@@ -39,10 +41,7 @@ from cms_backend.schemas.orms import (
     ZimcheckSummarySchema,
 )
 from cms_backend.utils.datetime import getnow
-from cms_backend.utils.zim import (
-    get_missing_keys,
-    get_missing_metadata_keys,
-)
+from cms_backend.utils.zim import get_missing_keys
 
 
 def _get_update_title_metadata_action(book: Book) -> BookPromotionAction | None:
@@ -63,7 +62,11 @@ def _get_update_title_metadata_action(book: Book) -> BookPromotionAction | None:
             kind="update_title_metadata",
             requirement="optional",
             data={
-                metadata_to_identifier_map[key]: book.zim_metadata.get(key)
+                metadata_to_identifier_map[key]: (
+                    book.illustration_48x48_at_1
+                    if key == ILLUSTRATION_48X48_AT_1_KEY
+                    else book.zim_metadata.get(key)
+                )
                 for key in differing_metadata_keys
             },
             message="Update title metadata from book",
@@ -143,7 +146,7 @@ def _get_create_title_action(book: Book) -> BookPromotionAction | None:
                 "publisher": book.zim_metadata["Publisher"],
                 "description": book.zim_metadata["Description"],
                 "language": book.zim_metadata["Language"],
-                "illustration_48x48_at_1": book.zim_metadata["Illustration_48x48@1"],
+                "illustration_48x48_at_1": book.illustration_48x48_at_1,
                 "flavours": [
                     {
                         "flavour": book.flavour,
@@ -256,6 +259,7 @@ def get_book_promotion_actions(
         needs_file_operation=False,
         needs_processing=False,
         locations=["staging", "quarantine"],
+        load_profile="processing",
     )
     if book is None:
         raise RecordDoesNotExistError(
@@ -265,7 +269,7 @@ def get_book_promotion_actions(
 
     actions: list[BookPromotionAction] = []
 
-    missing_metadata_keys = get_missing_metadata_keys(book.zim_metadata)
+    missing_metadata_keys = get_book_missing_metadata_keys(book)
     if missing_metadata_keys:
         raise ValueError(
             "Book is missing mandatory metadata keys and cannot "
@@ -3,9 +3,10 @@ from uuid import UUID
 
 from sqlalchemy.orm import Session as OrmSession
 
-from cms_backend.db.models import Book, BookLocation, Warehouse
+from cms_backend.db.event_log import log_event
+from cms_backend.db.models import Book, BookLocation
+from cms_backend.db.reference_data import get_warehouse_name_or_none
 from cms_backend.schemas.models import FileLocation
-from cms_backend.utils.datetime import getnow
 
 
 def create_book_location(
@@ -32,12 +33,10 @@ def create_book_location(
         Created BookLocation instance
     """
     # Get warehouse info for event message
-    warehouse = session.get(Warehouse, warehouse_id)
-    if not warehouse:
+    warehouse_name = get_warehouse_name_or_none(session, warehouse_id=warehouse_id)
+    if warehouse_name is None:
         raise ValueError(f"Warehouse with id {warehouse_id} not found")
 
-    warehouse_name = warehouse.name
-
     location = BookLocation(
         book_id=book.id,
         warehouse_id=warehouse_id,
@@ -48,9 +47,10 @@ def create_book_location(
     location.is_backup = is_backup
     session.add(location)
     book.locations.append(location)
-    book.events.append(
-        f"{getnow()}: added {status} location: {filename} in {warehouse_name}: "
-        f"{path} ({warehouse_id})"
+    log_event(
+        book,
+        f"added {status} location: {filename} in {warehouse_name}: "
+        f"{path} ({warehouse_id})",
     )
 
     return location
@@ -118,9 +118,8 @@ def create_book_target_locations(
     # Check if current locations already match targets exactly
     if current_locations_match_targets(book, target_locations):
         # Book is already at all expected locations - skip creating targets
-        book.events.append(
-            f"{getnow()}: book already at all target locations, skipping target "
-            "creation"
+        log_event(
+            book, "book already at all target locations, skipping target creation"
         )
         book.needs_file_operation = False
         return
@@ -1,9 +1,20 @@
-from collections.abc import Sequence
+from collections.abc import Generator, Sequence
 from pathlib import Path
+from typing import Any, get_args
 from uuid import UUID
 
 from pydantic import AnyUrl
-from sqlalchemy import String, and_, case, exists, or_, select
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    String,
+    and_,
+    case,
+    exists,
+    or_,
+    select,
+)
+from sqlalchemy.orm import QueryableAttribute
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.context import Context
@@ -18,40 +29,50 @@ from cms_backend.db.models import (
 )
 from cms_backend.schemas.models import (
     BookLanguagesSchema,
+    BooksFilterSchema,
     GetBooksSchema,
     ZimUrlSchema,
     ZimUrlsSchema,
 )
-from cms_backend.schemas.orms import BookLightSchema, ListResult
+from cms_backend.schemas.orms import BookLightField, BookLightSchema, ListResult
 from cms_backend.utils.filename import construct_download_url
 
-
-def get_books(
-    session: OrmSession,
-    params: GetBooksSchema,
+# columns of each field of BookLightSchema
+BOOK_LIGHT_COLUMNS: dict[str, QueryableAttribute[Any] | ColumnElement[Any]] = {
+    "id": Book.id,
+    "title_id": Book.title_id,
+    "title_name": Title.name,
+    "location_kind": Book.location_kind,
+    "needs_processing": Book.needs_processing,
+    "has_error": Book.has_error,
+    "needs_file_operation": Book.needs_file_operation,
+    "deletion_date": Book.deletion_date,
+    "created_at": Book.created_at,
+    "name": Book.name,
+    "date": Book.date,
+    "flavour": Book.flavour,
+    "issues": Book.issues,
+    "offliner": Book.zim_metadata["Scraper"].astext,
+}
+
+
+def _get_books_stmt(
+    params: BooksFilterSchema,
     *,
-    accessible_collection_ids: Sequence[UUID] | None = None,
-) -> ListResult[BookLightSchema]:
-    """Get a list of books"""
+    accessible_collection_ids: Sequence[UUID] | None,
+) -> tuple[Select[Any], list[QueryableAttribute[Any] | ColumnElement[Any]]]:
+    """Statement selecting books matching `params`, and the clauses to sort them
 
+    Only the columns of `params.fields` are selected, when set.
+    """
+
+    fields = params.fields or get_args(BookLightField)
+    columns = {
+        field: column for field, column in BOOK_LIGHT_COLUMNS.items() if field in fields
+    }
     stmt = (
-        select(
-            Book.id,
-            Book.title_id,
-            Title.name,
-            Book.needs_processing,
-            Book.has_error,
-            Book.needs_file_operation,
-            Book.location_kind,
-            Book.created_at,
-            Book.deletion_date,
-            Book.name,
-            Book.date,
-            Book.flavour,
-            Book.issues,
-            Book.zim_metadata["Scraper"].astext.label("scraper"),
-        )
-        .join(Title, Book.title_id == Title.id, isouter=True)
+        select(*(column.label(field) for field, column in columns.items()))
+        .select_from(Book)
         .where(
             exists().where(
                 CollectionTitle.title_id == Book.title_id,
@@ -60,6 +81,9 @@ def get_books(
             | (accessible_collection_ids is None)
         )
     )
+    # title is only needed for its name
+    if "title_name" in columns:
+        stmt = stmt.join(Title, Book.title_id == Title.id, isouter=True)
 
     if params.id is not None:
         stmt = stmt.where(Book.id.cast(String).ilike(f"%{params.id}%"))
@@ -97,9 +121,6 @@ def get_books(
     if params.created_before is not None:
         stmt = stmt.where(Book.created_at < params.created_before)
 
-    if params.omit_book_ids is not None:
-        stmt = stmt.where(Book.id.not_in(params.omit_book_ids))
-
     if params.offliner is not None:
         stmt = stmt.where(
             Book.zim_metadata.has_key("Scraper"),
@@ -138,6 +159,7 @@ def get_books(
         )
         stmt = stmt.where(Book.id.in_(backup_books))
 
+    order_clauses: list[QueryableAttribute[Any] | ColumnElement[Any]]
     if params.needs_attention is True:
         order_clauses = [
             Book.has_error,
@@ -163,47 +185,58 @@ def get_books(
             Book.id,
         ]
 
+    return stmt, order_clauses
+
+
+def get_books(
+    session: OrmSession,
+    params: GetBooksSchema,
+    *,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> ListResult[BookLightSchema]:
+    """Get a list of books
+
+    Only the columns of `params.fields` are queried, when set.
+    """
+
+    stmt, order_clauses = _get_books_stmt(
+        params, accessible_collection_ids=accessible_collection_ids
+    )
     return ListResult[BookLightSchema](
         nb_records=count_from_stmt(session, stmt),
+        # rows are typed already, no need to validate them again
         records=[
-            BookLightSchema(
-                id=book_id_result,
-                title_id=book_title_id,
-                title_name=book_title_name,
-                needs_processing=needs_processing,
-                has_error=has_error,
-                needs_file_operation=needs_file_operation,
-                location_kind=location_kind,
-                created_at=created_at,
-                deletion_date=deletion_date,
-                name=name,
-                date=date,
-                flavour=flavour,
-                issues=book_issues,
-                offliner=scraper,
-            )
-            for (
-                book_id_result,
-                book_title_id,
-                book_title_name,
-                needs_processing,
-                has_error,
-                needs_file_operation,
-                location_kind,
-                created_at,
-                deletion_date,
-                name,
-                date,
-                flavour,
-                book_issues,
-                scraper,
-            ) in session.execute(
+            BookLightSchema.model_construct(**row)
+            for row in session.execute(
                 stmt.offset(params.skip).limit(params.limit).order_by(*order_clauses)
-            ).all()
+            ).mappings()
         ],
     )
 
 
+def export_books(
+    session: OrmSession,
+    params: BooksFilterSchema,
+    *,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> Generator[BookLightSchema]:
+    """Iterate over all books matching `params`, in the order of `get_books`
+
+    Rows are streamed from a server-side cursor, `Context.export_batch_size` at a
+    time, so memory usage does not depend on the number of books.
+    """
+
+    stmt, order_clauses = _get_books_stmt(
+        params, accessible_collection_ids=accessible_collection_ids
+    )
+    for row in session.execute(
+        stmt.order_by(*order_clauses).execution_options(
+            yield_per=Context.export_batch_size
+        )
+    ).mappings():
+        yield BookLightSchema.model_construct(**row)
+
+
 def get_zim_urls_prod(session: OrmSession, zim_ids: list[UUID]) -> ZimUrlsSchema:
     """
     Get view and download URLs for a list of ZIM IDs (Book IDs) in prod locations.
@@ -8,11 +8,13 @@ from pydantic import AnyUrl
 from sqlalchemy import and_, func, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as OrmSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, undefer
 
 from cms_backend import logger
 from cms_backend.db import count_from_stmt
+from cms_backend.db.book import reevaluate_collection_books_count_issues
 from cms_backend.db.exceptions import RecordAlreadyExistsError, RecordDoesNotExistError
+from cms_backend.db.history import get_history_entry_values, resolve_history_entries
 from cms_backend.db.models import (
     Book,
     BookLocation,
@@ -22,6 +24,7 @@ from cms_backend.db.models import (
     CollectionTitle,
     Title,
 )
+from cms_backend.db.reference_data import invalidate_reference_data
 from cms_backend.db.warehouse import get_warehouse
 from cms_backend.schemas.models import CollectionUpdateSchema
 from cms_backend.schemas.orms import (
@@ -85,6 +88,31 @@ def get_collection_by_name_or_none(
     ).one_or_none()
 
 
+def get_collections_by_name(
+    session: OrmSession,
+    collection_names: Sequence[str],
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> dict[str, Collection]:
+    """Get collections by name in a single query, raising if any is missing"""
+    collections = {
+        collection.name: collection
+        for collection in session.scalars(
+            select(Collection).where(
+                Collection.name.in_(collection_names),
+                Collection.id.in_(accessible_collection_ids or [])
+                | (accessible_collection_ids is None),
+            )
+        )
+    }
+    for collection_name in collection_names:
+        if collection_name not in collections:
+            raise RecordDoesNotExistError(
+                f"Collection '{collection_name}' does not exist or is not accessible "
+                "to you"
+            )
+    return collections
+
+
 def get_collection_by_name(
     session: OrmSession,
     collection_name: str,
@@ -151,6 +179,8 @@ def get_latest_books_for_collection(
     session: OrmSession,
     collection_id: UUID,
     accessible_collection_ids: Sequence[UUID] | None = None,
+    *,
+    load_illustrations: bool = True,
 ) -> list[LibraryBookData]:
     """
     Get the latest published book for each name+flavour combination in a collection.
@@ -161,6 +191,7 @@ def get_latest_books_for_collection(
     Args:
         session: ORM session
         collection_id: ID of the collection
+        load_illustrations: whether to load illustrations of titles and books
 
     Returns:
         List of LibraryBookData objects, one per name+flavour combination
@@ -196,6 +227,12 @@ def get_latest_books_for_collection(
         )
         .order_by(Title.id, Book.flavour, Book.created_at.desc())
     )
+    if load_illustrations:
+        # book illustration is used when title has none
+        stmt = stmt.options(
+            undefer(Title.illustration_48x48_at_1),
+            undefer(Book.illustration_48x48_at_1),
+        )
     # Filter to keep only the latest book per name+flavour combination
     seen: set[tuple[UUID, str | None]] = set()
     latest_books: list[LibraryBookData] = []
@@ -300,16 +337,23 @@ def create_collection_history_entry(
     author_id: UUID,
     comment: str | None = None,
 ) -> CollectionHistory:
+    state = {
+        "name": collection.name,
+        "download_base_url": collection.download_base_url,
+        "view_base_url": collection.view_base_url,
+        "article_count_increase_threshold": (
+            collection.article_count_increase_threshold
+        ),
+        "media_count_increase_threshold": collection.media_count_increase_threshold,
+        "article_count_decrease_threshold": (
+            collection.article_count_decrease_threshold
+        ),
+        "media_count_decrease_threshold": collection.media_count_decrease_threshold,
+        "is_private": collection.is_private,
+    }
     history_entry = CollectionHistory(
-        name=collection.name,
         comment=comment,
-        download_base_url=collection.download_base_url,
-        view_base_url=collection.view_base_url,
-        article_count_increase_threshold=collection.article_count_increase_threshold,
-        media_count_increase_threshold=collection.media_count_increase_threshold,
-        article_count_decrease_threshold=collection.article_count_decrease_threshold,
-        media_count_decrease_threshold=collection.media_count_decrease_threshold,
-        is_private=collection.is_private,
+        **get_history_entry_values(session, CollectionHistory, collection, state),
     )
     history_entry.collection = collection
     history_entry.author_id = author_id
@@ -357,6 +401,7 @@ def create_collection(
     create_collection_history_entry(
         session, collection, author_id, comment="Create initial history"
     )
+    invalidate_reference_data(session)
 
     return collection
 
@@ -392,12 +437,30 @@ def update_collection(
         raise
 
     create_collection_history_entry(session, collection, author_id, request.comment)
+    invalidate_reference_data(session)
+
+    if values.keys() & {
+        "article_count_increase_threshold",
+        "article_count_decrease_threshold",
+        "media_count_increase_threshold",
+        "media_count_decrease_threshold",
+    }:
+        nb_books_changed = reevaluate_collection_books_count_issues(
+            session, collection_id=collection.id
+        )
+        logger.info(
+            f"Thresholds of collection {collection.id} changed, issues of "
+            f"{nb_books_changed} staging book(s) updated"
+        )
     return collection
 
 
 def create_collection_history_schema(
     entry: CollectionHistory,
 ) -> CollectionHistorySchema:
+    # only NULL in entries storing changes, until they are resolved
+    if entry.is_private is None:
+        raise ValueError(f"Collection history entry {entry.id} is not resolved")
     return CollectionHistorySchema(
         id=entry.id,
         created_at=entry.created_at,
@@ -428,14 +491,15 @@ def get_collection_history(
         select(CollectionHistory)
         .where(CollectionHistory.collection_id == collection.id)
         .options(selectinload(CollectionHistory.author))
-        .order_by(CollectionHistory.created_at.desc())
+        .order_by(
+            CollectionHistory.created_at.desc(), CollectionHistory.sequence.desc()
+        )
     )
+    entries = session.scalars(stmt.offset(skip).limit(limit)).all()
+    resolve_history_entries(session, entries)
     return ListResult[CollectionHistorySchema](
         nb_records=count_from_stmt(session, stmt),
-        records=[
-            create_collection_history_schema(entry)
-            for entry in session.scalars(stmt.offset(skip).limit(limit)).all()
-        ],
+        records=[create_collection_history_schema(entry) for entry in entries],
     )
 
 
@@ -448,12 +512,15 @@ def get_collection_history_entry_or_none(
 ) -> CollectionHistory | None:
     """Get a collecton's history entry or None if it does not exist"""
     collection = get_collection(session, collection_id, accessible_collection_ids)
-    return session.scalars(
+    entry = session.scalars(
         select(CollectionHistory).where(
             CollectionHistory.id == history_id,
             CollectionHistory.collection_id == collection.id,
         )
     ).one_or_none()
+    if entry:
+        resolve_history_entries(session, [entry])
+    return entry
 
 
 def get_collection_history_entry(
@@ -1,36 +1,38 @@
 from collections.abc import Sequence
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.db.models import Account, Collection, CollectionPermission
+from cms_backend.db.reference_data import get_public_collection_ids
 from cms_backend.roles import RoleEnum
 
 
-def _get_public_collection_ids(session: OrmSession):
-    return session.scalars(
-        select(Collection.id).where(Collection.is_private.is_(False))
-    ).all()
-
-
 def get_accessible_collection_ids(
-    session: OrmSession, account: Account | None
+    session: OrmSession,
+    account: Account | None,
+    permitted_collection_ids: Sequence[UUID] | None = None,
 ) -> Sequence[UUID] | None:
     """Get the collection IDs account is allowed to view/operate on
 
+    `permitted_collection_ids` are the IDs of the collection permissions of the
+    account, queried when not passed and needed.
+
     NOTE: None implies to skip check if account has permission to collection.
     This translates to account having access to all collections, books, titles, etc
     """
     if account is None:
-        return _get_public_collection_ids(session)
+        return get_public_collection_ids(session)
 
     match RoleEnum(account.role):
         case RoleEnum.VIEWER | RoleEnum.ZIMFARM:
-            return _get_public_collection_ids(session)
+            return get_public_collection_ids(session)
         case RoleEnum.GLOBAL_EDITOR | RoleEnum.ADMIN:
             return None
         case RoleEnum.COLLECTION_EDITOR:
+            if permitted_collection_ids is not None:
+                return permitted_collection_ids
             return session.scalars(
                 select(Collection.id)
                 .join(
@@ -41,6 +43,33 @@ def get_accessible_collection_ids(
             ).all()
 
 
+def get_account_with_collection_ids_or_none(
+    session: OrmSession, *, account_id: UUID
+) -> tuple[Account, Sequence[UUID] | None] | None:
+    """Get an account by id and the collection IDs it is allowed to view/operate on
+
+    The account and its collection permissions are fetched in a single query. Returns
+    None if the account does not exist.
+    """
+    row = session.execute(
+        select(
+            Account,
+            func.array_agg(CollectionPermission.collection_id).filter(
+                CollectionPermission.collection_id.is_not(None)
+            ),
+        )
+        .outerjoin(CollectionPermission, CollectionPermission.account_id == Account.id)
+        .where((Account.idp_sub == account_id) | (Account.id == account_id))
+        .group_by(Account.id)
+    ).one_or_none()
+    if row is None:
+        return None
+    account, permitted_collection_ids = row
+    return account, get_accessible_collection_ids(
+        session, account, permitted_collection_ids or []
+    )
+
+
 def create_collection_permission(
     session: OrmSession, collection_id: UUID, account_id: UUID
 ):
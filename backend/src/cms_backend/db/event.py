@@ -1,9 +1,10 @@
+from collections.abc import Sequence
 from uuid import UUID
 
 from sqlalchemy import delete, func, select
 from sqlalchemy.orm import Session as OrmSession
 
-from cms_backend.db.models import Event
+from cms_backend.db.models import Event, Title
 from cms_backend.schemas.orms import EventLightSchema, ListResult
 from cms_backend.utils.datetime import getnow
 
@@ -22,6 +23,26 @@ def create_title_modified_event(
     return event
 
 
+def create_titles_modified_event(
+    session: OrmSession, *, action: str, titles: Sequence[Title]
+) -> Event:
+    """Create a single event for the same modification of many titles
+
+    The mill processes books matching all these titles at once.
+    """
+    event = Event(
+        created_at=getnow(),
+        topic="title_modified",
+        payload={
+            "action": action,
+            "titles": [{"id": str(title.id), "name": title.name} for title in titles],
+        },
+    )
+    session.add(event)
+    session.flush()
+    return event
+
+
 def get_next_event_to_process_or_none(
     session: OrmSession,
     topic: str,
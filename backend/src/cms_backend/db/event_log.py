@@ -0,0 +1,115 @@
+"""Append-only log of events of books, titles and Zimfarm notifications
+
+Events are never loaded with their entity. New events are added to the session and
+inserted in bulk with other pending records on next flush. They are read back
+page by page, formatted as `<created_at>: <message>`.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.context import Context
+from cms_backend.db import count_from_stmt
+from cms_backend.db.models import Book, EventLogEntry, Title, ZimfarmNotification
+from cms_backend.schemas.orms import ListResult
+from cms_backend.utils.datetime import getnow
+
+type LoggedEntity = Book | Title | ZimfarmNotification
+
+
+def get_entity_type(entity: LoggedEntity) -> str:
+    """Type of an entity, as stored in the event log"""
+    if isinstance(entity, Book):
+        return "book"
+    if isinstance(entity, Title):
+        return "title"
+    return "zimfarm_notification"
+
+
+def format_event(entry: EventLogEntry) -> str:
+    return f"{entry.created_at}: {entry.message}"
+
+
+def log_event(
+    entity: LoggedEntity, message: str, created_at: datetime | None = None
+) -> None:
+    """Append an event to the log of an entity"""
+    entity.events.add(
+        EventLogEntry(
+            entity_type=get_entity_type(entity),
+            message=message,
+            created_at=created_at or getnow(),
+        )
+    )
+
+
+def log_events(
+    session: OrmSession,
+    entity_type: str,
+    events: Iterable[tuple[UUID, str]],
+    created_at: datetime | None = None,
+) -> None:
+    """Append events to the log of many entities at once, without loading them
+
+    `events` are tuples of entity ID and message.
+    """
+    created_at = created_at or getnow()
+    values = [
+        {
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "message": message,
+            "created_at": created_at,
+        }
+        for entity_id, message in events
+    ]
+    if values:
+        session.execute(insert(EventLogEntry), values)
+
+
+def get_events(
+    session: OrmSession, entity: LoggedEntity, *, skip: int, limit: int
+) -> ListResult[str]:
+    """Get a page of the events of an entity, in chronological order"""
+    stmt = entity.events.select().order_by(EventLogEntry.created_at, EventLogEntry.id)
+    return ListResult[str](
+        nb_records=count_from_stmt(session, stmt),
+        records=[
+            format_event(entry)
+            for entry in session.scalars(stmt.offset(skip).limit(limit))
+        ],
+    )
+
+
+def get_latest_events(session: OrmSession, entity: LoggedEntity) -> list[str]:
+    """Get the `Context.latest_events_limit` latest events, in chronological order"""
+    entries = session.scalars(
+        entity.events.select()
+        .order_by(EventLogEntry.created_at.desc(), EventLogEntry.id.desc())
+        .limit(Context.latest_events_limit)
+    ).all()
+    return [format_event(entry) for entry in reversed(entries)]
+
+
+def get_all_events(session: OrmSession, entity: LoggedEntity) -> list[str]:
+    """Get all events of an entity, in chronological order"""
+    return [
+        format_event(entry)
+        for entry in session.scalars(
+            entity.events.select().order_by(EventLogEntry.created_at, EventLogEntry.id)
+        )
+    ]
+
+
+def delete_events(session: OrmSession, entity: LoggedEntity) -> None:
+    """Delete the events of an entity which is about to be deleted"""
+    session.execute(
+        delete(EventLogEntry).where(
+            EventLogEntry.entity_type == get_entity_type(entity),
+            EventLogEntry.entity_id == entity.id,
+        )
+    )
@@ -20,3 +20,11 @@ class RecordDisabledError(Exception):
     def __init__(self, message: str, *args: object) -> None:
         super().__init__(message, *args)
         self.detail = message
+
+
+class QueryBudgetExceededError(Exception):
+    """Raised when processing an item issued more queries than its budget"""
+
+    def __init__(self, message: str, *args: object) -> None:
+        super().__init__(message, *args)
+        self.detail = message
@@ -0,0 +1,181 @@
+"""History entries stored as diffs against the previous entry
+
+Every `Context.history_checkpoint_interval` entries, a checkpoint entry stores all
+history fields of the record. Other entries only store the fields listed in their
+`changed_fields`, the other ones being NULL in database. The full state of an entry
+is rebuilt on read by applying the changes since the latest checkpoint, in order of
+creation (entries created at the same time are ordered by their `sequence`).
+"""
+
+from collections.abc import Sequence
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import inspect, literal, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.attributes import (
+    set_committed_value,  # pyright: ignore[reportUnknownVariableType]
+)
+
+from cms_backend.context import Context
+from cms_backend.db.models import (
+    Book,
+    BookHistory,
+    Collection,
+    CollectionHistory,
+    Title,
+    TitleHistory,
+)
+
+type HistoryEntry = BookHistory | CollectionHistory | TitleHistory
+
+# fields tracked in history, i.e. everything but the entry metadata
+HISTORY_FIELDS: dict[type[HistoryEntry], tuple[str, ...]] = {
+    BookHistory: ("name", "flavour"),
+    CollectionHistory: (
+        "name",
+        "download_base_url",
+        "view_base_url",
+        "is_private",
+        "article_count_increase_threshold",
+        "media_count_increase_threshold",
+        "article_count_decrease_threshold",
+        "media_count_decrease_threshold",
+    ),
+    TitleHistory: (
+        "name",
+        "title",
+        "creator",
+        "publisher",
+        "description",
+        "language",
+        "illustration_48x48_at_1_id",
+        "long_description",
+        "license",
+        "relation",
+        "source",
+        "maturity",
+        "archived",
+        "flavours",
+        "collection_titles",
+    ),
+}
+
+
+def _get_owner_column(model: type[HistoryEntry]) -> InstrumentedAttribute[UUID]:
+    """Column referencing the record an entry is the history of"""
+    if model is BookHistory:
+        return BookHistory.book_id
+    if model is CollectionHistory:
+        return CollectionHistory.collection_id
+    return TitleHistory.title_id
+
+
+def _get_states(
+    session: OrmSession,
+    model: type[HistoryEntry],
+    owner_id: UUID,
+    *,
+    since: HistoryEntry | None = None,
+    until: HistoryEntry | None = None,
+) -> list[tuple[UUID, int, dict[str, Any]]]:
+    """Rebuild states of the entries of a record, in chronological order
+
+    Returns the id, number of entries since the checkpoint and state of entries from
+    the latest checkpoint preceding `since` (or the latest one overall) to `until`.
+    """
+    fields = HISTORY_FIELDS[model]
+    owner_column = _get_owner_column(model)
+    position = tuple_(model.created_at, model.sequence)
+    checkpoint = (
+        select(model.created_at, model.sequence)
+        .where(owner_column == owner_id, model.is_checkpoint)
+        .order_by(model.created_at.desc(), model.sequence.desc())
+        .limit(1)
+    )
+    if since is not None:
+        checkpoint = checkpoint.where(
+            position <= tuple_(literal(since.created_at), literal(since.sequence))
+        )
+    stmt = (
+        select(
+            model.id,
+            model.is_checkpoint,
+            model.changed_fields,
+            *(getattr(model, field) for field in fields),
+        )
+        .where(
+            owner_column == owner_id,
+            position >= checkpoint.scalar_subquery(),
+        )
+        .order_by(model.created_at, model.sequence)
+    )
+    if until is not None:
+        stmt = stmt.where(
+            position <= tuple_(literal(until.created_at), literal(until.sequence))
+        )
+
+    states: list[tuple[UUID, int, dict[str, Any]]] = []
+    state: dict[str, Any] = {}
+    nb_changes = 0
+    for row in session.execute(stmt):
+        if row.is_checkpoint:
+            state = {field: getattr(row, field) for field in fields}
+            nb_changes = 0
+        else:
+            changed_fields: list[str] = row.changed_fields or []
+            state = state | {field: getattr(row, field) for field in changed_fields}
+            nb_changes += 1
+        states.append((row.id, nb_changes, state))
+    return states
+
+
+def get_history_entry_values(
+    session: OrmSession,
+    model: type[HistoryEntry],
+    owner: Book | Collection | Title,
+    state: dict[str, Any],
+) -> dict[str, Any]:
+    """Values of the history fields of a new entry of a record
+
+    `state` is the value of all history fields for the new entry. Only the ones which
+    changed since the previous entry are returned, unless a checkpoint is due.
+    """
+    # records not yet flushed have no history
+    states = _get_states(session, model, owner.id) if inspect(owner).persistent else []
+    if not states or states[-1][1] + 1 >= Context.history_checkpoint_interval:
+        return {**state, "is_checkpoint": True, "changed_fields": None}
+
+    _, _, previous_state = states[-1]
+    fields = HISTORY_FIELDS[model]
+    changed_fields = [
+        field for field in fields if state[field] != previous_state[field]
+    ]
+    return {
+        **dict.fromkeys(fields),
+        **{field: state[field] for field in changed_fields},
+        "is_checkpoint": False,
+        "changed_fields": changed_fields,
+    }
+
+
+def resolve_history_entries(
+    session: OrmSession, entries: Sequence[HistoryEntry]
+) -> None:
+    """Set all history fields of entries of a same record to their rebuilt state"""
+    if not entries:
+        return
+    model = type(entries[0])
+    owner_id = getattr(entries[0], _get_owner_column(model).key)
+    entries_by_id = {entry.id: entry for entry in entries}
+    for entry_id, _, state in _get_states(
+        session,
+        model,
+        owner_id,
+        since=min(entries, key=lambda entry: (entry.created_at, entry.sequence)),
+        until=max(entries, key=lambda entry: (entry.created_at, entry.sequence)),
+    ):
+        if entry := entries_by_id.get(entry_id):
+            for field, value in state.items():
+                set_committed_value(entry, field, value)
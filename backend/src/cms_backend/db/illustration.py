@@ -0,0 +1,173 @@
+"""Content-addressed store of illustrations
+
+Books, titles and title history entries reference illustrations by hash instead of
+holding their own copy of the base64 content, which is almost always the same for
+all books and entries of a title. The illustration of a book is hence not kept in
+its ZIM metadata but put back when metadata is read, see `get_book_zim_metadata`.
+"""
+
+import hashlib
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import inspect, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm.attributes import (
+    set_committed_value,  # pyright: ignore[reportUnknownVariableType]
+)
+
+from cms_backend.db.exceptions import RecordDoesNotExistError
+from cms_backend.db.models import Book, Illustration, Title, TitleHistory
+
+# key of the 48x48 illustration in ZIM metadata
+ILLUSTRATION_48X48_AT_1_KEY = "Illustration_48x48@1"
+
+
+def get_illustration_id(content: str) -> str:
+    """Identifier of an illustration, the SHA-256 hex digest of its base64 content"""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def save_illustration(session: OrmSession, content: str | None) -> str | None:
+    """Store illustration if not already stored, returning its identifier"""
+    if content is None:
+        return None
+    illustration_id = get_illustration_id(content)
+    session.execute(
+        insert(Illustration)
+        .values(id=illustration_id, content=content)
+        .on_conflict_do_nothing(index_elements=[Illustration.id])
+    )
+    return illustration_id
+
+
+def set_illustration_48x48_at_1(
+    session: OrmSession, entity: Book | Title | TitleHistory, content: str | None
+):
+    """Set the 48x48 illustration of a book, title or history entry"""
+    entity.illustration_48x48_at_1_id = save_illustration(session, content)
+    # keep content consistent without reloading it from the database
+    set_committed_value(entity, "illustration_48x48_at_1", content)
+
+
+def set_book_zim_metadata(
+    session: OrmSession, book: Book, zim_metadata: dict[str, Any]
+):
+    """Set the ZIM metadata of a book, storing its illustration apart"""
+    zim_metadata = dict(zim_metadata)
+    # a new book is inserted with its illustration ID on next flush
+    with session.no_autoflush:
+        set_illustration_48x48_at_1(
+            session, book, zim_metadata.pop(ILLUSTRATION_48X48_AT_1_KEY, None) or None
+        )
+    book.zim_metadata = zim_metadata
+
+
+def set_title_illustration_48x48_at_1_from_book(
+    session: OrmSession, title: Title, book: Book
+):
+    """Set the 48x48 illustration of a title to the one of a book
+
+    The illustration is already stored, its content is not loaded.
+    """
+    title.illustration_48x48_at_1_id = book.illustration_48x48_at_1_id
+    if inspect(title).persistent:
+        # content is loaded again when accessed
+        session.expire(title, ["illustration_48x48_at_1"])
+    else:
+        set_committed_value(
+            title, "illustration_48x48_at_1", book.illustration_48x48_at_1
+        )
+
+
+def get_book_zim_metadata(book: Book) -> dict[str, Any]:
+    """ZIM metadata of a book, including its illustration
+
+    The illustration content is loaded if it has not been yet.
+    """
+    if book.illustration_48x48_at_1_id is None:
+        return dict(book.zim_metadata)
+    return {
+        **book.zim_metadata,
+        ILLUSTRATION_48X48_AT_1_KEY: book.illustration_48x48_at_1,
+    }
+
+
+def set_illustrations_48x48_at_1(
+    session: OrmSession, entities: Sequence[tuple[Title | TitleHistory, str | None]]
+):
+    """Set the 48x48 illustration of many titles or history entries at once
+
+    Illustrations not already stored are inserted in a single statement.
+    """
+    contents: dict[str, str] = {}
+    for entity, content in entities:
+        entity.illustration_48x48_at_1_id = None
+        if content is not None:
+            entity.illustration_48x48_at_1_id = get_illustration_id(content)
+            contents[entity.illustration_48x48_at_1_id] = content
+        set_committed_value(entity, "illustration_48x48_at_1", content)
+    if contents:
+        session.execute(
+            insert(Illustration)
+            .values(
+                [
+                    {"id": illustration_id, "content": content}
+                    for illustration_id, content in contents.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[Illustration.id])
+        )
+
+
+def load_illustrations_48x48_at_1(
+    session: OrmSession, entities: Sequence[Title | TitleHistory]
+):
+    """Load the 48x48 illustration content of many titles or history entries at once
+
+    Needed when the illustration id of entities has been set without a database
+    roundtrip, e.g. when rebuilding history entries.
+    """
+    illustration_ids = {
+        entity.illustration_48x48_at_1_id
+        for entity in entities
+        if entity.illustration_48x48_at_1_id is not None
+    }
+    contents = (
+        dict(
+            session.execute(
+                select(Illustration.id, Illustration.content).where(
+                    Illustration.id.in_(illustration_ids)
+                )
+            )
+            .tuples()
+            .all()
+        )
+        if illustration_ids
+        else {}
+    )
+    for entity in entities:
+        set_committed_value(
+            entity,
+            "illustration_48x48_at_1",
+            contents.get(entity.illustration_48x48_at_1_id or ""),
+        )
+
+
+def get_illustration_or_none(
+    session: OrmSession, illustration_id: str
+) -> Illustration | None:
+    """Get an illustration by identifier or None if it does not exist"""
+    return session.scalars(
+        select(Illustration).where(Illustration.id == illustration_id)
+    ).one_or_none()
+
+
+def get_illustration(session: OrmSession, illustration_id: str) -> Illustration:
+    """Get an illustration by identifier"""
+    if illustration := get_illustration_or_none(session, illustration_id):
+        return illustration
+    raise RecordDoesNotExistError(
+        f"Illustration with id {illustration_id} does not exist"
+    )
@@ -0,0 +1,52 @@
+"""Named sets of loader options fetching the object graph needed by a code path
+
+Without them, walking `book.title.flavours`, `book.title.collections[*].collection`
+or `book.locations[*].warehouse` lazy loads one relationship at a time, and the
+number of queries grows with the number of collections or locations.
+"""
+
+from typing import Literal
+
+from sqlalchemy.orm import selectinload, undefer
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from cms_backend.db.models import Book, BookLocation, CollectionTitle, Title
+
+# - processing: what is needed to compute issues and target locations of a book
+#   (title flavours and collections with their thresholds, book locations)
+# - full_schema: what is needed to serialize a book with its locations
+LoadProfile = Literal["processing", "full_schema"]
+
+
+def title_loader_options(profile: LoadProfile) -> list[LoaderOption]:
+    """Loader options to apply on a Title select for given profile"""
+    if profile == "processing":
+        # title books are not needed: retention rules and latest prod book are
+        # queried directly
+        return [
+            selectinload(Title.flavours),
+            selectinload(Title.collections).joinedload(CollectionTitle.collection),
+        ]
+    return [
+        selectinload(Title.books),
+        selectinload(Title.collections).joinedload(CollectionTitle.collection),
+        selectinload(Title.flavours),
+        undefer(Title.illustration_48x48_at_1),
+    ]
+
+
+def book_loader_options(profile: LoadProfile) -> list[LoaderOption]:
+    """Loader options to apply on a Book select for given profile"""
+    if profile == "processing":
+        return [
+            selectinload(Book.title).selectinload(Title.flavours),
+            selectinload(Book.title)
+            .selectinload(Title.collections)
+            .joinedload(CollectionTitle.collection),
+            selectinload(Book.locations),
+        ]
+    return [
+        selectinload(Book.title),
+        selectinload(Book.zimfarm_notification),
+        selectinload(Book.locations).joinedload(BookLocation.warehouse),
+    ]
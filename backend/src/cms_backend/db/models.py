@@ -9,11 +9,14 @@ from sqlalchemy import (
     BigInteger,
     DateTime,
     ForeignKey,
+    Identity,
     Index,
     String,
     false,
     func,
+    select,
     text,
+    true,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, INET, JSONB
 from sqlalchemy.ext.mutable import MutableDict, MutableList
@@ -21,6 +24,8 @@ from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
     MappedAsDataclass,
+    WriteOnlyMapped,
+    column_property,
     mapped_column,
     relationship,
 )
@@ -87,13 +92,44 @@ class Base(MappedAsDataclass, DeclarativeBase):
     pass
 
 
+class EventLogEntry(Base):
+    """An event in the append-only log of a book, title or Zimfarm notification"""
+
+    __tablename__ = "event_log"
+    id: Mapped[int] = mapped_column(
+        BigInteger, Identity(), init=False, primary_key=True
+    )
+    entity_type: Mapped[str]
+    message: Mapped[str]
+    # set from the relationship of the entity
+    entity_id: Mapped[UUID] = mapped_column(init=False)
+    created_at: Mapped[datetime] = mapped_column(
+        default_factory=getnow, server_default=func.now()
+    )
+
+
+Index(
+    "idx_event_log_entity_id_created_at",
+    EventLogEntry.entity_id,
+    EventLogEntry.created_at,
+)
+
+
 class ZimfarmNotification(Base):
     __tablename__ = "zimfarm_notification"
     id: Mapped[UUID] = mapped_column(primary_key=True)
     received_at: Mapped[datetime]
     content: Mapped[dict[str, Any]]
     status: Mapped[str] = mapped_column(default="pending", server_default="pending")
-    events: Mapped[list[str]] = mapped_column(init=False, default_factory=list)
+    # never loaded with the notification, see cms_backend.db.event_log
+    events: WriteOnlyMapped["EventLogEntry"] = relationship(
+        primaryjoin="and_(foreign(EventLogEntry.entity_id) == ZimfarmNotification.id, "
+        "EventLogEntry.entity_type == 'zimfarm_notification')",
+        init=False,
+        passive_deletes=True,
+        # books, titles and notifications share the log, entity_type tells them apart
+        overlaps="events",
+    )
 
     book_id: Mapped[UUID | None] = mapped_column(ForeignKey("book.id"), init=False)
     book: Mapped[Optional["Book"]] = relationship(
@@ -114,6 +150,17 @@ Index(
 )
 
 
+class Illustration(Base):
+    """Base64 encoded illustration, stored once and identified by its hash"""
+
+    __tablename__ = "illustration"
+    id: Mapped[str] = mapped_column(primary_key=True)
+    content: Mapped[str]
+    created_at: Mapped[datetime] = mapped_column(
+        default_factory=getnow, server_default=func.now()
+    )
+
+
 class Book(Base):
     __tablename__ = "book"
     id: Mapped[UUID] = mapped_column(primary_key=True)
@@ -121,6 +168,7 @@ class Book(Base):
     article_count: Mapped[int] = mapped_column(BigInteger)
     media_count: Mapped[int] = mapped_column(BigInteger)
     size: Mapped[int] = mapped_column(BigInteger)
+    # without the illustration, stored apart, see get_book_zim_metadata
     zim_metadata: Mapped[dict[str, Any]]
     name: Mapped[str | None]
     date: Mapped[str | None]
@@ -144,7 +192,14 @@ class Book(Base):
         default_factory=list, server_default="{}", init=False
     )
     deletion_date: Mapped[datetime | None] = mapped_column(default=None, init=False)
-    events: Mapped[list[str]] = mapped_column(init=False, default_factory=list)
+    # never loaded with the book, see cms_backend.db.event_log
+    events: WriteOnlyMapped["EventLogEntry"] = relationship(
+        primaryjoin="and_(foreign(EventLogEntry.entity_id) == Book.id, "
+        "EventLogEntry.entity_type == 'book')",
+        init=False,
+        passive_deletes=True,
+        overlaps="events",
+    )
 
     title_id: Mapped[UUID | None] = mapped_column(ForeignKey("title.id"), init=False)
     title: Mapped[Optional["Title"]] = relationship(init=False, foreign_keys=[title_id])
@@ -153,6 +208,17 @@ class Book(Base):
         back_populates="book"
     )
     recipe_id: Mapped[UUID | None] = mapped_column(default=None)
+    illustration_48x48_at_1_id: Mapped[str | None] = mapped_column(
+        ForeignKey("illustration.id"), init=False, default=None
+    )
+    # content is only loaded when accessed
+    illustration_48x48_at_1: Mapped[str | None] = column_property(
+        select(Illustration.content)
+        .where(Illustration.id == illustration_48x48_at_1_id)
+        .correlate_except(Illustration)
+        .scalar_subquery(),
+        deferred=True,
+    )
 
     zimcheck_summary: Mapped[dict[str, Any]] = mapped_column(
         default_factory=dict, server_default="{}"
@@ -178,7 +244,7 @@ class Book(Base):
         init=False,
         default_factory=list,
         # return the history entries in descending order of created_at
-        order_by="BookHistory.created_at.desc()",
+        order_by="[BookHistory.created_at.desc(), BookHistory.sequence.desc()]",
     )
 
 
@@ -193,10 +259,15 @@ class BookHistory(Base):
     author_id: Mapped[UUID] = mapped_column(ForeignKey("account.id"), init=False)
     comment: Mapped[str | None]
     name: Mapped[str | None]
-    flavour: Mapped[str]
+    # see TitleHistory about fields which are NULL in database
+    flavour: Mapped[str | None]
     created_at: Mapped[datetime] = mapped_column(
         default_factory=getnow, server_default=func.now()
     )
+    # orders entries created at the same time, in insertion order
+    sequence: Mapped[int] = mapped_column(BigInteger, Identity(), init=False)
+    is_checkpoint: Mapped[bool] = mapped_column(default=True, server_default=true())
+    changed_fields: Mapped[list[str] | None] = mapped_column(default=None)
     book: Mapped["Book"] = relationship(back_populates="history_entries", init=False)
     author: Mapped["Account"] = relationship(init=False)
 
@@ -249,13 +320,31 @@ class Title(Base):
     publisher: Mapped[str | None] = mapped_column(default=None)
     description: Mapped[str | None] = mapped_column(default=None)
     language: Mapped[str | None] = mapped_column(default=None)
-    illustration_48x48_at_1: Mapped[str | None] = mapped_column(default=None)
+    illustration_48x48_at_1_id: Mapped[str | None] = mapped_column(
+        ForeignKey("illustration.id"), default=None
+    )
+    # content is only loaded when accessed, use undefer() when it is needed for
+    # many records
+    illustration_48x48_at_1: Mapped[str | None] = column_property(
+        select(Illustration.content)
+        .where(Illustration.id == illustration_48x48_at_1_id)
+        .correlate_except(Illustration)
+        .scalar_subquery(),
+        deferred=True,
+    )
     long_description: Mapped[str | None] = mapped_column(default=None)
     license: Mapped[str | None] = mapped_column(default=None)
     relation: Mapped[str | None] = mapped_column(default=None)
     source: Mapped[str | None] = mapped_column(default=None)
     maturity: Mapped[str] = mapped_column(init=False, index=True, default="unstable")
-    events: Mapped[list[str]] = mapped_column(init=False, default_factory=list)
+    # never loaded with the title, see cms_backend.db.event_log
+    events: WriteOnlyMapped["EventLogEntry"] = relationship(
+        primaryjoin="and_(foreign(EventLogEntry.entity_id) == Title.id, "
+        "EventLogEntry.entity_type == 'title')",
+        init=False,
+        passive_deletes=True,
+        overlaps="events",
+    )
     archived: Mapped[bool] = mapped_column(default=False, server_default=false())
 
     books: Mapped[list["Book"]] = relationship(
@@ -278,7 +367,7 @@ class Title(Base):
         init=False,
         default_factory=list,
         # return the history entries in descending order of created_at
-        order_by="TitleHistory.created_at.desc()",
+        order_by="[TitleHistory.created_at.desc(), TitleHistory.sequence.desc()]",
     )
     flavours: Mapped[list["TitleFlavour"]] = relationship(
         back_populates="title",
@@ -311,26 +400,44 @@ class TitleHistory(Base):
     )
     author_id: Mapped[UUID] = mapped_column(ForeignKey("account.id"), init=False)
     comment: Mapped[str | None]
-    name: Mapped[str]
+    # only checkpoint entries store all fields, other entries only store the
+    # changed_fields and are NULL in database for the other ones, the full state
+    # is rebuilt when read through cms_backend.db.history
+    name: Mapped[str | None]
     created_at: Mapped[datetime] = mapped_column(
         default_factory=getnow, server_default=func.now()
     )
+    # orders entries created at the same time, in insertion order
+    sequence: Mapped[int] = mapped_column(BigInteger, Identity(), init=False)
+    is_checkpoint: Mapped[bool] = mapped_column(default=True, server_default=true())
+    changed_fields: Mapped[list[str] | None] = mapped_column(default=None)
     title: Mapped[str | None] = mapped_column(default=None)
     creator: Mapped[str | None] = mapped_column(default=None)
     publisher: Mapped[str | None] = mapped_column(default=None)
     description: Mapped[str | None] = mapped_column(default=None)
     language: Mapped[str | None] = mapped_column(default=None)
-    illustration_48x48_at_1: Mapped[str | None] = mapped_column(default=None)
+    illustration_48x48_at_1_id: Mapped[str | None] = mapped_column(
+        ForeignKey("illustration.id"), default=None
+    )
+    # content is only loaded when accessed, use undefer() when it is needed for
+    # many records
+    illustration_48x48_at_1: Mapped[str | None] = column_property(
+        select(Illustration.content)
+        .where(Illustration.id == illustration_48x48_at_1_id)
+        .correlate_except(Illustration)
+        .scalar_subquery(),
+        deferred=True,
+    )
     long_description: Mapped[str | None] = mapped_column(default=None)
     license: Mapped[str | None] = mapped_column(default=None)
     relation: Mapped[str | None] = mapped_column(default=None)
     source: Mapped[str | None] = mapped_column(default=None)
-    maturity: Mapped[str] = mapped_column(default="unstable")
-    archived: Mapped[bool] = mapped_column(default=False, server_default=false())
-    flavours: Mapped[list[dict[str, Any]]] = mapped_column(
+    maturity: Mapped[str | None] = mapped_column(default="unstable")
+    archived: Mapped[bool | None] = mapped_column(default=False, server_default=false())
+    flavours: Mapped[list[dict[str, Any]] | None] = mapped_column(
         default_factory=list, server_default="{}"
     )
-    collection_titles: Mapped[list[dict[str, Any]]] = mapped_column(
+    collection_titles: Mapped[list[dict[str, Any]] | None] = mapped_column(
         default_factory=list, server_default="{}"
     )
     title_: Mapped["Title"] = relationship(back_populates="history_entries", init=False)
@@ -370,7 +477,8 @@ class Collection(Base):
         init=False,
         default_factory=list,
         # return the history entries in descending order of created_at
-        order_by="CollectionHistory.created_at.desc()",
+        order_by="[CollectionHistory.created_at.desc(), "
+        "CollectionHistory.sequence.desc()]",
     )
 
 
@@ -394,13 +502,20 @@ class CollectionHistory(Base):
     )
     author_id: Mapped[UUID] = mapped_column(ForeignKey("account.id"), init=False)
     comment: Mapped[str | None]
-    name: Mapped[str]
+    # see TitleHistory about fields which are NULL in database
+    name: Mapped[str | None]
     download_base_url: Mapped[str | None]
     view_base_url: Mapped[str | None]
     created_at: Mapped[datetime] = mapped_column(
         default_factory=getnow, server_default=func.now()
     )
-    is_private: Mapped[bool] = mapped_column(default=False, server_default="false")
+    # orders entries created at the same time, in insertion order
+    sequence: Mapped[int] = mapped_column(BigInteger, Identity(), init=False)
+    is_checkpoint: Mapped[bool] = mapped_column(default=True, server_default=true())
+    changed_fields: Mapped[list[str] | None] = mapped_column(default=None)
+    is_private: Mapped[bool | None] = mapped_column(
+        default=False, server_default="false"
+    )
     article_count_increase_threshold: Mapped[float | None] = mapped_column(default=None)
     media_count_increase_threshold: Mapped[float | None] = mapped_column(default=None)
     article_count_decrease_threshold: Mapped[float | None] = mapped_column(default=None)
@@ -455,7 +570,7 @@ class BookLocation(Base):
     warehouse: Mapped["Warehouse"] = relationship(init=False)
 
     def full_local_path(self, warehouse_local_folders_map: dict[UUID, Path]) -> Path:
-        return warehouse_local_folders_map[self.warehouse.id] / self.path_in_warehouse
+        return warehouse_local_folders_map[self.warehouse_id] / self.path_in_warehouse
 
     @property
     def path_in_warehouse(self) -> Path:
@@ -0,0 +1,84 @@
+"""Instrumentation of the SQL statements issued while processing one item
+
+Background jobs process items (notifications, books, ...) one at a time and each
+item should only cost a small and fixed number of queries. Counting statements per
+item is the simplest way to detect N+1 patterns (lazy loads in a loop, per-record
+lookups) and to prevent them from coming back.
+"""
+
+import threading
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend import logger
+from cms_backend.db.exceptions import QueryBudgetExceededError
+
+
+@dataclass
+class QueryStats:
+    """Statements issued (and time spent running them) while processing an item"""
+
+    label: str
+    nb_queries: int = 0
+    duration: float = 0.0
+    statements: list[str] = field(default_factory=list[str])
+
+
+@contextmanager
+def query_budget(
+    session: OrmSession,
+    *,
+    label: str,
+    max_queries: int | None = None,
+    raise_exceptions: bool = False,
+) -> Generator[QueryStats]:
+    """Count statements issued on session engine by current thread within the block
+
+    When `max_queries` is set and exceeded, a warning with the statements is logged,
+    or a QueryBudgetExceededError is raised if `raise_exceptions` is set (tests).
+    """
+    engine = session.get_bind()
+    thread_id = threading.get_ident()
+    stats = QueryStats(label=label)
+    start_times: list[float] = []
+
+    def before_cursor_execute(
+        conn: Connection,  # noqa: ARG001
+        cursor: Any,  # noqa: ARG001
+        statement: str,
+        *args: Any,  # noqa: ARG001
+    ):
+        if threading.get_ident() != thread_id:
+            return
+        stats.nb_queries += 1
+        stats.statements.append(statement)
+        start_times.append(perf_counter())
+
+    def after_cursor_execute(*args: Any):  # noqa: ARG001
+        if threading.get_ident() != thread_id or not start_times:
+            return
+        stats.duration += perf_counter() - start_times.pop()
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(engine, "after_cursor_execute", after_cursor_execute)
+
+    logger.debug(
+        f"{label}: {stats.nb_queries} queries in {stats.duration * 1000:.1f}ms"
+    )
+    if max_queries is not None and stats.nb_queries > max_queries:
+        message = f"{label}: {stats.nb_queries} queries exceeds budget of {max_queries}"
+        if raise_exceptions:
+            raise QueryBudgetExceededError(message + "\n" + "\n".join(stats.statements))
+        logger.warning(message)
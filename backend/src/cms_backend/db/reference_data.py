@@ -0,0 +1,187 @@
+"""Per-process cache of rarely changing reference data
+
+Accounts, warehouses and collections are looked up for almost every notification or
+book processed by the mill and the shuttle, and public collections for almost every
+API request, while they almost never change. Only plain
+values are cached (never ORM instances, which are bound to a session). Entries expire
+after `REFERENCE_DATA_CACHE_TTL` so changes made by other processes are eventually
+seen, and write paths of this process call `invalidate_reference_data` so that their
+own changes are seen immediately (and again once committed, so that values loaded
+by other sessions in the meantime are not kept).
+
+Public collections grant access to their content, so they are only kept for
+`PUBLIC_COLLECTION_IDS_CACHE_TTL`: a collection made private by another process must
+not stay readable by everyone for long.
+"""
+
+import datetime
+from collections.abc import Callable, Hashable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.context import Context
+from cms_backend.db.exceptions import RecordDoesNotExistError
+from cms_backend.db.models import Account, BookLocation, Collection, Warehouse
+from cms_backend.utils.datetime import getnow
+
+
+class ReferenceDataCache:
+    """Cache of values with a TTL, dropped altogether when generation changes"""
+
+    def __init__(self, ttl: datetime.timedelta):
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: dict[Hashable, tuple[int, datetime.datetime, Any]] = {}
+
+    def get_or_load[T](
+        self,
+        key: Hashable,
+        loader: Callable[[], T],
+        *,
+        ttl: datetime.timedelta | None = None,
+    ) -> T:
+        """Get value for key, calling loader if missing, stale or expired
+
+        None values returned by loader are not stored. Value is kept for ttl if set,
+        for the TTL of the cache otherwise.
+        """
+        now = getnow()
+        if (entry := self._entries.get(key)) is not None:
+            generation, expires_at, value = entry
+            if generation == self.generation and expires_at > now:
+                return value
+        generation = self.generation
+        value = loader()
+        # do not store a value loaded while the cache was invalidated
+        if value is not None and generation == self.generation:
+            self._entries[key] = (
+                generation,
+                now + (self.ttl if ttl is None else ttl),
+                value,
+            )
+        return value
+
+    def forget(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def invalidate(self):
+        self.generation += 1
+        self._entries.clear()
+
+
+reference_data_cache = ReferenceDataCache(ttl=Context.reference_data_cache_ttl)
+
+# whether a session modified reference data and did not commit yet
+PENDING_INVALIDATION_KEY = "reference_data_pending_invalidation"
+
+
+def invalidate_reference_data(session: OrmSession | None = None):
+    """Drop all cached reference data (to be called when it is modified)
+
+    When modified in a session, cached data is dropped again once the transaction
+    ends.
+    """
+    reference_data_cache.invalidate()
+    if session is not None:
+        session.info[PENDING_INVALIDATION_KEY] = True
+
+
+# values loaded by other sessions before commit are stale, and so are those loaded
+# from changes of this session which are rolled back
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_rollback")
+def _after_transaction(  # pyright: ignore[reportUnusedFunction]
+    session: OrmSession,
+):
+    if session.info.pop(PENDING_INVALIDATION_KEY, False):
+        reference_data_cache.invalidate()
+
+
+def get_account_id_by_username(session: OrmSession, *, username: str) -> UUID:
+    """Get ID of an account by username or raise an exception if it does not exist"""
+
+    def _load() -> UUID | None:
+        # reference data does not depend on pending changes of the caller
+        with session.no_autoflush:
+            return session.scalars(
+                select(Account.id).where(Account.username == username)
+            ).one_or_none()
+
+    if (
+        account_id := reference_data_cache.get_or_load(("account", username), _load)
+    ) is None:
+        raise RecordDoesNotExistError(
+            f"Account with username {username} does not exist"
+        )
+    return account_id
+
+
+def _get_warehouse_names(session: OrmSession) -> dict[UUID, str]:
+    def _load() -> dict[UUID, str]:
+        with session.no_autoflush:
+            return dict(
+                session.execute(select(Warehouse.id, Warehouse.name)).tuples().all()
+            )
+
+    return reference_data_cache.get_or_load("warehouse_names", _load)
+
+
+def get_warehouse_name_or_none(
+    session: OrmSession, *, warehouse_id: UUID
+) -> str | None:
+    """Get name of a warehouse by ID or None if it does not exist"""
+    if warehouse_id not in _get_warehouse_names(session):
+        # warehouse might have been created since cache was loaded
+        reference_data_cache.forget("warehouse_names")
+    return _get_warehouse_names(session).get(warehouse_id)
+
+
+def _get_collection_warehouse_ids(session: OrmSession) -> dict[UUID, UUID]:
+    def _load() -> dict[UUID, UUID]:
+        with session.no_autoflush:
+            return dict(
+                session.execute(select(Collection.id, Collection.warehouse_id))
+                .tuples()
+                .all()
+            )
+
+    return reference_data_cache.get_or_load("collection_warehouse_ids", _load)
+
+
+def get_collection_warehouse_id(session: OrmSession, *, collection_id: UUID) -> UUID:
+    """Get ID of the warehouse of a collection or raise an exception"""
+    if collection_id not in _get_collection_warehouse_ids(session):
+        # collection might have been created since cache was loaded
+        reference_data_cache.forget("collection_warehouse_ids")
+    if (
+        warehouse_id := _get_collection_warehouse_ids(session).get(collection_id)
+    ) is None:
+        raise RecordDoesNotExistError(f"Collection {collection_id} does not exist")
+    return warehouse_id
+
+
+def get_public_collection_ids(session: OrmSession) -> tuple[UUID, ...]:
+    """Get IDs of all collections which are not private"""
+
+    def _load() -> tuple[UUID, ...]:
+        with session.no_autoflush:
+            return tuple(
+                session.scalars(
+                    select(Collection.id).where(Collection.is_private.is_(False))
+                ).all()
+            )
+
+    return reference_data_cache.get_or_load(
+        "public_collection_ids", _load, ttl=Context.public_collection_ids_cache_ttl
+    )
+
+
+def get_location_full_str(session: OrmSession, location: BookLocation) -> str:
+    """Same as BookLocation.full_str, without loading the warehouse from DB"""
+    warehouse_name = get_warehouse_name_or_none(
+        session, warehouse_id=location.warehouse_id
+    )
+    return f"{warehouse_name}:{location.path_in_warehouse}"
@@ -0,0 +1,265 @@
+"""Cache of rendered API responses, invalidated when the records they show change
+
+Read endpoints cache their rendered body under a key made of the route, its
+parameters and the collections accessible to the client. Keys also hold the current
+generation of every kind of records ("book", "title", "collection") the response
+depends on. Any session writing to a table of a kind bumps its generation on flush
+(and again on commit, so that responses rendered by other sessions in the meantime
+are not kept): responses cached before are never served again and age out.
+
+Tracking writes at the session level covers every write path (API, mill, shuttle,
+bulk statements) without each of them having to remember to invalidate the cache.
+
+By default, the cache is an LRU held by each process, so writes of other processes
+are only seen once entries expire after `RESPONSE_CACHE_TTL`. When
+`RESPONSE_CACHE_URL` is a `redis://` URL, entries and generations are shared by all
+processes through a local Redis-compatible server (requires the `redis` package).
+
+The cache fails open: errors of its store are logged, they never fail a write, and
+responses are rendered again when they cannot be read from the store.
+"""
+
+import datetime
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Sequence
+from functools import cache
+from typing import Protocol, cast
+
+import xxhash
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, UOWTransaction
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend import logger
+from cms_backend.context import Context
+from cms_backend.utils.datetime import getnow
+
+# table: kinds of records whose responses are stale when the table is modified
+TABLE_KINDS: dict[str, tuple[str, ...]] = {
+    "book": ("book",),
+    "book_location": ("book",),
+    "event_log": ("book", "title"),
+    "title": ("title",),
+    "title_flavour": ("title",),
+    "collection": ("collection",),
+    "collection_permission": ("collection",),
+    "collection_title": ("title", "collection"),
+    "warehouse": ("book", "collection"),
+}
+
+# kinds modified by a session and not committed yet
+PENDING_KINDS_KEY = "response_cache_pending_kinds"
+
+
+class ResponseCacheStore(Protocol):
+    # whether entries and generations are shared by all processes
+    shared: bool
+
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, value: bytes) -> None: ...
+
+    def get_generations(self, kinds: Sequence[str]) -> list[int]: ...
+
+    def bump_generations(self, kinds: Iterable[str]) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryResponseCacheStore:
+    """LRU of rendered responses with a TTL, held by current process"""
+
+    shared = False
+
+    def __init__(self, *, max_entries: int, ttl: datetime.timedelta):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[datetime.datetime, bytes]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= getnow():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (getnow() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_generations(self, kinds: Sequence[str]) -> list[int]:
+        with self._lock:
+            return [self._generations.get(kind, 0) for kind in kinds]
+
+    def bump_generations(self, kinds: Iterable[str]) -> None:
+        with self._lock:
+            for kind in kinds:
+                self._generations[kind] = self._generations.get(kind, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+
+class RedisResponseCacheStore:
+    """Rendered responses and generations shared by all processes through Redis
+
+    Redis evicts entries on its own, according to its `maxmemory-policy`.
+    """
+
+    shared = True
+
+    def __init__(self, *, url: str, ttl: datetime.timedelta, prefix: str = "cms:"):
+        # only needed when configured
+        import redis  # noqa: PLC0415
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(  # pyright: ignore[reportUnknownMemberType]
+            url
+        )
+
+    def _generation_key(self, kind: str) -> str:
+        return f"{self.prefix}generation:{kind}"
+
+    def get(self, key: str) -> bytes | None:
+        # sync client, responses are never awaitables
+        return cast(bytes | None, self._redis.get(f"{self.prefix}response:{key}"))
+
+    def set(self, key: str, value: bytes) -> None:
+        self._redis.set(f"{self.prefix}response:{key}", value, px=self.ttl)
+
+    def get_generations(self, kinds: Sequence[str]) -> list[int]:
+        values = cast(
+            list[bytes | None],
+            self._redis.mget([self._generation_key(kind) for kind in kinds]),
+        )
+        return [int(value or 0) for value in values]
+
+    def bump_generations(self, kinds: Iterable[str]) -> None:
+        pipeline = self._redis.pipeline(  # pyright: ignore[reportUnknownMemberType]
+            transaction=False
+        )
+        for kind in kinds:
+            pipeline.incr(self._generation_key(kind))
+        pipeline.execute()
+
+    def clear(self) -> None:
+        keys = cast(
+            Iterator[bytes],
+            self._redis.scan_iter(  # pyright: ignore[reportUnknownMemberType]
+                match=f"{self.prefix}*"
+            ),
+        )
+        for key in keys:
+            self._redis.delete(key)
+
+
+@cache
+def get_response_cache() -> ResponseCacheStore:
+    """Store of rendered responses configured by `RESPONSE_CACHE_URL`"""
+    if Context.response_cache_url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisResponseCacheStore(
+            url=Context.response_cache_url, ttl=Context.response_cache_ttl
+        )
+    return MemoryResponseCacheStore(
+        max_entries=Context.response_cache_max_entries,
+        ttl=Context.response_cache_ttl,
+    )
+
+
+def get_response_cache_key(kinds: Sequence[str], *parts: str) -> str:
+    """Key of a response depending on records of these kinds, identified by parts"""
+    generations = get_response_cache().get_generations(kinds)
+    return xxhash.xxh3_128_hexdigest(
+        "\n".join(
+            [
+                *(
+                    f"{kind}:{generation}"
+                    for kind, generation in zip(kinds, generations, strict=True)
+                ),
+                *parts,
+            ]
+        )
+    )
+
+
+def clear_cached_responses():
+    """Drop all cached responses and generations"""
+    get_response_cache().clear()
+
+
+def _record_modified_tables(session: OrmSession, table_names: Iterable[str]):
+    kinds = {
+        kind for table_name in table_names for kind in TABLE_KINDS.get(table_name, ())
+    }
+    if not kinds:
+        return
+    session.info.setdefault(PENDING_KINDS_KEY, set()).update(kinds)
+    try:
+        get_response_cache().bump_generations(kinds)
+    except Exception:
+        logger.exception(f"Failed to invalidate cached responses of {sorted(kinds)}")
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _after_flush(  # pyright: ignore[reportUnusedFunction]
+    session: OrmSession, _: UOWTransaction
+):
+    _record_modified_tables(
+        session,
+        {
+            getattr(instance, "__tablename__", "")
+            for instance in (*session.new, *session.dirty, *session.deleted)
+        },
+    )
+
+
+@event.listens_for(OrmSession, "do_orm_execute")
+def _do_orm_execute(  # pyright: ignore[reportUnusedFunction]
+    orm_execute_state: ORMExecuteState,
+):
+    # bulk statements modify records without going through the unit of work
+    if not (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        return
+    _record_modified_tables(
+        orm_execute_state.session,
+        {
+            table.name
+            for mapper in orm_execute_state.all_mappers
+            for table in mapper.tables
+        },
+    )
+
+
+# responses rendered by other sessions before commit are stale, and so are those
+# rendered from changes of this session which are rolled back
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_rollback")
+def _after_transaction(  # pyright: ignore[reportUnusedFunction]
+    session: OrmSession,
+):
+    if kinds := session.info.pop(PENDING_KINDS_KEY, None):
+        try:
+            get_response_cache().bump_generations(kinds)
+        except Exception:
+            logger.exception(
+                f"Failed to invalidate cached responses of {sorted(kinds)}"
+            )
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
 from cms_backend.context import Context
+from cms_backend.db.event_log import log_event
 from cms_backend.db.models import Book, Title
 from cms_backend.utils.datetime import getnow
 from cms_backend.utils.filename import (
@@ -91,17 +92,29 @@ def apply_retention_rules(session: OrmSession, title: Title):
         book.location_kind = "to_delete"
         book.deletion_date = deletion_date
         book.needs_file_operation = True
-        book.events.append(
-            f"{now}: marked for deletion due to retention policy, "
-            f"will be deleted after {deletion_date}"
+        log_event(
+            book,
+            f"marked for deletion due to retention policy, "
+            f"will be deleted after {deletion_date}",
         )
-        title.events.append(f"{now}: book {book.id} marked for deletion.")
+        log_event(title, f"book {book.id} marked for deletion.")
         session.add(book)
         session.add(title)
 
     session.flush()
 
 
+# title fields which must be set for books issues to be computed
+TITLE_MANDATORY_METADATA_FIELDS = (
+    "title",
+    "creator",
+    "publisher",
+    "description",
+    "language",
+    "illustration_48x48_at_1_id",
+)
+
+
 def title_is_missing_mandatory_metadata(title: Title) -> bool:
     """Check if a title is missing the mandatory metadata information
 
@@ -109,13 +122,5 @@ def title_is_missing_mandatory_metadata(title: Title) -> bool:
     """
 
     return any(
-        value is None
-        for value in [
-            title.title,
-            title.creator,
-            title.publisher,
-            title.description,
-            title.language,
-            title.illustration_48x48_at_1,
-        ]
+        getattr(title, field) is None for field in TITLE_MANDATORY_METADATA_FIELDS
     )
@@ -5,6 +5,7 @@ from uuid import UUID
 
 from sqlalchemy import and_, select
 from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.orm import undefer
 
 from cms_backend.context import Context
 from cms_backend.db.collection import LibraryBookData
@@ -17,7 +18,10 @@ from cms_backend.db.models import (
 
 
 def get_staging_books_library_data(
-    session: OrmSession, *, accessible_collection_ids: Sequence[UUID] | None = None
+    session: OrmSession,
+    *,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+    load_illustrations: bool = True,
 ) -> list[LibraryBookData]:
     """
     Get the list of library data for all books in staging.
@@ -28,6 +32,7 @@ def get_staging_books_library_data(
     Args:
         session: ORM session
         accessible_collection_ids: IDs of collections the caller can access
+        load_illustrations: whether to load illustrations of titles and books
 
     Returns:
         List of LibraryBookData objects for each book in staging.
@@ -59,6 +64,12 @@ def get_staging_books_library_data(
         )
         .order_by(Book.created_at.desc())
     )
+    if load_illustrations:
+        # book illustration is used when title has none
+        stmt = stmt.options(
+            undefer(Title.illustration_48x48_at_1),
+            undefer(Book.illustration_48x48_at_1),
+        )
     return [
         LibraryBookData(
             book=cast(Book, row.Book),
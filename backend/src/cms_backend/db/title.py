@@ -1,29 +1,43 @@
 import datetime
-from collections.abc import Sequence
+from collections import Counter
+from collections.abc import Generator, Sequence
 from pathlib import Path
-from typing import Literal, cast
+from typing import Any, Literal, cast, get_args
 from uuid import UUID
 
 from psycopg.errors import UniqueViolation
-from sqlalchemy import exists, select, update
+from sqlalchemy import ColumnElement, RowMapping, Select, exists, select, update
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import QueryableAttribute, selectinload
 from sqlalchemy.orm import Session as OrmSession
-from sqlalchemy.orm import selectinload
 
 from cms_backend import logger
 from cms_backend.context import Context
 from cms_backend.db import count_from_stmt
 from cms_backend.db.book import (
     delete_book,
+    prefetch_zimcheck_results,
     process_book,
     recover_book,
-    update_book_issues,
+    update_books_issues,
 )
 from cms_backend.db.book_location import create_book_target_locations
-from cms_backend.db.collection import get_collection_by_name
-from cms_backend.db.event import create_title_modified_event
+from cms_backend.db.collection import get_collection_by_name, get_collections_by_name
+from cms_backend.db.event import (
+    create_title_modified_event,
+    create_titles_modified_event,
+)
+from cms_backend.db.event_log import delete_events, get_latest_events, log_event
 from cms_backend.db.exceptions import RecordAlreadyExistsError, RecordDoesNotExistError
 from cms_backend.db.flavour import create_title_flavour_schema
+from cms_backend.db.history import get_history_entry_values, resolve_history_entries
+from cms_backend.db.illustration import (
+    load_illustrations_48x48_at_1,
+    save_illustration,
+    set_illustration_48x48_at_1,
+    set_illustrations_48x48_at_1,
+)
+from cms_backend.db.loader_options import LoadProfile, title_loader_options
 from cms_backend.db.models import (
     Collection,
     CollectionTitle,
@@ -31,6 +45,7 @@ from cms_backend.db.models import (
     TitleFlavour,
     TitleHistory,
 )
+from cms_backend.db.reference_data import get_collection_warehouse_id
 from cms_backend.db.rules import apply_retention_rules
 from cms_backend.schemas.models import (
     FileLocation,
@@ -45,19 +60,20 @@ from cms_backend.schemas.orms import (
     TitleCollectionSchema,
     TitleFullSchema,
     TitleHistorySchema,
+    TitleLightField,
     TitleLightSchema,
 )
 from cms_backend.utils import is_valid_uuid
 from cms_backend.utils.datetime import getnow
 
 
-def create_title_full_schema(title: Title) -> TitleFullSchema:
+def create_title_full_schema(session: OrmSession, title: Title) -> TitleFullSchema:
     """Create a full schema of a title."""
     return TitleFullSchema(
         id=title.id,
         name=title.name,
         maturity=title.maturity,
-        events=title.events,
+        events=get_latest_events(session, title),
         title=title.title,
         creator=title.creator,
         publisher=title.publisher,
@@ -136,6 +152,7 @@ def get_title_by_id_or_none(
     *,
     title_id: UUID,
     accessible_collection_ids: Sequence[UUID] | None = None,
+    load_profile: LoadProfile = "full_schema",
 ) -> Title | None:
     """Get a title by ID
 
@@ -143,11 +160,7 @@ def get_title_by_id_or_none(
     """
     return session.scalars(
         select(Title)
-        .options(
-            selectinload(Title.books),
-            selectinload(Title.collections),
-            selectinload(Title.flavours),
-        )
+        .options(*title_loader_options(load_profile))
         .where(
             Title.id == title_id,
             exists().where(
@@ -180,6 +193,7 @@ def get_title_by_name_or_none(
     *,
     name: str,
     accessible_collection_ids: Sequence[UUID] | None = None,
+    load_profile: LoadProfile = "full_schema",
 ) -> Title | None:
     """Get a title by name if possible else None
 
@@ -188,7 +202,7 @@ def get_title_by_name_or_none(
 
     return session.scalars(
         select(Title)
-        .options(selectinload(Title.books), selectinload(Title.collections))
+        .options(*title_loader_options(load_profile))
         .where(
             Title.name == name,
             exists().where(
@@ -254,40 +268,49 @@ def get_title(
     return title
 
 
-def get_titles(
-    session: OrmSession,
+# columns of each field of TitleLightSchema
+TITLE_LIGHT_COLUMNS: dict[str, QueryableAttribute[Any] | ColumnElement[Any]] = {
+    "id": Title.id,
+    "name": Title.name,
+    "maturity": Title.maturity,
+    "archived": Title.archived,
+    "title": Title.title,
+    "creator": Title.creator,
+    "publisher": Title.publisher,
+    "description": Title.description,
+    "language": Title.language,
+    "illustration_48x48_at_1": Title.illustration_48x48_at_1,
+    "long_description": Title.long_description,
+    "license": Title.license,
+    "relation": Title.relation,
+    "source": Title.source,
+}
+
+
+def _get_titles_stmt(
     *,
-    accessible_collection_ids: Sequence[UUID] | None = None,
-    skip: int,
-    limit: int,
-    name: str | None = None,
-    omit_names: list[str] | None = None,
-    collection_name: str | None = None,
-    archived: bool = False,
-    is_rotten: bool | None = None,
-) -> ListResult[TitleLightSchema]:
-    """Get a list of titles
+    accessible_collection_ids: Sequence[UUID] | None,
+    name: str | None,
+    omit_names: list[str] | None,
+    collection_name: str | None,
+    archived: bool,
+    is_rotten: bool | None,
+    fields: Sequence[TitleLightField],
+) -> Select[Any]:
+    """Statement selecting sorted titles matching filters
 
     Only returns titles that belong to at least one of the accessible_collection_ids.
+    Only the columns of `fields` are selected, with id and name.
     """
 
+    # id and name are always needed to deduplicate and sort titles
+    columns = {
+        field: column
+        for field, column in TITLE_LIGHT_COLUMNS.items()
+        if field in ("id", "name", *fields)
+    }
     stmt = (
-        select(
-            Title.id.label("title_id"),
-            Title.name.label("title_name"),
-            Title.maturity.label("title_maturity"),
-            Title.archived.label("title_archived"),
-            Title.title.label("title_title"),
-            Title.creator.label("title_creator"),
-            Title.publisher.label("title_publisher"),
-            Title.description.label("title_description"),
-            Title.language.label("title_language"),
-            Title.illustration_48x48_at_1.label("title_illustration_48x48_at_1"),
-            Title.long_description.label("title_long_description"),
-            Title.license.label("title_license"),
-            Title.relation.label("title_relation"),
-            Title.source.label("title_source"),
-        )
+        select(*(column.label(field) for field, column in columns.items()))
         .join(CollectionTitle, CollectionTitle.title_id == Title.id, isouter=True)
         .join(Collection, CollectionTitle.collection_id == Collection.id, isouter=True)
         .distinct()
@@ -329,54 +352,90 @@ def get_titles(
         else:
             stmt = stmt.where(Title.id.not_in(rotten_titles_subquery))
 
+    return stmt
+
+
+def _get_title_light_schema(
+    row: RowMapping, fields: Sequence[TitleLightField]
+) -> TitleLightSchema:
+    # rows are typed already, no need to validate them again
+    return TitleLightSchema.model_construct(
+        **{field: value for field, value in row.items() if field in fields}
+    )
+
+
+def get_titles(
+    session: OrmSession,
+    *,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+    skip: int,
+    limit: int,
+    name: str | None = None,
+    omit_names: list[str] | None = None,
+    collection_name: str | None = None,
+    archived: bool = False,
+    is_rotten: bool | None = None,
+    fields: Sequence[TitleLightField] | None = None,
+) -> ListResult[TitleLightSchema]:
+    """Get a list of titles
+
+    Only returns titles that belong to at least one of the accessible_collection_ids.
+    Only the columns of `fields` are queried, when set.
+    """
+
+    fields = fields or get_args(TitleLightField)
+    stmt = _get_titles_stmt(
+        accessible_collection_ids=accessible_collection_ids,
+        name=name,
+        omit_names=omit_names,
+        collection_name=collection_name,
+        archived=archived,
+        is_rotten=is_rotten,
+        fields=fields,
+    )
     return ListResult[TitleLightSchema](
         nb_records=count_from_stmt(session, stmt),
         records=[
-            TitleLightSchema(
-                id=title_id,
-                name=title_name,
-                maturity=title_maturity,
-                archived=title_archived,
-                title=title_title,
-                creator=title_creator,
-                publisher=title_publisher,
-                description=title_description,
-                language=title_language,
-                illustration_48x48_at_1=title_illustration_48x48_at_1,
-                long_description=title_long_description,
-                license=title_license,
-                relation=title_relation,
-                source=title_source,
-            )
-            for (
-                title_id,
-                title_name,
-                title_maturity,
-                title_archived,
-                title_title,
-                title_creator,
-                title_publisher,
-                title_description,
-                title_language,
-                title_illustration_48x48_at_1,
-                title_long_description,
-                title_license,
-                title_relation,
-                title_source,
-            ) in session.execute(stmt.offset(skip).limit(limit)).all()
+            _get_title_light_schema(row, fields)
+            for row in session.execute(stmt.offset(skip).limit(limit)).mappings()
         ],
     )
 
 
-def create_title(
+def export_titles(
     session: OrmSession,
     *,
-    author_id: UUID,
-    payload: TitleCreateSchema,
     accessible_collection_ids: Sequence[UUID] | None = None,
-) -> Title:
-    """Create a new title"""
+    name: str | None = None,
+    collection_name: str | None = None,
+    archived: bool = False,
+    is_rotten: bool | None = None,
+    fields: Sequence[TitleLightField] | None = None,
+) -> Generator[TitleLightSchema]:
+    """Iterate over all titles matching filters, in the order of `get_titles`
 
+    Rows are streamed from a server-side cursor, `Context.export_batch_size` at a
+    time, so memory usage does not depend on the number of titles.
+    """
+
+    fields = fields or get_args(TitleLightField)
+    stmt = _get_titles_stmt(
+        accessible_collection_ids=accessible_collection_ids,
+        name=name,
+        omit_names=None,
+        collection_name=collection_name,
+        archived=archived,
+        is_rotten=is_rotten,
+        fields=fields,
+    )
+    for row in session.execute(
+        stmt.execution_options(yield_per=Context.export_batch_size)
+    ).mappings():
+        yield _get_title_light_schema(row, fields)
+
+
+def _new_title(payload: TitleCreateSchema) -> Title:
+    """Title with the details of payload, except illustration and collections"""
     title = Title(
         name=payload.name,
     )
@@ -386,13 +445,26 @@ def create_title(
     title.creator = payload.creator
     title.publisher = payload.publisher
     title.language = payload.language
-    title.illustration_48x48_at_1 = payload.illustration_48x48_at_1
     title.license = payload.license
     title.relation = payload.relation
     title.source = payload.source
     title.description = payload.description
     title.long_description = payload.long_description
-    title.events.append(f"{getnow()}: title created")
+    log_event(title, "title created")
+    return title
+
+
+def create_title(
+    session: OrmSession,
+    *,
+    author_id: UUID,
+    payload: TitleCreateSchema,
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> Title:
+    """Create a new title"""
+
+    title = _new_title(payload)
+    set_illustration_48x48_at_1(session, title, payload.illustration_48x48_at_1)
 
     if payload.collection_titles:
         # Create the collection titles for the title
@@ -432,38 +504,145 @@ def create_title(
     return title
 
 
+def upsert_titles(
+    session: OrmSession,
+    *,
+    author_id: UUID,
+    payloads: Sequence[TitleCreateSchema],
+    accessible_collection_ids: Sequence[UUID] | None = None,
+) -> tuple[list[Title], list[Title]]:
+    """Create titles which do not exist yet and update existing ones, by name
+
+    All payloads are checked and their collections resolved in a single query before
+    anything is written. New titles are inserted with their collection titles,
+    history entries and events on a single flush, and a single `title_modified` event
+    is created for all of them. Existing titles are updated one by one with
+    `update_title` since changing their collections moves their prod books.
+
+    Returns created titles and updated titles.
+    """
+    duplicated_names = sorted(
+        name
+        for name, count in Counter(payload.name for payload in payloads).items()
+        if count > 1
+    )
+    if duplicated_names:
+        raise ValueError(f"Titles duplicated in request: {', '.join(duplicated_names)}")
+
+    collections = get_collections_by_name(
+        session,
+        sorted(
+            {
+                entry.collection_name
+                for payload in payloads
+                for entry in payload.collection_titles or []
+            }
+        ),
+        accessible_collection_ids=accessible_collection_ids,
+    )
+    existing_title_ids = dict(
+        session.execute(
+            select(Title.name, Title.id).where(
+                Title.name.in_([payload.name for payload in payloads])
+            )
+        )
+        .tuples()
+        .all()
+    )
+    # archival is managed by dedicated endpoints
+    updates = [
+        (
+            existing_title_ids[payload.name],
+            TitleUpdateSchema.model_validate(
+                payload.model_dump(exclude_unset=True, exclude={"name", "archived"})
+            ),
+        )
+        for payload in payloads
+        if payload.name in existing_title_ids
+    ]
+    creations = [
+        (_new_title(payload), payload)
+        for payload in payloads
+        if payload.name not in existing_title_ids
+    ]
+
+    set_illustrations_48x48_at_1(
+        session,
+        [(title, payload.illustration_48x48_at_1) for title, payload in creations],
+    )
+    for title, payload in creations:
+        for entry in payload.collection_titles or []:
+            collection_title = CollectionTitle(path=Path(entry.path))
+            collection_title.collection = collections[entry.collection_name]
+            collection_title.title = title
+            session.add(collection_title)
+        create_title_history_entry(
+            session, title, author_id, comment="Create initial history"
+        )
+    created_titles = [title for title, _ in creations]
+    session.add_all(created_titles)
+
+    try:
+        session.flush()
+    except IntegrityError as exc:
+        if isinstance(exc.orig, UniqueViolation):
+            raise RecordAlreadyExistsError(
+                "Some titles have been created concurrently"
+            ) from exc
+        logger.exception("Unknown exception encountered while creating titles")
+        raise
+
+    if created_titles:
+        create_titles_modified_event(session, action="created", titles=created_titles)
+
+    updated_titles = [
+        update_title(
+            session,
+            title_identifier=str(title_id),
+            author_id=author_id,
+            payload=payload,
+            accessible_collection_ids=accessible_collection_ids,
+        )
+        for title_id, payload in updates
+    ]
+    return created_titles, updated_titles
+
+
 def create_title_history_entry(
     session: OrmSession, title: Title, author_id: UUID, comment: str | None = None
 ) -> TitleHistory:
-    history_entry = TitleHistory(
-        name=title.name,
-        title=title.title,
-        comment=comment,
-        creator=title.creator,
-        publisher=title.publisher,
-        description=title.description,
-        language=title.language,
-        illustration_48x48_at_1=title.illustration_48x48_at_1,
-        long_description=title.long_description,
-        license=title.license,
-        relation=title.relation,
-        source=title.source,
-        maturity=title.maturity,
-        archived=title.archived,
-        flavours=[
+    state = {
+        "name": title.name,
+        "title": title.title,
+        "creator": title.creator,
+        "publisher": title.publisher,
+        "description": title.description,
+        "language": title.language,
+        "illustration_48x48_at_1_id": title.illustration_48x48_at_1_id,
+        "long_description": title.long_description,
+        "license": title.license,
+        "relation": title.relation,
+        "source": title.source,
+        "maturity": title.maturity,
+        "archived": title.archived,
+        "flavours": [
             {
                 "flavour": tf.flavour,
                 "recipe_id": str(tf.recipe_id) if tf.recipe_id else None,
             }
             for tf in title.flavours
         ],
-        collection_titles=[
+        "collection_titles": [
             {
                 "collection_name": ct.collection.name,
                 "path": str(ct.path),
             }
             for ct in title.collections
         ],
+    }
+    history_entry = TitleHistory(
+        comment=comment,
+        **get_history_entry_values(session, TitleHistory, title, state),
     )
     history_entry.title_ = title
     history_entry.author_id = author_id
@@ -511,6 +690,10 @@ def update_title(
         mode="json",
     )
     name_changed = payload.name is not None and payload.name != title.name
+    if "illustration_48x48_at_1" in update_data:
+        update_data["illustration_48x48_at_1_id"] = save_illustration(
+            session, update_data.pop("illustration_48x48_at_1")
+        )
 
     if update_data:
         try:
@@ -524,6 +707,8 @@ def update_title(
             raise RecordAlreadyExistsError(
                 f"Title with name '{payload.name}' already exists"
             ) from exc
+        if "illustration_48x48_at_1_id" in update_data:
+            session.expire(title, ["illustration_48x48_at_1"])
 
     # Determine if collection titles changed
     collection_titles_changed = False
@@ -586,7 +771,11 @@ def update_title(
             # Build new target locations based on updated collection_titles
             target_locations = [
                 FileLocation(
-                    tc.collection.warehouse_id, tc.path, current_location.filename
+                    get_collection_warehouse_id(
+                        session, collection_id=tc.collection_id
+                    ),
+                    tc.path,
+                    current_location.filename,
                 )
                 for tc in title.collections
             ]
@@ -601,12 +790,9 @@ def update_title(
                 target_locations=target_locations,
             )
 
-            book.events.append(
-                f"{getnow()}: locations updated due to title collection change"
-            )
+            log_event(book, "locations updated due to title collection change")
 
-    for book in title.books:
-        update_book_issues(session, book)
+    update_books_issues(session, title.books)
 
     if name_changed and create_event:
         create_title_modified_event(
@@ -658,7 +844,7 @@ def archive_title(
                 nb_deleted += 1
 
     if nb_deleted:
-        title.events.append(f"{getnow()}: marked books in title for deletion.")
+        log_event(title, "marked books in title for deletion.")
 
     session.add(title)
     session.flush()
@@ -702,7 +888,6 @@ def restore_title(
         accessible_collection_ids=accessible_collection_ids,
         payload=TitleUpdateSchema(archived=False),
     )
-    now = getnow()
     logger.info(
         f"recovering books belonging to title {title.id} that have been marked for "
         "deletion."
@@ -722,7 +907,7 @@ def restore_title(
                 nb_recovered += 1
 
     if nb_recovered:
-        title.events.append(f"{now}: recovered books in title for deletion.")
+        log_event(title, "recovered books in title for deletion.")
 
     session.add(title)
     session.flush()
@@ -748,6 +933,15 @@ def restore_titles(
 
 
 def create_title_history_schema(entry: TitleHistory) -> TitleHistorySchema:
+    # only NULL in entries storing changes, until they are resolved
+    if (
+        entry.name is None
+        or entry.maturity is None
+        or entry.archived is None
+        or entry.flavours is None
+        or entry.collection_titles is None
+    ):
+        raise ValueError(f"Title history entry {entry.id} is not resolved")
     return TitleHistorySchema(
         id=entry.id,
         created_at=entry.created_at,
@@ -798,14 +992,14 @@ def get_title_history(
         select(TitleHistory)
         .where(TitleHistory.title_id == title.id)
         .options(selectinload(TitleHistory.author))
-        .order_by(TitleHistory.created_at.desc())
+        .order_by(TitleHistory.created_at.desc(), TitleHistory.sequence.desc())
     )
+    entries = session.scalars(stmt.offset(skip).limit(limit)).all()
+    resolve_history_entries(session, entries)
+    load_illustrations_48x48_at_1(session, entries)
     return ListResult[TitleHistorySchema](
         nb_records=count_from_stmt(session, stmt),
-        records=[
-            create_title_history_schema(entry)
-            for entry in session.scalars(stmt.offset(skip).limit(limit)).all()
-        ],
+        records=[create_title_history_schema(entry) for entry in entries],
     )
 
 
@@ -820,11 +1014,15 @@ def get_title_history_entry_or_none(
     title = get_title(
         session, title_identifier, accessible_collection_ids=accessible_collection_ids
     )
-    return session.scalars(
+    entry = session.scalars(
         select(TitleHistory).where(
             TitleHistory.id == history_id, TitleHistory.title_id == title.id
         )
     ).one_or_none()
+    if entry:
+        resolve_history_entries(session, [entry])
+        load_illustrations_48x48_at_1(session, [entry])
+    return entry
 
 
 def get_title_history_entry(
@@ -863,6 +1061,9 @@ def revert_title(
         history_id=history_id,
         accessible_collection_ids=accessible_collection_ids,
     )
+    # only NULL in entries storing changes, until they are resolved
+    if entry.name is None or entry.maturity is None or entry.collection_titles is None:
+        raise ValueError(f"Title history entry {entry.id} is not resolved")
     title = update_title(
         session,
         title_identifier=title_identifier,
@@ -927,6 +1128,11 @@ def merge_titles(
         name=target_title_name,
         accessible_collection_ids=accessible_collection_ids,
     )
+    # events of source titles are deleted before anything else is pending in the
+    # session, as this statement autoflushes it
+    for source_title in source_titles:
+        delete_events(session, source_title)
+
     source_books = [book for title in source_titles for book in title.books]
     # Attach all the books to the new title
     for source_book in source_books:
@@ -938,6 +1144,9 @@ def merge_titles(
             session.delete(collection_title)
         session.delete(source_title)
 
+    # books are processed one after the other as each one moved to prod changes the
+    # latest prod book of the next ones, only download their zimcheck results upfront
+    prefetch_zimcheck_results(source_books)
     for source_book in source_books:
         process_book(session, source_book)
 
@@ -1,12 +1,15 @@
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
 from sqlalchemy import String, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session as OrmSession
 from sqlalchemy.orm import selectinload
 
 from cms_backend.db import count_from_stmt
+from cms_backend.db.book import scraper_is_whitelisted_from_zimcheck
 from cms_backend.db.exceptions import (
     RecordDoesNotExistError,
 )
@@ -30,6 +33,32 @@ def create_zimfarm_notification(
     return zimfarm_notification
 
 
+def create_zimfarm_notifications(
+    session: OrmSession, notifications: Iterable[tuple[UUID, dict[str, Any]]]
+) -> list[UUID]:
+    """Create Zimfarm notifications which were not already received
+
+    `notifications` are tuples of notification ID and content. They are all inserted
+    with a single statement, ignoring the ones whose ID already exists. Returns the
+    IDs of the notifications which were created.
+    """
+    received_at = getnow()
+    values = [
+        {"id": notification_id, "received_at": received_at, "content": content}
+        for notification_id, content in notifications
+    ]
+    if not values:
+        return []
+    return list(
+        session.scalars(
+            insert(ZimfarmNotification)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=[ZimfarmNotification.id])
+            .returning(ZimfarmNotification.id)
+        )
+    )
+
+
 def get_zimfarm_notification_or_none(
     session: OrmSession, notification_id: UUID
 ) -> ZimfarmNotification | None:
@@ -67,6 +96,28 @@ def get_next_notification_to_process_or_none(
     ).one_or_none()
 
 
+def get_pending_notifications_zimcheck_urls(
+    session: OrmSession, *, limit: int
+) -> list[str]:
+    """Zimcheck URLs of the next `limit` notifications to process
+
+    Results of whitelisted scrapers are never used, they are hence not returned.
+    """
+    return [
+        url
+        for url, scraper in session.execute(
+            select(
+                ZimfarmNotification.content["zimcheck_url"].as_string(),
+                ZimfarmNotification.content["metadata"]["Scraper"].as_string(),
+            )
+            .where(ZimfarmNotification.status == "pending")
+            .order_by(ZimfarmNotification.received_at)
+            .limit(limit)
+        ).tuples()
+        if url and not scraper_is_whitelisted_from_zimcheck(scraper or "")
+    ]
+
+
 def get_zimfarm_notifications(
     session: OrmSession,
     *,
@@ -109,8 +160,9 @@ def get_zimfarm_notifications(
 
     return ListResult[ZimfarmNotificationLightSchema](
         nb_records=count_from_stmt(session, stmt),
+        # rows are typed already, no need to validate them again
         records=[
-            ZimfarmNotificationLightSchema(
+            ZimfarmNotificationLightSchema.model_construct(
                 id=notif_id,
                 book_id=notif_book_id,
                 status=notif_status,
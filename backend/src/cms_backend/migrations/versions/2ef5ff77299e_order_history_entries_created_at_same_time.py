@@ -0,0 +1,35 @@
+"""order history entries created at the same time
+
+Revision ID: 2ef5ff77299e
+Revises: fc37fd6e10b3
+Create Date: 2026-10-19 13:15:44.475645
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2ef5ff77299e"
+down_revision = "fc37fd6e10b3"
+branch_labels = None
+depends_on = None
+
+HISTORY_TABLES = ("book_history", "collection_history", "title_history")
+
+
+def upgrade():
+    # existing entries are numbered in their physical order, the closest to their
+    # insertion order
+    for table in HISTORY_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "sequence", sa.BigInteger(), sa.Identity(always=False), nullable=False
+            ),
+        )
+
+
+def downgrade():
+    for table in HISTORY_TABLES:
+        op.drop_column(table, "sequence")
@@ -0,0 +1,119 @@
+"""store history entries as diffs
+
+Revision ID: 686bec91eb7e
+Revises: ea19edfaceb7
+Create Date: 2026-10-19 14:02:17.530118
+
+"""
+
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "686bec91eb7e"
+down_revision = "ea19edfaceb7"
+branch_labels = None
+depends_on = None
+
+# table: (owner column, history fields, fields which are not nullable in full rows)
+HISTORY_TABLES = {
+    "book_history": ("book_id", ("name", "flavour"), ("flavour",)),
+    "collection_history": (
+        "collection_id",
+        (
+            "name",
+            "download_base_url",
+            "view_base_url",
+            "is_private",
+            "article_count_increase_threshold",
+            "media_count_increase_threshold",
+            "article_count_decrease_threshold",
+            "media_count_decrease_threshold",
+        ),
+        ("name", "is_private"),
+    ),
+    "title_history": (
+        "title_id",
+        (
+            "name",
+            "title",
+            "creator",
+            "publisher",
+            "description",
+            "language",
+            "illustration_48x48_at_1_id",
+            "long_description",
+            "license",
+            "relation",
+            "source",
+            "maturity",
+            "archived",
+            "flavours",
+            "collection_titles",
+        ),
+        ("name", "maturity", "archived", "flavours", "collection_titles"),
+    ),
+}
+
+
+def upgrade():
+    for table, (_, _, not_nullable_fields) in HISTORY_TABLES.items():
+        # existing entries are all full copies
+        op.add_column(
+            table,
+            sa.Column(
+                "is_checkpoint",
+                sa.Boolean(),
+                server_default=sa.text("true"),
+                nullable=False,
+            ),
+        )
+        op.add_column(
+            table,
+            sa.Column("changed_fields", postgresql.ARRAY(sa.String()), nullable=True),
+        )
+        for field in not_nullable_fields:
+            op.alter_column(table, field, nullable=True)
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table, (owner_column, fields, not_nullable_fields) in HISTORY_TABLES.items():
+        # rebuild the full content of entries which only store changes
+        field_columns: list[sa.ColumnClause[Any]] = [
+            sa.column(field, postgresql.JSONB())
+            if field in ("flavours", "collection_titles")
+            else sa.column(field)
+            for field in fields
+        ]
+        history = sa.table(
+            table,
+            sa.column("id"),
+            sa.column(owner_column),
+            sa.column("created_at"),
+            sa.column("is_checkpoint"),
+            sa.column("changed_fields"),
+            *field_columns,
+        )
+        state = {}
+        owner_id = None
+        for row in bind.execute(
+            sa.select(history).order_by(history.c[owner_column], history.c.created_at)
+        ).mappings():
+            if row["is_checkpoint"] or row[owner_column] != owner_id:
+                state = {field: row[field] for field in fields}
+                owner_id = row[owner_column]
+                continue
+            changed_fields: list[str] = row["changed_fields"] or []
+            state |= {field: row[field] for field in changed_fields}
+            bind.execute(
+                sa.update(history).where(history.c.id == row["id"]).values(**state)
+            )
+
+        for field in not_nullable_fields:
+            op.alter_column(table, field, nullable=False)
+        op.drop_column(table, "changed_fields")
+        op.drop_column(table, "is_checkpoint")
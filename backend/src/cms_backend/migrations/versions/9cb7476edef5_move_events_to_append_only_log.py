@@ -0,0 +1,97 @@
+"""move events to append-only log
+
+Revision ID: 9cb7476edef5
+Revises: 686bec91eb7e
+Create Date: 2026-10-19 15:12:44.208311
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "9cb7476edef5"
+down_revision = "686bec91eb7e"
+branch_labels = None
+depends_on = None
+
+# table: entity_type in the event log
+LOGGED_TABLES = {
+    "zimfarm_notification": "zimfarm_notification",
+    "book": "book",
+    "title": "title",
+}
+
+# events used to be stored as "<timestamp>: <message>"
+EVENT_TIMESTAMP_REGEX = r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d+)?): "
+
+
+def upgrade():
+    op.create_table(
+        "event_log",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column("message", sa.String(), nullable=False),
+        sa.Column("entity_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_event_log")),
+    )
+    op.create_index(
+        "idx_event_log_entity_id_created_at",
+        "event_log",
+        ["entity_id", "created_at"],
+        unique=False,
+    )
+    for table, entity_type in LOGGED_TABLES.items():
+        op.execute(
+            f"""
+            INSERT INTO event_log (entity_type, entity_id, created_at, message)
+            SELECT
+                '{entity_type}',
+                {table}.id,
+                COALESCE(
+                    substring(event.value FROM '{EVENT_TIMESTAMP_REGEX}')::timestamp,
+                    now()
+                ),
+                regexp_replace(event.value, '{EVENT_TIMESTAMP_REGEX}', '')
+            FROM {table}, unnest({table}.events) WITH ORDINALITY AS event(value, nb)
+            ORDER BY {table}.id, event.nb
+            """  # noqa: S608
+        )
+        op.drop_column(table, "events")
+
+
+def downgrade():
+    for table, entity_type in LOGGED_TABLES.items():
+        op.add_column(
+            table,
+            sa.Column(
+                "events",
+                postgresql.ARRAY(sa.String()),
+                server_default="{}",
+                nullable=False,
+            ),
+        )
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET events = entity_events.events
+            FROM (
+                SELECT
+                    entity_id,
+                    array_agg(
+                        created_at::text || ': ' || message ORDER BY created_at, id
+                    ) AS events
+                FROM event_log
+                WHERE entity_type = '{entity_type}'
+                GROUP BY entity_id
+            ) AS entity_events
+            WHERE entity_events.entity_id = {table}.id
+            """  # noqa: S608
+        )
+        op.alter_column(table, "events", server_default=None)
+    op.drop_index("idx_event_log_entity_id_created_at", table_name="event_log")
+    op.drop_table("event_log")
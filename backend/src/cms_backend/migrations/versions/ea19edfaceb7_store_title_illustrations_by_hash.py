@@ -0,0 +1,86 @@
+"""store title illustrations by hash
+
+Revision ID: ea19edfaceb7
+Revises: ab56192a5aa9
+Create Date: 2026-10-19 11:20:42.118204
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "ea19edfaceb7"
+down_revision = "ab56192a5aa9"
+branch_labels = None
+depends_on = None
+
+# same identifier as computed by cms_backend.db.illustration.get_illustration_id
+ILLUSTRATION_ID = "encode(sha256(convert_to({column}, 'UTF8')), 'hex')"
+
+
+def upgrade():
+    op.create_table(
+        "illustration",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("content", sa.String(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_illustration")),
+    )
+    for table in ("title", "title_history"):
+        op.add_column(
+            table,
+            sa.Column("illustration_48x48_at_1_id", sa.String(), nullable=True),
+        )
+        op.execute(
+            f"""
+            INSERT INTO illustration (id, content)
+            SELECT DISTINCT
+                {ILLUSTRATION_ID.format(column="illustration_48x48_at_1")},
+                illustration_48x48_at_1
+            FROM {table}
+            WHERE illustration_48x48_at_1 IS NOT NULL
+            ON CONFLICT (id) DO NOTHING
+            """  # noqa: S608
+        )
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET illustration_48x48_at_1_id =
+                {ILLUSTRATION_ID.format(column="illustration_48x48_at_1")}
+            WHERE illustration_48x48_at_1 IS NOT NULL
+            """  # noqa: S608
+        )
+        op.create_foreign_key(
+            op.f(f"fk_{table}_illustration_48x48_at_1_id_illustration"),
+            table,
+            "illustration",
+            ["illustration_48x48_at_1_id"],
+            ["id"],
+        )
+        op.drop_column(table, "illustration_48x48_at_1")
+
+
+def downgrade():
+    for table in ("title", "title_history"):
+        op.add_column(
+            table,
+            sa.Column("illustration_48x48_at_1", sa.String(), nullable=True),
+        )
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET illustration_48x48_at_1 = illustration.content
+            FROM illustration
+            WHERE illustration.id = {table}.illustration_48x48_at_1_id
+            """  # noqa: S608
+        )
+        op.drop_constraint(
+            op.f(f"fk_{table}_illustration_48x48_at_1_id_illustration"),
+            table,
+            type_="foreignkey",
+        )
+        op.drop_column(table, "illustration_48x48_at_1_id")
+    op.drop_table("illustration")
@@ -0,0 +1,76 @@
+"""store book illustrations by hash
+
+Revision ID: fc37fd6e10b3
+Revises: 9cb7476edef5
+Create Date: 2026-10-19 17:41:08.512937
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "fc37fd6e10b3"
+down_revision = "9cb7476edef5"
+branch_labels = None
+depends_on = None
+
+ILLUSTRATION_KEY = "Illustration_48x48@1"
+ILLUSTRATION = f"zim_metadata->>'{ILLUSTRATION_KEY}'"
+# same identifier as computed by cms_backend.db.illustration.get_illustration_id
+ILLUSTRATION_ID = f"encode(sha256(convert_to({ILLUSTRATION}, 'UTF8')), 'hex')"
+
+
+def upgrade():
+    op.add_column(
+        "book",
+        sa.Column("illustration_48x48_at_1_id", sa.String(), nullable=True),
+    )
+    op.execute(
+        f"""
+        INSERT INTO illustration (id, content)
+        SELECT DISTINCT {ILLUSTRATION_ID}, {ILLUSTRATION}
+        FROM book
+        WHERE COALESCE({ILLUSTRATION}, '') <> ''
+        ON CONFLICT (id) DO NOTHING
+        """  # noqa: S608
+    )
+    op.execute(
+        f"""
+        UPDATE book
+        SET illustration_48x48_at_1_id = {ILLUSTRATION_ID}
+        WHERE COALESCE({ILLUSTRATION}, '') <> ''
+        """  # noqa: S608
+    )
+    op.execute(
+        f"""
+        UPDATE book
+        SET zim_metadata = zim_metadata - '{ILLUSTRATION_KEY}'
+        WHERE zim_metadata ? '{ILLUSTRATION_KEY}'
+        """  # noqa: S608
+    )
+    op.create_foreign_key(
+        op.f("fk_book_illustration_48x48_at_1_id_illustration"),
+        "book",
+        "illustration",
+        ["illustration_48x48_at_1_id"],
+        ["id"],
+    )
+
+
+def downgrade():
+    op.execute(
+        f"""
+        UPDATE book
+        SET zim_metadata = zim_metadata
+            || jsonb_build_object('{ILLUSTRATION_KEY}', illustration.content)
+        FROM illustration
+        WHERE illustration.id = book.illustration_48x48_at_1_id
+        """  # noqa: S608
+    )
+    op.drop_constraint(
+        op.f("fk_book_illustration_48x48_at_1_id_illustration"),
+        "book",
+        type_="foreignkey",
+    )
+    op.drop_column("book", "illustration_48x48_at_1_id")
@@ -46,6 +46,18 @@ class Context:
         seconds=parse_timespan(os.getenv("STAGING_BOOKS_LIFESPAN", default="30d"))
     )
 
+    # number of SQL queries expected at most to process one notification or book,
+    # a warning is logged when exceeded to help spotting N+1 patterns
+    processing_query_budget: int = int(
+        os.getenv("PROCESSING_QUERY_BUDGET", default="40")
+    )
+
+    # number of pending notifications whose zimcheck results are downloaded
+    # concurrently before processing them
+    zimcheck_prefetch_batch_size: int = max(
+        int(os.getenv("ZIMCHECK_PREFETCH_BATCH_SIZE", default="20")), 1
+    )
+
     staging_books_deletion_grace_period: timedelta = timedelta(
         seconds=parse_timespan(
             os.getenv("STAGING_BOOKS_DELETION_GRACE_PERIOD", default="7d")
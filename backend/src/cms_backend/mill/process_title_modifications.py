@@ -1,3 +1,4 @@
+from typing import Any
 from uuid import UUID
 
 from sqlalchemy import select
@@ -5,8 +6,10 @@ from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
 from cms_backend.db.event import delete_event, get_next_event_to_process_or_none
-from cms_backend.db.models import Book
-from cms_backend.db.title import get_title_by_id_or_none
+from cms_backend.db.loader_options import book_loader_options
+from cms_backend.db.models import Book, Title
+from cms_backend.db.query_budget import query_budget
+from cms_backend.mill.context import Context as MillContext
 from cms_backend.mill.processors.book import process_book
 from cms_backend.utils.zim import get_missing_keys
 
@@ -20,7 +23,20 @@ def process_title_modifications(session: OrmSession):
             break
         logger.debug(f"Processing title modification event {event.id}")
 
-        missing_keys = get_missing_keys(event.payload, "id", "name", "action")
+        # modifications of many titles at once are coalesced in a single event
+        entries: list[dict[str, Any]]
+        if "titles" in event.payload:
+            entries = event.payload["titles"]
+            missing_keys = get_missing_keys(event.payload, "action") + sorted(
+                {
+                    key
+                    for entry in entries
+                    for key in get_missing_keys(entry, "id", "name")
+                }
+            )
+        else:
+            entries = [event.payload]
+            missing_keys = get_missing_keys(event.payload, "id", "name", "action")
         if missing_keys:
             logger.warning(
                 "Title modification event is missing mandatory keys: "
@@ -30,52 +46,68 @@ def process_title_modifications(session: OrmSession):
             session.commit()
             continue
 
-        title = get_title_by_id_or_none(
-            session,
-            title_id=UUID(event.payload["id"]),
+        title_names = {UUID(entry["id"]): entry["name"] for entry in entries}
+        archived_titles = dict(
+            session.execute(
+                select(Title.id, Title.archived).where(Title.id.in_(title_names))
+            )
+            .tuples()
+            .all()
         )
-        if not title:
-            logger.warning(f"Title with ID {event.payload['id']} does not exist.")
-            delete_event(session, event_id=event.id)
-            session.commit()
-            continue
-
-        if title.archived:
-            logger.warning(f"Title {title.id} is archived.")
+        for title_id in title_names:
+            if title_id not in archived_titles:
+                logger.warning(f"Title with ID {title_id} does not exist.")
+            elif archived_titles[title_id]:
+                logger.warning(f"Title {title_id} is archived.")
+        title_names = {
+            title_id: name
+            for title_id, name in title_names.items()
+            if archived_titles.get(title_id) is False
+        }
+        if not title_names:
             delete_event(session, event_id=event.id)
             session.commit()
             continue
 
-        title_name = event.payload["name"]
         books_without_title = session.scalars(
             select(Book)
             .where(
                 Book.title_id.is_(None),
                 Book.has_error.is_(False),
-                Book.name == title_name,
+                Book.name.in_(title_names.values()),
                 Book.location_kind.not_in(["deleted", "to_delete"]),
             )
             .order_by(Book.created_at)
+            .options(*book_loader_options("processing"))
         ).all()
 
         if not books_without_title:
-            logger.info(f"No books without title matching title '{title_name}'")
+            logger.info(
+                "No books without title matching titles "
+                f"{', '.join(sorted(title_names.values()))}"
+            )
             delete_event(session, event_id=event.id)
             session.commit()
             continue
 
         logger.info(
-            f"Found {len(books_without_title)} book(s) matching title '{title_name}'"
+            f"Found {len(books_without_title)} book(s) matching titles "
+            f"{', '.join(sorted(title_names.values()))}"
         )
 
         for book in books_without_title:
-            try:
-                process_book(session, book)
-            except Exception:
-                logger.exception("error while processing book")
-            else:
-                delete_event(session, event.id)
-                nb_events_processed += 1
-            session.commit()
+            with query_budget(
+                session,
+                label=f"book {book.id}",
+                max_queries=MillContext.processing_query_budget,
+            ):
+                try:
+                    process_book(session, book)
+                except Exception:
+                    logger.exception("error while processing book")
+                else:
+                    delete_event(session, event.id)
+                    nb_events_processed += 1
+                session.commit()
 
     logger.info(f"Done processing {nb_events_processed} title modification events.")
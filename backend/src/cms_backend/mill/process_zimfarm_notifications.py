@@ -1,20 +1,44 @@
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
-from cms_backend.db.zimfarm_notification import get_next_notification_to_process_or_none
+from cms_backend.db.query_budget import query_budget
+from cms_backend.db.zimfarm_notification import (
+    get_next_notification_to_process_or_none,
+    get_pending_notifications_zimcheck_urls,
+)
+from cms_backend.mill.context import Context as MillContext
 from cms_backend.mill.processors.zimfarm_notification import process_notification
+from cms_backend.utils.zimcheck_fetcher import zimcheck_fetcher
+
+
+def prefetch_zimcheck_results(session: OrmSession):
+    """Download zimcheck results of the next notifications to process"""
+    urls = get_pending_notifications_zimcheck_urls(
+        session, limit=MillContext.zimcheck_prefetch_batch_size
+    )
+    # do not keep a transaction open while downloading
+    session.commit()
+    if nb_downloaded := zimcheck_fetcher.prefetch(urls):
+        logger.debug(f"Prefetched {nb_downloaded} zimcheck results")
 
 
 def process_zimfarm_notifications(session: OrmSession):
     logger.info("Processing Zimfarm notifications")
     nb_notifications_processed = 0
     while True:
+        if nb_notifications_processed % MillContext.zimcheck_prefetch_batch_size == 0:
+            prefetch_zimcheck_results(session)
         notification = get_next_notification_to_process_or_none(session)
         if not notification:
             break
         logger.debug(f"Processing Zimfarm notification {notification.id}")
-        process_notification(session, notification)
-        session.commit()
+        with query_budget(
+            session,
+            label=f"Zimfarm notification {notification.id}",
+            max_queries=MillContext.processing_query_budget,
+        ):
+            process_notification(session, notification)
+            session.commit()
         nb_notifications_processed += 1
 
     logger.info(f"Done processing {nb_notifications_processed} Zimfarm notifications")
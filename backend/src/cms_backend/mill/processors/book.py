@@ -4,11 +4,10 @@ from uuid import UUID
 from sqlalchemy.orm import Session as ORMSession
 
 from cms_backend import logger
-from cms_backend.db.book import add_book_to_title
+from cms_backend.db.book import add_book_to_title, get_book_missing_metadata_keys
+from cms_backend.db.event_log import log_event
 from cms_backend.db.models import Book, Title
 from cms_backend.db.title import get_title_by_name_or_none
-from cms_backend.utils.datetime import getnow
-from cms_backend.utils.zim import get_missing_metadata_keys
 
 
 def process_book(session: ORMSession, book: Book):
@@ -22,9 +21,7 @@ def process_book(session: ORMSession, book: Book):
             return
 
         if title.archived:
-            book.events.append(
-                f"{getnow()}: cannot add book to title because title is archived"
-            )
+            log_event(book, "cannot add book to title because title is archived")
             return
 
         add_book_to_title(session, book, title)
@@ -36,26 +33,25 @@ def process_book(session: ORMSession, book: Book):
 def check_book_zim_spec(book: Book) -> bool:
     try:
         if not book.article_count:
-            book.events.append(f"{getnow()}: book has no article(s)")
+            log_event(book, "book has no article(s)")
             book.has_error = True
             return False
 
-        missing_metadata_keys = get_missing_metadata_keys(book.zim_metadata)
+        missing_metadata_keys = get_book_missing_metadata_keys(book)
         if missing_metadata_keys:
-            book.events.append(
-                f"{getnow()}: book is missing mandatory metadata: "
-                f"{','.join(missing_metadata_keys)}"
+            log_event(
+                book,
+                f"book is missing mandatory metadata: "
+                f"{','.join(missing_metadata_keys)}",
             )
             book.has_error = True
             return False
 
-        book.events.append(f"{getnow()}: book passed ZIM specification checks")
+        log_event(book, "book passed ZIM specification checks")
         return True
 
     except Exception as exc:
-        book.events.append(
-            f"{getnow()}: error encountered while checking ZIM specification\n{exc}"
-        )
+        log_event(book, f"error encountered while checking ZIM specification\n{exc}")
         logger.exception(f"Failed to check ZIM specification for book {book.id}")
         book.has_error = True
         return False
@@ -68,9 +64,7 @@ def get_matching_title(
 ) -> Title | None:
     try:
         if not book.name:
-            book.events.append(
-                f"{getnow()}: no title can be found because name is missing"
-            )
+            log_event(book, "no title can be found because name is missing")
             book.has_error = True
             return None
 
@@ -78,23 +72,22 @@ def get_matching_title(
             session,
             name=book.name,
             accessible_collection_ids=accessible_collection_ids,
+            load_profile="processing",
         )
 
         if not title:
-            book.events.append(f"{getnow()}: no matching title found for book")
+            log_event(book, "no matching title found for book")
             # Set all flags to False for pending_title state (passive wait)
             book.needs_processing = False
             book.has_error = False
             book.needs_file_operation = False
             return None
 
-        book.events.append(f"{getnow()}: found matching title {title.id}")
+        log_event(book, f"found matching title {title.id}")
         return title
 
     except Exception as exc:
-        book.events.append(
-            f"{getnow()}: error encountered while get matching title\n{exc}"
-        )
+        log_event(book, f"error encountered while get matching title\n{exc}")
         logger.exception(f"Failed to get matching title for {book.id}")
         book.has_error = True
         return None
@@ -2,12 +2,12 @@ from sqlalchemy.orm import Session as ORMSession
 
 from cms_backend import logger
 from cms_backend.context import Context
-from cms_backend.db.account import get_account_by_username
 from cms_backend.db.book import create_book
 from cms_backend.db.book_location import create_book_location
+from cms_backend.db.event_log import log_event
 from cms_backend.db.models import ZimfarmNotification
+from cms_backend.db.reference_data import get_account_id_by_username
 from cms_backend.mill.processors.book import process_book
-from cms_backend.utils.datetime import getnow
 
 
 def process_notification(session: ORMSession, notification: ZimfarmNotification):
@@ -36,9 +36,10 @@ def process_notification(session: ORMSession, notification: ZimfarmNotification)
         ]
 
         if missing_notification_keys:
-            notification.events.append(
-                f"{getnow()}: notification is missing mandatory keys: "
-                f"{','.join(missing_notification_keys)}"
+            log_event(
+                notification,
+                f"notification is missing mandatory keys: "
+                f"{','.join(missing_notification_keys)}",
             )
             notification.status = "bad_notification"
             return
@@ -48,37 +49,40 @@ def process_notification(session: ORMSession, notification: ZimfarmNotification)
 
         # Validate filename is a non-empty string
         if not isinstance(filename, str) or not filename:
-            notification.events.append(
-                f"{getnow()}: filename must be a non-empty string, got "
-                f"{type(filename).__name__}: {filename}"
+            log_event(
+                notification,
+                f"filename must be a non-empty string, got "
+                f"{type(filename).__name__}: {filename}",
             )
             notification.status = "bad_notification"
             return
 
         # Validate folder_name is a string (can be empty for files at quarantine root)
         if not isinstance(folder_name, str):
-            notification.events.append(
-                f"{getnow()}: folder_name must be a string, got "
-                f"{type(folder_name).__name__}: {folder_name}"
+            log_event(
+                notification,
+                f"folder_name must be a string, got "
+                f"{type(folder_name).__name__}: {folder_name}",
             )
             notification.status = "bad_notification"
             return
 
         zimcheck_url = notification.content.get("zimcheck_url")
         if not isinstance(zimcheck_url, str) or not zimcheck_url:
-            notification.events.append(
-                f"{getnow()}: zimcheck_url must be a non-empty string, got "
-                f"{type(zimcheck_url).__name__}: {zimcheck_url}"
+            log_event(
+                notification,
+                f"zimcheck_url must be a non-empty string, got "
+                f"{type(zimcheck_url).__name__}: {zimcheck_url}",
             )
             notification.status = "bad_notification"
             return
 
-        account = get_account_by_username(session, username="maint-scripts")
+        author_id = get_account_id_by_username(session, username="maint-scripts")
 
         book = create_book(
             session=session,
             book_id=notification.id,
-            author_id=account.id,
+            author_id=author_id,
             article_count=notification.content["article_count"],
             media_count=notification.content["media_count"],
             size=notification.content["size"],
@@ -103,8 +107,8 @@ def process_notification(session: ORMSession, notification: ZimfarmNotification)
         process_book(session, book)
 
     except Exception as exc:
-        notification.events.append(
-            f"{getnow()}: error encountered while processing notification\n{exc}"
+        log_event(
+            notification, f"error encountered while processing notification\n{exc}"
         )
         logger.exception(f"Failed to process zimfarm notification {notification.id}")
         notification.status = "errored"
@@ -2,8 +2,6 @@ import base64
 from dataclasses import dataclass
 from typing import Annotated, Any
 
-import pycountry
-import regex
 from pydantic import (
     AfterValidator,
     Field,
@@ -12,6 +10,9 @@ from pydantic import (
     WrapValidator,
 )
 
+from cms_backend.utils import get_grapheme_length
+from cms_backend.utils.language import is_supported_language_code
+
 
 @dataclass(frozen=True)
 class GraphemeLength:
@@ -22,7 +23,7 @@ class GraphemeLength:
         context = info.context
         if context and context.get("skip_validation"):
             return v
-        n = len(regex.findall(r"\X", v))
+        n = get_grapheme_length(v)
         if self.min is not None and n < self.min:
             raise ValueError(
                 f"String should have at least {self.min} grapheme clusters (got {n})"
@@ -88,7 +89,7 @@ def validate_language_code(value: str | None, info: ValidationInfo) -> str | Non
     if context and context.get("skip_validation"):
         return value
 
-    if pycountry.languages.get(alpha_3=value):  # pyright: ignore[reportUnknownMemberType]
+    if is_supported_language_code(value):
         return value
     raise ValueError(
         f"Language code '{value}' is not a supported ISO-639-3 language code"
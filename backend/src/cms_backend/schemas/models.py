@@ -18,7 +18,7 @@ from cms_backend.schemas.fields import (
     NotEmptyString,
     SkipField,
 )
-from cms_backend.schemas.orms import BaseTitleCollectionSchema
+from cms_backend.schemas.orms import BaseTitleCollectionSchema, BookLightField
 
 # If you change this, also update TITLE_NAME_PATTERN in
 # frontend/src/components/TitleNameField.vue for consistency
@@ -39,9 +39,7 @@ class ZimUrlsSchema(BaseModel):
     urls: dict[UUID, list[ZimUrlSchema]]
 
 
-class GetBooksSchema(BaseModel):
-    skip: SkipField = 0
-    limit: LimitFieldMax200 = 20
+class BooksFilterSchema(BaseModel):
     id: NotEmptyString | None = None
     name: NotEmptyString | None = None
     flavour: NotEmptyString | None = None
@@ -55,9 +53,24 @@ class GetBooksSchema(BaseModel):
     updated_before: datetime.datetime | None = None
     updated_after: datetime.datetime | None = None
     created_before: datetime.datetime | None = None
-    omit_book_ids: list[UUID] | None = None
     offliner: NotEmptyString | None = None
     issue: NotEmptyString | None = None
+    # only return these fields of books (all when not set)
+    fields: list[BookLightField] | None = None
+
+
+class GetBooksSchema(BooksFilterSchema):
+    skip: SkipField = 0
+    limit: LimitFieldMax200 = 20
+
+
+class BookActionResultSchema(BaseModel):
+    """Outcome of an action applied to one book of a bulk request"""
+
+    id: UUID
+    success: bool
+    # why the action failed, like the message of single book endpoints errors
+    message: str | None = None
 
 
 class BookLanguagesSchema(BaseModel):
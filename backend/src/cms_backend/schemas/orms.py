@@ -1,6 +1,6 @@
 from datetime import datetime
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Any, Literal, TypeVar
 from uuid import UUID
 
 from pydantic import computed_field
@@ -66,6 +66,25 @@ class TitleLightSchema(BaseModel):
     source: str | None
 
 
+# fields of TitleLightSchema which can be selected when listing titles
+TitleLightField = Literal[
+    "id",
+    "name",
+    "maturity",
+    "archived",
+    "title",
+    "creator",
+    "publisher",
+    "description",
+    "language",
+    "illustration_48x48_at_1",
+    "long_description",
+    "license",
+    "relation",
+    "source",
+]
+
+
 class BaseTitleCollectionSchema(BaseModel):
     collection_name: NotEmptyString
     path: str
@@ -172,6 +191,25 @@ class BookLightSchema(BaseModel):
     offliner: str | None
 
 
+# fields of BookLightSchema which can be selected when listing books
+BookLightField = Literal[
+    "id",
+    "title_id",
+    "title_name",
+    "location_kind",
+    "needs_processing",
+    "has_error",
+    "needs_file_operation",
+    "deletion_date",
+    "created_at",
+    "name",
+    "date",
+    "flavour",
+    "issues",
+    "offliner",
+]
+
+
 class ZimcheckSummarySchema(BaseModel):
     zimcheck_version: str | None = None
     status: bool | None = None
@@ -4,7 +4,12 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
+from cms_backend.db.event_log import log_event
 from cms_backend.db.models import Book
+from cms_backend.db.reference_data import (
+    get_location_full_str,
+    get_warehouse_name_or_none,
+)
 from cms_backend.shuttle.context import Context as ShuttleContext
 from cms_backend.utils.datetime import getnow
 
@@ -28,9 +33,7 @@ def delete_files(session: OrmSession):
             delete_book_files(session, book)
             nb_zim_files_deleted += 1
         except Exception as exc:
-            book.events.append(
-                f"{getnow()}: error encountered while deleting files\n{exc}"
-            )
+            log_event(book, f"error encountered while deleting files\n{exc}")
             logger.exception(f"Failed to delete files for book {book.id}")
             book.needs_file_operation = False
             book.has_error = True
@@ -57,7 +60,9 @@ def get_next_book_to_delete(session: OrmSession, now: datetime.datetime) -> Book
 def delete_book_files(session: OrmSession, book: Book):
     """Delete all files for a book from filesystem."""
     inaccessible_warehouse_names = {
-        loc.warehouse.name
+        # a warehouse deleted meanwhile is identified by its ID
+        get_warehouse_name_or_none(session, warehouse_id=loc.warehouse_id)
+        or str(loc.warehouse_id)
         for loc in book.locations
         if loc.warehouse_id not in ShuttleContext.local_warehouse_paths.keys()
     }
@@ -77,22 +82,23 @@ def delete_book_files(session: OrmSession, book: Book):
         if location.status == "current" and not location.is_backup
     ]
     for location in locations:
+        location_str = get_location_full_str(session, location)
         try:
             file_path = location.full_local_path(ShuttleContext.local_warehouse_paths)
             file_path.unlink(missing_ok=True)
             logger.info(f"Deleted file for book {book.id} at {file_path}")
-            book.events.append(f"{getnow()}: deleted file at {location.full_str}")
+            log_event(book, f"deleted file at {location_str}")
             session.delete(location)
             book.locations.remove(location)
         except Exception:
             logger.exception(
-                f"Failed to delete file at {location.full_str} for book {book.id}"
+                f"Failed to delete file at {location_str} for book {book.id}"
             )
             raise
 
     # Mark book as deleted
     book.location_kind = "deleted"
     book.needs_file_operation = False
-    book.events.append(f"{getnow()}: all files deleted, book marked as deleted")
+    log_event(book, "all files deleted, book marked as deleted")
     session.flush()
     logger.info(f"Book {book.id} files have been deleted")
@@ -1,20 +1,23 @@
 import pathlib
 import urllib.parse
-from uuid import UUID
 
-from kiwixstorage import (  # pyright: ignore[reportMissingTypeStubs]
-    AuthenticationError,
-    KiwixStorage,
-)
 from sqlalchemy import select
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
+from cms_backend.db import iter_batches
 from cms_backend.db.models import Book
 from cms_backend.shuttle.context import Context as ShuttleContext
 
 
 def get_kiwix_storage_client(upload_uri: urllib.parse.ParseResult):
+    # kiwixstorage (and boto3) is slow to import and only needed when the S3 bucket
+    # of zimcheck results is configured
+    from kiwixstorage import (  # noqa: PLC0415 # pyright: ignore[reportMissingTypeStubs]
+        AuthenticationError,
+        KiwixStorage,
+    )
+
     def get_url_scheme(url: urllib.parse.ParseResult) -> str:
         if url.scheme.startswith("s3+http"):
             return "http"
@@ -58,28 +61,19 @@ def delete_zimcheck_s3_results(session: OrmSession):
     logger.info("Deleting zimcheck results from S3")
     nb_deleted, nb_failed = 0, 0
 
-    omit_book_ids: list[UUID] = []
-    while True:
-        books = session.scalars(
-            select(Book)
-            .where(
-                Book.zimcheck_result_url.is_not(None),
-                Book.zimcheck_s3_deleted.is_(False),
-                Book.location_kind.in_(["prod", "deleted"]),
-                Book.id.not_in(omit_book_ids),
-            )
-            .limit(50)
-            .order_by(Book.created_at)
-        ).all()
-
-        if not books:
-            logger.info(
-                "No more books meet criteria for zimcheck results to be deleted."
-            )
-            break
-
+    for books in iter_batches(
+        session,
+        select(Book).where(
+            Book.zimcheck_result_url.is_not(None),
+            Book.zimcheck_s3_deleted.is_(False),
+            Book.location_kind.in_(["prod", "deleted"]),
+        ),
+        created_at_column=Book.created_at,
+        id_column=Book.id,
+        batch_size=50,
+        commit_every=1,
+    ):
         for book in books:
-            omit_book_ids.append(book.id)
             try:
                 s3.delete_object(
                     book.zimcheck_result_url.split("/")[-1],  # pyright: ignore[reportOptionalMemberAccess]
@@ -92,7 +86,6 @@ def delete_zimcheck_s3_results(session: OrmSession):
             else:
                 book.zimcheck_s3_deleted = True
                 session.add(book)
-                session.commit()
                 nb_deleted += 1
 
     logger.info(f"Done deleting zimcheck files from S3: {nb_deleted=}, {nb_failed=}")
@@ -4,9 +4,13 @@ from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import logger
 from cms_backend.db.book import get_next_book_to_move_files_or_none
+from cms_backend.db.event_log import log_event
 from cms_backend.db.models import Book, BookLocation
+from cms_backend.db.reference_data import (
+    get_location_full_str,
+    get_warehouse_name_or_none,
+)
 from cms_backend.shuttle.context import Context as ShuttleContext
-from cms_backend.utils.datetime import getnow
 
 
 def move_files(session: OrmSession):
@@ -21,9 +25,7 @@ def move_files(session: OrmSession):
             move_book_files(session, book)
             nb_zim_files_moved += 1
         except Exception as exc:
-            book.events.append(
-                f"{getnow()}: error encountered while moving file\n{exc}"
-            )
+            log_event(book, f"error encountered while moving file\n{exc}")
             logger.exception(f"Failed to move file for {book.id}")
             book.has_error = True
         session.commit()
@@ -34,7 +36,9 @@ def move_files(session: OrmSession):
 
 def move_book_files(session: OrmSession, book: Book):
     inaccessible_warehouse_names = {
-        loc.warehouse.name
+        # a warehouse deleted meanwhile is identified by its ID
+        get_warehouse_name_or_none(session, warehouse_id=loc.warehouse_id)
+        or str(loc.warehouse_id)
         for loc in book.locations
         if loc.warehouse_id not in ShuttleContext.local_warehouse_paths.keys()
     }
@@ -62,16 +66,12 @@ def move_book_files(session: OrmSession, book: Book):
     target_locations.sort(key=lambda book: book.is_backup)
 
     if len(current_locations) == 0:
-        book.events.append(
-            f"{getnow()}: error encountered while moving files, no current location"
-        )
+        log_event(book, "error encountered while moving files, no current location")
         book.has_error = True
         return
 
     if len(target_locations) == 0:
-        book.events.append(
-            f"{getnow()}: ignoring move files operation, no target location set"
-        )
+        log_event(book, "ignoring move files operation, no target location set")
         book.needs_file_operation = False
         return
 
@@ -105,9 +105,10 @@ def move_book_files(session: OrmSession, book: Book):
             book.locations.remove(target_location)
             current_locations.remove(matching_current)
             logger.debug(f"Left book {book.id} at identical path {target_path}")
-            book.events.append(
-                f"{getnow()}: left book at identical location "
-                f"{target_location.full_str}"
+            log_event(
+                book,
+                f"left book at identical location "
+                f"{get_location_full_str(session, target_location)}",
             )
             continue
 
@@ -121,9 +122,11 @@ def move_book_files(session: OrmSession, book: Book):
         shutil.copy(source_path, tmp_path)
         shutil.move(tmp_path, target_path)
         logger.debug(f"Copied book {book.id} from {source_path} to {target_path}")
-        book.events.append(
-            f"{getnow()}: copied book from {source_location.full_str} to "
-            f"{target_location.full_str}"
+        log_event(
+            book,
+            f"copied book from "
+            f"{get_location_full_str(session, source_location)} to "
+            f"{get_location_full_str(session, target_location)}",
         )
         # Defer updating the book locations to "current" as this might have been
         # a file rename operation and setting this location to "current" will cause
@@ -139,8 +142,9 @@ def move_book_files(session: OrmSession, book: Book):
             )
             del_path.unlink(missing_ok=True)
             logger.debug(f"Deleted book {book.id} from {del_path}")
-            book.events.append(
-                f"{getnow()}: deleted book from {loc_to_delete.full_str}"
+            log_event(
+                book,
+                f"deleted book from {get_location_full_str(session, loc_to_delete)}",
             )
             book.locations.remove(loc_to_delete)
             session.delete(loc_to_delete)
@@ -153,7 +157,10 @@ def move_book_files(session: OrmSession, book: Book):
         )
         del_path.unlink(missing_ok=True)
         logger.debug(f"Deleted book {book.id} from {del_path}")
-        book.events.append(f"{getnow()}: deleted book from {current_location.full_str}")
+        log_event(
+            book,
+            f"deleted book from {get_location_full_str(session, current_location)}",
+        )
         book.locations.remove(current_location)
         session.delete(current_location)
 
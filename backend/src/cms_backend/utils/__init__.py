@@ -8,3 +8,11 @@ def is_valid_uuid(identifier: str) -> bool:
     except ValueError:
         return False
     return True
+
+
+def get_grapheme_length(value: str) -> int:
+    """Number of grapheme clusters (user-perceived characters) in value"""
+    # regex is slow to import and only needed when validating metadata
+    import regex  # noqa: PLC0415
+
+    return len(regex.findall(r"\X", value))
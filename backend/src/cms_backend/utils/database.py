@@ -1,8 +1,6 @@
 import os
 import subprocess
 
-from alembic import config, script
-from alembic.runtime import migration
 from werkzeug.security import generate_password_hash
 
 from cms_backend import logger
@@ -13,6 +11,10 @@ from cms_backend.roles import RoleEnum
 
 
 def check_if_schema_is_up_to_date():
+    # alembic is slow to import and only needed once at API startup
+    from alembic import config, script  # noqa: PLC0415
+    from alembic.runtime import migration  # noqa: PLC0415
+
     with Session.begin() as session:
         logger.info("Checking database schema")
         cfg = config.Config(Context.base_dir / "alembic.ini")
@@ -0,0 +1,48 @@
+"""Validation of ISO-639-3 language codes
+
+Looking codes up through `pycountry.languages.get` is costly (lock, keyword checks
+and normalization on every call, full database load on first call) while the same
+few codes are checked for every book, notification and API payload. Supported codes
+are hence computed once into a set.
+
+pycountry is slow to import and only imported once codes are checked.
+"""
+
+from collections.abc import Iterable
+from functools import cache
+from typing import Any, cast
+
+
+@cache
+def get_iso_language_codes() -> frozenset[str]:
+    """ISO-639-3 codes known to pycountry, lowercased"""
+    import pycountry  # noqa: PLC0415
+
+    # pycountry databases are not typed
+    languages = cast(Iterable[Any], pycountry.languages)
+    return frozenset(str(language.alpha_3).lower() for language in languages)
+
+
+@cache
+def get_supported_language_codes() -> frozenset[str]:
+    """ISO-639-3 codes, without disallowed ones but with custom ones, lowercased
+
+    Must be cleared (see `update_language_codes`) when these Context values change.
+    """
+    # Context validates its codes with this module
+    from cms_backend.context import Context  # noqa: PLC0415
+
+    return (
+        get_iso_language_codes()
+        - {code.lower() for code in Context.disallowed_language_codes}
+    ) | {code.lower() for code in Context.custom_language_codes}
+
+
+def is_iso_language_code(code: str) -> bool:
+    """Whether code is an ISO-639-3 language code (case insensitive)"""
+    return code.lower() in get_iso_language_codes()
+
+
+def is_supported_language_code(code: str) -> bool:
+    """Whether code is a supported language code (case insensitive)"""
+    return code.lower() in get_supported_language_codes()
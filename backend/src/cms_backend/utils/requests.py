@@ -25,19 +25,22 @@ def query_api(
     payload: dict[str, Any] | None = None,
     params: dict[str, Any] | None = None,
     timeout: int = Context.requests_timeout,
+    http_session: requests.Session | None = None,
 ) -> Response:
+    """Query an API, reusing connections of `http_session` when set"""
     req_headers: dict[str, Any] = {}
 
     req_headers.update(  # pyright: ignore[reportUnknownMemberType]
         headers if headers else {}
     )
+    client = http_session if http_session else requests
     func = {
-        "GET": requests.get,
-        "POST": requests.post,
-        "PATCH": requests.patch,
-        "DELETE": requests.delete,
-        "PUT": requests.put,
-    }.get(method.upper(), requests.get)
+        "GET": client.get,
+        "POST": client.post,
+        "PATCH": client.patch,
+        "DELETE": client.delete,
+        "PUT": client.put,
+    }.get(method.upper(), client.get)
 
     resp = None
     try:
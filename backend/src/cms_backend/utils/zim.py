@@ -15,19 +15,22 @@ def get_missing_keys(payload: dict[str, Any], *keys: str) -> list[str]:
     ]
 
 
+# see https://wiki.openzim.org/wiki/Metadata
+MANDATORY_METADATA_KEYS = (
+    "Name",
+    "Title",
+    "Creator",
+    "Publisher",
+    "Date",
+    "Description",
+    "Language",
+    "Illustration_48x48@1",
+)
+
+
 def get_missing_metadata_keys(zim_metadata: dict[str, Any]) -> list[str]:
     """Get the the list of missing metadata keys from a zim."""
-    return get_missing_keys(
-        zim_metadata,
-        "Name",
-        "Title",
-        "Creator",
-        "Publisher",
-        "Date",
-        "Description",
-        "Language",
-        "Illustration_48x48@1",
-    )
+    return get_missing_keys(zim_metadata, *MANDATORY_METADATA_KEYS)
 
 
 def convert_tags(tags_str: str) -> list[str]:
@@ -69,6 +72,61 @@ def convert_tags(tags_str: str) -> list[str]:
     return tags_list
 
 
+# Keys of zimcheck JSON output looked for in raw logs (quotes might be escaped). Log
+# levels, by far the most frequent, are captured with the key; other values are only
+# matched where their key has been found.
+_ZIMCHECK_LOG_KEY_REGEX = re.compile(
+    r'"(?:[Ll][Ee][Vv][Ee][Ll][\\]*"\s*:\s*[\\]*["\']?([A-Za-z]+)'
+    r'|(zimcheck_version|status|checks)[\\]*"\s*:)'
+)
+_ZIMCHECK_LOG_VERSION_REGEX = re.compile(r'\s*[\\]*"([^"\\]+)[\\]*"')
+_ZIMCHECK_LOG_STATUS_REGEX = re.compile(r'\s*([\\]*"?(?:true|false|[^,}]+)[\\]*"?)')
+_ZIMCHECK_LOG_CHECKS_REGEX = re.compile(r"\s*\[(.*?)\](?=[,\}]|$)", re.DOTALL)
+
+
+def parse_zimcheck_log(log: str, *, retcode: int | None) -> ZimcheckSummarySchema:
+    """Summarize zimcheck JSON output which could not be decoded (raw logs)
+
+    Logs of big ZIMs are huge, they are hence scanned only once.
+    """
+    zimcheck_version: str | None = None
+    status: bool | None = None
+    checks: list[str] | None = None
+    warning_count = 0
+    error_count = 0
+    for key_match in _ZIMCHECK_LOG_KEY_REGEX.finditer(log):
+        level, key = key_match.groups()
+        if level is not None:
+            level = level.upper()
+            if level == "ERROR":
+                error_count += 1
+            elif level == "WARNING":
+                warning_count += 1
+            continue
+
+        position = key_match.end()
+        if key == "zimcheck_version" and zimcheck_version is None:
+            if version_match := _ZIMCHECK_LOG_VERSION_REGEX.match(log, position):
+                zimcheck_version = version_match.group(1)
+        elif key == "status" and status is None:
+            if status_match := _ZIMCHECK_LOG_STATUS_REGEX.match(log, position):
+                status = parse_bool(status_match.group(1))
+        elif key == "checks" and checks is None:
+            if checks_match := _ZIMCHECK_LOG_CHECKS_REGEX.match(log, position):
+                checks = [
+                    check.strip().strip('"') for check in checks_match[1].split(",")
+                ]
+
+    return ZimcheckSummarySchema(
+        zimcheck_version=zimcheck_version,
+        status=status,
+        error_count=error_count,
+        warning_count=warning_count,
+        checks=checks,
+        retcode=retcode,
+    )
+
+
 def parse_zimcheck_result(zimcheck: dict[str, Any]) -> ZimcheckSummarySchema:
     """Transform zimcheck result into a summary entry."""
     # Zimcheck results can either have a "result" or a "log" entry and not both.
@@ -95,47 +153,7 @@ def parse_zimcheck_result(zimcheck: dict[str, Any]) -> ZimcheckSummarySchema:
         )
     elif zimcheck.get("log"):
         try:
-            zimcheck_version_match = re.search(
-                r'[\\]*"zimcheck_version[\\]*"\s*:\s*[\\]*"([^"\\]+)[\\]*"',
-                zimcheck["log"],
-            )
-            status_match = re.search(
-                r'[\\]*"status[\\]*"\s*:\s*([\\]*"?(?:true|false|[^,}]+)[\\]*"?)',
-                zimcheck["log"],
-            )
-            checks_match = re.search(
-                r'[\\]*"checks[\\]*"\s*:\s*\[(.*?)\](?=[,\}]|$)',
-                zimcheck["log"],
-                re.DOTALL,
-            )
-
-            warning_count = 0
-            error_count = 0
-            for match in re.findall(
-                r'[\\]*"level[\\]*"\s*:\s*[\\]*["\']?([A-Z]+)[\\]*["\']?',
-                zimcheck["log"],
-                re.IGNORECASE,
-            ):
-                level = match.upper()
-                if level == "ERROR":
-                    error_count += 1
-                elif level == "WARNING":
-                    warning_count += 1
-
-            return ZimcheckSummarySchema(
-                zimcheck_version=zimcheck_version_match.group(1)
-                if zimcheck_version_match
-                else None,
-                status=parse_bool(status_match.group(1)) if status_match else None,
-                error_count=error_count,
-                warning_count=warning_count,
-                checks=[
-                    check.strip().strip('"') for check in checks_match[1].split(",")
-                ]
-                if checks_match
-                else None,
-                retcode=zimcheck["retcode"],
-            )
+            return parse_zimcheck_log(zimcheck["log"], retcode=zimcheck["retcode"])
         except Exception:
             logger.exception("encountered error while parsing zimcheck logs")
     return ZimcheckSummarySchema()
@@ -0,0 +1,150 @@
+"""Download and cache of zimcheck results
+
+Zimcheck results are JSON files uploaded to S3 by the Zimfarm. Downloading them
+one by one while processing notifications keeps a database transaction open during
+each network call. Results of the pending notifications are hence prefetched
+concurrently, through a pooled HTTP session, and cached by URL so that processing
+(and retries) do not download them again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+from time import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cms_backend import logger
+from cms_backend.context import Context
+from cms_backend.utils.requests import Response, query_api
+
+# results are only kept in memory when no cache folder is configured, keep a bounded
+# number of them since zimcheck results can be quite big
+MEMORY_CACHE_MAX_ENTRIES = 64
+
+
+class ZimcheckFetcher:
+    """Fetch zimcheck results, keeping successful downloads in a cache keyed by URL"""
+
+    def __init__(
+        self,
+        *,
+        cache_path: Path | None,
+        cache_ttl: timedelta,
+        concurrency: int,
+        timeout: int,
+    ) -> None:
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
+        self.concurrency = max(concurrency, 1)
+        self.timeout = timeout
+        self.http_session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.concurrency, pool_maxsize=self.concurrency
+        )
+        self.http_session.mount("http://", adapter)
+        self.http_session.mount("https://", adapter)
+        self._memory: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cache_file(self, url: str) -> Path:
+        if self.cache_path is None:
+            raise ValueError("Zimcheck results cache path is not set")
+        return self.cache_path / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get_cached(self, url: str) -> dict[str, Any] | None:
+        """Zimcheck result of `url` if it is cached and not expired, else None"""
+        expires_before = time() - self.cache_ttl.total_seconds()
+        if self.cache_path is None:
+            with self._lock:
+                entry = self._memory.get(url)
+                if entry is None:
+                    return None
+                if entry[0] < expires_before:
+                    del self._memory[url]
+                    return None
+                return entry[1]
+
+        cache_file = self._cache_file(url)
+        try:
+            if cache_file.stat().st_mtime < expires_before:
+                cache_file.unlink(missing_ok=True)
+                return None
+            return json.loads(cache_file.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable cached zimcheck result of {url}")
+            return None
+
+    def _store(self, url: str, result: dict[str, Any]):
+        if self.cache_path is None:
+            with self._lock:
+                self._memory[url] = (time(), result)
+                self._memory.move_to_end(url)
+                while len(self._memory) > MEMORY_CACHE_MAX_ENTRIES:
+                    self._memory.popitem(last=False)
+            return
+
+        cache_file = self._cache_file(url)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so that concurrent readers never see a
+        # partially written result
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}")
+        tmp_file.write_text(json.dumps(result))
+        tmp_file.replace(cache_file)
+
+    def fetch(self, url: str) -> Response:
+        """Zimcheck result of `url`, from cache or downloaded (and then cached)"""
+        if (result := self.get_cached(url)) is not None:
+            return Response(status_code=HTTPStatus.OK, success=True, json=result)
+
+        response = query_api(url, timeout=self.timeout, http_session=self.http_session)
+        if response.success and response.json:
+            try:
+                self._store(url, response.json)
+            except OSError:
+                logger.exception(f"Failed to cache zimcheck result of {url}")
+        return response
+
+    def prefetch(self, urls: Iterable[str]) -> int:
+        """Concurrently download zimcheck results not yet cached
+
+        Returns the number of results successfully downloaded.
+        """
+        missing_urls = {url for url in urls if self.get_cached(url) is None}
+        if not missing_urls:
+            return 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            responses = list(executor.map(self.fetch, missing_urls))
+        return sum(1 for response in responses if response.success)
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_path is not None:
+            for cache_file in self.cache_path.glob("*.json"):
+                cache_file.unlink(missing_ok=True)
+
+
+zimcheck_fetcher = ZimcheckFetcher(
+    cache_path=Context.zimcheck_cache_path,
+    cache_ttl=Context.zimcheck_cache_ttl,
+    concurrency=Context.zimcheck_fetch_concurrency,
+    timeout=Context.requests_timeout,
+)
+
+
+def fetch_zimcheck_result(url: str) -> Response:
+    """Zimcheck result of `url`, from cache or downloaded"""
+    return zimcheck_fetcher.fetch(url)
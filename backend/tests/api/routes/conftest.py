@@ -2,9 +2,11 @@ from collections.abc import Generator
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.api.main import app
+from cms_backend.context import Context
 from cms_backend.db import gen_dbsession, gen_manual_dbsession
 
 
@@ -18,3 +20,15 @@ def client(dbsession: OrmSession) -> TestClient:
     app.dependency_overrides[gen_manual_dbsession] = test_dbsession
 
     return TestClient(app=app)
+
+
+@pytest.fixture
+def other_process_engine() -> Generator[Engine]:
+    """Engine writing to the DB like the mill or the shuttle, in another process
+
+    Statements executed on its connections do not go through the sessions of the API
+    process, hence do not invalidate its cached responses.
+    """
+    engine = create_engine(Context.database_url)
+    yield engine
+    engine.dispose()
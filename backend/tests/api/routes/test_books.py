@@ -1,4 +1,5 @@
 import datetime
+import json
 from collections.abc import Callable
 from http import HTTPStatus
 from pathlib import Path
@@ -7,12 +8,14 @@ from uuid import UUID, uuid4
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, update
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.api.token import generate_access_token
 from cms_backend.context import Context, parse_bool
 from cms_backend.db.book import update_book
 from cms_backend.db.book_actions import get_book_promotion_actions
+from cms_backend.db.event_log import get_all_events, log_event
 from cms_backend.db.models import (
     Account,
     Book,
@@ -24,6 +27,7 @@ from cms_backend.db.models import (
 )
 from cms_backend.roles import RoleEnum
 from cms_backend.schemas.models import BaseBookPromotionAction, BookUpdateSchema
+from cms_backend.schemas.orms import BookLightSchema
 from cms_backend.utils.datetime import getnow
 
 
@@ -79,6 +83,92 @@ def test_get_books_with_data(
         assert "events" not in item
 
 
+def test_get_books_serialized_like_schema(
+    client: TestClient,
+    create_book: Callable[..., Book],
+    access_token: str,
+):
+    """Test get books endpoint renders rows as the light schema would"""
+    book = create_book(
+        created_at=datetime.datetime(2025, 1, 2, 3, 4, 5, 678901),
+        zim_metadata={"Scraper": "mwoffliner 1.0"},
+    )
+
+    response = client.get(
+        "/v1/books", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["items"] == [
+        BookLightSchema.model_validate(
+            {
+                "id": book.id,
+                "title_id": None,
+                "title_name": None,
+                "location_kind": "quarantine",
+                "needs_processing": book.needs_processing,
+                "has_error": book.has_error,
+                "needs_file_operation": book.needs_file_operation,
+                "deletion_date": None,
+                "created_at": book.created_at,
+                "name": book.name,
+                "date": book.date,
+                "flavour": book.flavour,
+                "issues": book.issues,
+                "offliner": "mwoffliner 1.0",
+            }
+        ).model_dump(mode="json")
+    ]
+    assert response.json()["items"][0]["created_at"] == "2025-01-02T03:04:05Z"
+
+
+def test_get_books_fields(
+    client: TestClient,
+    create_book: Callable[..., Book],
+    access_token: str,
+):
+    """Test get books endpoint only returns requested fields"""
+    book = create_book(name="wikipedia_en_all")
+
+    response = client.get(
+        "/v1/books?fields=id&fields=name",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["items"] == [
+        {"id": str(book.id), "name": "wikipedia_en_all"}
+    ]
+
+    response = client.get(
+        "/v1/books?fields=zim_metadata",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_CONTENT
+
+
+def test_export_books(
+    client: TestClient,
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    access_token: str,
+):
+    """Test export books endpoint streams all matching books as NDJSON"""
+    books = [create_book(name=f"wikipedia_en_{i}") for i in range(3)]
+    create_book(name="wiktionary_en_all")
+    # the export reads books in its own session, once the request is handled
+    dbsession.commit()
+
+    response = client.get(
+        "/v1/books/export?name=wikipedia&fields=id&fields=name",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"id": str(book.id), "name": book.name}
+        for book in sorted(books, key=lambda book: book.created_at, reverse=True)
+    ]
+
+
 def test_get_books_pagination(
     client: TestClient,
     create_book: Callable[..., Book],
@@ -395,6 +485,51 @@ def test_get_book_languages(
     assert response.json() == {"languages": ["deu", "eng", "fra", "spa"]}
 
 
+def test_get_book_languages_cache_invalidated_on_book_change(
+    client: TestClient,
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    access_token: str,
+):
+    """Test cached languages are rendered again once a book is modified"""
+    book = create_book(zim_metadata={"Language": "eng"})
+    book.location_kind = "prod"
+    dbsession.flush()
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get("/v1/books/languages", headers=headers)
+    assert response.json() == {"languages": ["eng"]}
+    assert (
+        client.get("/v1/books/languages", headers=headers).headers["ETag"]
+        == response.headers["ETag"]
+    )
+
+    book.zim_metadata = {"Language": "fra"}
+    dbsession.flush()
+
+    response = client.get("/v1/books/languages", headers=headers)
+    assert response.json() == {"languages": ["fra"]}
+
+
+@pytest.mark.usefixtures("unavailable_response_cache")
+def test_get_book_languages_rendered_when_cache_is_unavailable(
+    client: TestClient,
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    access_token: str,
+):
+    """Test languages are still rendered when the response cache fails"""
+    book = create_book(zim_metadata={"Language": "eng"})
+    book.location_kind = "prod"
+    dbsession.flush()
+
+    response = client.get(
+        "/v1/books/languages", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {"languages": ["eng"]}
+
+
 def test_get_book_flavours(
     dbsession: OrmSession,
     client: TestClient,
@@ -418,6 +553,32 @@ def test_get_book_flavours(
     assert response_doc["meta"]["count"] == 3
 
 
+def test_get_book_flavours_cache_invalidated_on_title_flavour_change(
+    dbsession: OrmSession,
+    client: TestClient,
+    create_title: Callable[..., Title],
+    access_token: str,
+):
+    """Test cached flavours are rendered again once a title flavour is created"""
+    title = create_title()
+    tf = TitleFlavour(flavour="maxi", recipe_id=uuid4())
+    tf.title = title
+    dbsession.add(tf)
+    dbsession.flush()
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get("/v1/books/flavours", headers=headers)
+    assert response.json()["items"] == ["maxi"]
+
+    tf = TitleFlavour(flavour="nopic", recipe_id=uuid4())
+    tf.title = title
+    dbsession.add(tf)
+    dbsession.flush()
+
+    response = client.get("/v1/books/flavours", headers=headers)
+    assert response.json()["items"] == ["maxi", "nopic"]
+
+
 def test_get_book_flavours_filter_by_title_id(
     dbsession: OrmSession,
     client: TestClient,
@@ -448,6 +609,7 @@ def test_get_book_flavours_filter_by_title_id(
 
 def test_get_book_by_id(
     client: TestClient,
+    dbsession: OrmSession,
     book: Book,
     access_token: str,
 ):
@@ -474,10 +636,76 @@ def test_get_book_by_id(
     assert "zim_metadata" in response_doc
     assert response_doc["zim_metadata"] == book.zim_metadata
     assert "events" in response_doc
-    assert response_doc["events"] == book.events
+    assert response_doc["events"] == get_all_events(dbsession, book)
     # Note: producer fields are no longer part of the Book model
 
 
+def test_get_book_by_id_sees_changes_of_other_processes(
+    client: TestClient,
+    dbsession: OrmSession,
+    book: Book,
+    access_token: str,
+    other_process_engine: Engine,
+):
+    """Test a book moved by another process is not served from the cache"""
+    dbsession.commit()
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = client.get(f"/v1/books/{book.id}", headers=headers)
+    assert response.json()["location_kind"] == "quarantine"
+
+    with other_process_engine.begin() as connection:
+        connection.execute(
+            update(Book).where(Book.id == book.id).values(location_kind="prod")
+        )
+    # each request has its own session in production
+    dbsession.expire_all()
+
+    response = client.get(f"/v1/books/{book.id}", headers=headers)
+    assert response.json()["location_kind"] == "prod"
+
+
+def test_get_book_events(
+    client: TestClient,
+    dbsession: OrmSession,
+    book: Book,
+    access_token: str,
+):
+    """Test get book events endpoint returns a page of events in order"""
+    for i in range(5):
+        log_event(book, f"event {i}")
+    dbsession.flush()
+
+    response = client.get(
+        f"/v1/books/{book.id}/events?skip=1&limit=2",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    response_doc = response.json()
+    assert response_doc["meta"]["count"] == 5
+    assert [item.split(": ", 1)[1] for item in response_doc["items"]] == [
+        "event 1",
+        "event 2",
+    ]
+
+
+def test_get_book_by_id_includes_illustration_in_zim_metadata(
+    client: TestClient,
+    create_book: Callable[..., Book],
+    access_token: str,
+):
+    """Test book illustration, stored apart, is part of the returned ZIM metadata"""
+    book = create_book(zim_metadata={"Name": "test", "Illustration_48x48@1": "AAAA"})
+
+    response = client.get(
+        f"/v1/books/{book.id}", headers={"Authorization": f"Bearer {access_token}"}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["zim_metadata"] == {
+        "Name": "test",
+        "Illustration_48x48@1": "AAAA",
+    }
+
+
 def test_get_book_by_id_not_found(
     client: TestClient,
     book: Book,  # noqa: ARG001 - needed for conftest
@@ -776,6 +1004,60 @@ def test_backup_book_required_permissions(
     assert response.status_code == expected_status_code
 
 
+@pytest.mark.parametrize(
+    "permission,expected_status_code",
+    [
+        pytest.param(RoleEnum.GLOBAL_EDITOR, HTTPStatus.OK, id="global-editor"),
+        pytest.param(RoleEnum.VIEWER, HTTPStatus.UNAUTHORIZED, id="viewer"),
+    ],
+)
+def test_delete_books_required_permissions(
+    client: TestClient,
+    create_account: Callable[..., Account],
+    create_book: Callable[..., Book],
+    permission: RoleEnum,
+    expected_status_code: HTTPStatus,
+):
+    """Test deleting many books with different roles"""
+
+    account = create_account(permission=permission)
+    access_token = generate_access_token(
+        account_id=str(account.id), issue_time=getnow()
+    )
+    book = create_book(name="test_en_all", date="2024-01")
+    unknown_id = uuid4()
+
+    response = client.post(
+        "/v1/books/bulk/delete",
+        json={"book_ids": [str(book.id), str(unknown_id)]},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == expected_status_code
+    if expected_status_code == HTTPStatus.OK:
+        assert response.json() == [
+            {"id": str(book.id), "success": True, "message": None},
+            {
+                "id": str(unknown_id),
+                "success": False,
+                "message": f"Book {unknown_id} does not meet criteria to be marked "
+                "as deleted or is not accessible to you.",
+            },
+        ]
+
+
+def test_delete_books_requires_book_ids(
+    client: TestClient,
+    access_token: str,
+):
+    """Test bulk actions need at least one book"""
+    response = client.post(
+        "/v1/books/bulk/delete",
+        json={"book_ids": []},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_CONTENT
+
+
 @pytest.mark.parametrize(
     "permission,expected_status_code",
     [
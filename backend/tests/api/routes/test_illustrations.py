@@ -0,0 +1,42 @@
+import base64
+from collections.abc import Callable
+from http import HTTPStatus
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db.illustration import get_illustration_id
+from cms_backend.db.models import Title
+
+PNG_CONTENT = b"\x89PNG\r\n\x1a\nnot-really-a-png"
+
+
+def test_get_illustration(
+    client: TestClient,
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+):
+    title = create_title(illustration_48x48_at_1=base64.b64encode(PNG_CONTENT).decode())
+    dbsession.flush()
+
+    response = client.get(f"/v1/illustrations/{title.illustration_48x48_at_1_id}")
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "image/png"
+    assert response.content == PNG_CONTENT
+    assert response.headers["ETag"] == f'"{title.illustration_48x48_at_1_id}"'
+    assert "immutable" in response.headers["Cache-Control"]
+
+
+def test_get_illustration_not_modified(client: TestClient):
+    illustration_id = get_illustration_id("AAAA")
+    response = client.get(
+        f"/v1/illustrations/{illustration_id}",
+        headers={"If-None-Match": f'"{illustration_id}"'},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+
+
+def test_get_illustration_not_found(client: TestClient):
+    response = client.get(f"/v1/illustrations/{get_illustration_id('AAAA')}")
+    assert response.status_code == HTTPStatus.NOT_FOUND
@@ -1,17 +1,25 @@
+import asyncio
 import math
+import time
 from collections.abc import Callable
 from datetime import timedelta
 from http import HTTPStatus
 from pathlib import Path
+from typing import Any
+from unittest.mock import patch
 from uuid import uuid4
 from xml.etree import ElementTree as ET
 
+import httpx
 import pytest
 import xxhash
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session as OrmSession
 
+from cms_backend.api.main import app
+from cms_backend.api.routes.utils import build_library_xml
 from cms_backend.context import Context
+from cms_backend.db.collection import get_latest_books_for_collection
 from cms_backend.db.models import (
     Book,
     BookLocation,
@@ -20,6 +28,8 @@ from cms_backend.db.models import (
     Title,
     Warehouse,
 )
+from cms_backend.db.query_budget import query_budget
+from cms_backend.db.staging import get_staging_books_library_data
 from cms_backend.utils.datetime import getnow
 
 
@@ -1043,3 +1053,97 @@ def test_get_prod_and_staging_catalog_xml(
         == "https://download.staging.acme.org/wiki_2025-01.zim.meta4"
     )
     assert books[1].get("path") == "/data/dev/wiki_2025-01.zim"
+
+
+@pytest.mark.parametrize("nb_books", [1, 5])
+def test_catalogs_load_book_illustrations_at_once(
+    nb_books: int,
+    dbsession: OrmSession,
+    create_collection: Callable[..., Collection],
+    create_title: Callable[..., Title],
+    create_book: Callable[..., Book],
+    create_book_location: Callable[..., BookLocation],
+    warehouse: Warehouse,
+):
+    """Illustrations of books of titles without one are not loaded one by one"""
+    collection = create_collection(warehouse=warehouse)
+    title = create_title(name="wiki")
+    _add_title_to_collection(dbsession, collection, title, "wikipedia")
+    for index in range(nb_books):
+        for location_kind, warehouse_id, path in (
+            ("prod", warehouse.id, "wikipedia"),
+            ("staging", Context.staging_warehouse_id, Context.staging_base_path),
+        ):
+            book = create_book(
+                zim_metadata={
+                    "Name": "wiki",
+                    "Date": "2025-01-01",
+                    "Illustration_48x48@1": f"illustration{index}",
+                },
+                flavour=f"flavour{index}",
+            )
+            book.title = title
+            book.location_kind = location_kind
+            create_book_location(
+                book=book,
+                warehouse_id=warehouse_id,
+                path=path,
+                status="current",
+                filename=f"wiki_{index}.zim",
+            )
+    dbsession.flush()
+    collection_id = collection.id
+    dbsession.expire_all()
+
+    with query_budget(
+        dbsession, label="staging catalog", max_queries=1, raise_exceptions=True
+    ):
+        staging_xml = build_library_xml(
+            get_staging_books_library_data(dbsession), illustrations_base_url=None
+        )
+    with query_budget(
+        dbsession, label="collection catalog", max_queries=1, raise_exceptions=True
+    ):
+        collection_xml = build_library_xml(
+            get_latest_books_for_collection(dbsession, collection_id),
+            illustrations_base_url=None,
+        )
+
+    for xml in (staging_xml, collection_xml):
+        assert sorted(
+            book.get("favicon", "") for book in ET.fromstring(xml).findall("book")
+        ) == [f"illustration{index}" for index in range(nb_books)]
+
+
+@pytest.mark.asyncio
+async def test_staging_catalog_render_does_not_block_other_requests(
+    client: TestClient,  # noqa: ARG001 - overrides the DB session of the app
+):
+    """A slow catalog render runs in the threadpool, not on the event loop"""
+    render_duration = 0.5
+
+    def slow_build_library_xml(*args: Any, **kwargs: Any) -> str:
+        time.sleep(render_duration)
+        return build_library_xml(*args, **kwargs)
+
+    async def get_healthcheck_duration(async_client: httpx.AsyncClient) -> float:
+        started_at = time.monotonic()
+        # let the catalog request start first
+        await asyncio.sleep(render_duration / 5)
+        response = await async_client.get("/v1/healthcheck")
+        assert response.status_code == HTTPStatus.OK
+        return time.monotonic() - started_at
+
+    with patch(
+        "cms_backend.api.routes.staging.build_library_xml", slow_build_library_xml
+    ):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as async_client:
+            catalog_response, healthcheck_duration = await asyncio.gather(
+                async_client.get("/v1/staging/catalog.xml"),
+                get_healthcheck_duration(async_client),
+            )
+
+    assert catalog_response.status_code == HTTPStatus.OK
+    assert healthcheck_duration < render_duration * 0.6
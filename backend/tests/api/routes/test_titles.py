@@ -1,4 +1,5 @@
 import datetime
+import json
 from collections.abc import Callable
 from http import HTTPStatus
 from pathlib import Path
@@ -6,7 +7,7 @@ from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import select
+from sqlalchemy import Engine, select, update
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.api.token import generate_access_token
@@ -41,6 +42,26 @@ def test_get_titles_empty(client: TestClient):
     assert data["items"] == []
 
 
+def test_get_titles_fields(
+    client: TestClient,
+    create_title: Callable[..., Title],
+    access_token: str,
+):
+    """Test get titles endpoint only returns requested fields"""
+    create_title(name="wikipedia_en_all")
+    create_title(name="wikipedia_fr_all")
+
+    response = client.get(
+        "/v1/titles?fields=archived",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    response_doc = response.json()
+    # titles with the same values are not merged
+    assert response_doc["meta"]["count"] == 2
+    assert response_doc["items"] == [{"archived": False}, {"archived": False}]
+
+
 def test_get_titles_only_rotten_titles(
     client: TestClient, create_title: Callable[..., Title], access_token: str
 ):
@@ -114,6 +135,33 @@ def test_get_titles(
     assert data["items"][0]["name"] == "wikipedia_fr_all"
 
 
+def test_export_titles(
+    client: TestClient,
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    access_token: str,
+):
+    """Test export titles endpoint streams all matching titles as NDJSON"""
+    for name in ("wikipedia_fr_all", "wikipedia_en_all", "wikibooks_en_all"):
+        create_title(name=name)
+    # the export reads titles in its own session, once the request is handled
+    dbsession.commit()
+
+    response = client.get(
+        "/v1/titles/export?name=wikipedia&fields=name",
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"name": "wikipedia_en_all"},
+        {"name": "wikipedia_fr_all"},
+    ]
+
+    response = client.get("/v1/titles/export?archived=true")
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
 @pytest.mark.parametrize(
     "permission,expected_status_code",
     [
@@ -151,6 +199,42 @@ def test_create_title_required_permissions(
     assert response.status_code == expected_status_code
 
 
+def test_upsert_titles(
+    client: TestClient,
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    access_token: str,
+):
+    """Test creating and updating many titles at once"""
+    existing_title = create_title(name="wikipedia_en_all")
+
+    response = client.put(
+        "/v1/titles/bulk",
+        json=[
+            {"name": "wikipedia_en_all", "description": "Updated"},
+            {"name": "wikipedia_fr_all", "title": "Wikipédia"},
+        ],
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.OK
+    data = response.json()
+    assert data["updated_ids"] == [str(existing_title.id)]
+    created_title = dbsession.scalars(
+        select(Title).where(Title.name == "wikipedia_fr_all")
+    ).one()
+    assert data["created_ids"] == [str(created_title.id)]
+    assert created_title.title == "Wikipédia"
+    dbsession.refresh(existing_title)
+    assert existing_title.description == "Updated"
+
+    response = client.put(
+        "/v1/titles/bulk",
+        json=[],
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_CONTENT
+
+
 def test_create_title_required_fields_only(
     client: TestClient,
     dbsession: OrmSession,
@@ -392,6 +476,78 @@ def test_get_title_by_id(
     assert len(data["books"]) == 0
 
 
+def test_get_title_etag(
+    client: TestClient,
+    create_title: Callable[..., Title],
+    access_token: str,
+):
+    """Test a title is not sent again to a client which already has it"""
+    title = create_title(name="wikipedia_en_test")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get(f"/v1/titles/{title.id}", headers=headers)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.headers["ETag"]
+
+    response = client.get(
+        f"/v1/titles/{title.id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+def test_get_title_cache_invalidated_on_update(
+    client: TestClient,
+    create_title: Callable[..., Title],
+    access_token: str,
+):
+    """Test a cached title is rendered again once updated"""
+    title = create_title(name="wikipedia_en_test")
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    response = client.get(f"/v1/titles/{title.id}", headers=headers)
+    etag = response.headers["ETag"]
+    assert response.json()["maturity"] == "unstable"
+
+    response = client.patch(
+        f"/v1/titles/{title.id}", json={"maturity": "stable"}, headers=headers
+    )
+    assert response.status_code == HTTPStatus.OK
+
+    response = client.get(
+        f"/v1/titles/{title.id}", headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["ETag"] != etag
+    assert response.json()["maturity"] == "stable"
+
+
+def test_get_title_by_id_sees_changes_of_other_processes(
+    client: TestClient,
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    access_token: str,
+    other_process_engine: Engine,
+):
+    """Test a title modified by another process is not served from the cache"""
+    title = create_title(name="wikipedia_en_test")
+    dbsession.commit()
+    headers = {"Authorization": f"Bearer {access_token}"}
+    response = client.get(f"/v1/titles/{title.id}", headers=headers)
+    assert response.json()["maturity"] != "robust"
+
+    with other_process_engine.begin() as connection:
+        connection.execute(
+            update(Title).where(Title.id == title.id).values(maturity="robust")
+        )
+    # each request has its own session in production
+    dbsession.expire_all()
+
+    response = client.get(f"/v1/titles/{title.id}", headers=headers)
+    assert response.json()["maturity"] == "robust"
+
+
 def test_get_title_by_id_with_books(
     client: TestClient,
     dbsession: OrmSession,
@@ -2,7 +2,7 @@ from collections.abc import Callable
 from datetime import timedelta
 from http import HTTPStatus
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import pytest
 from dateutil.parser import isoparse
@@ -120,6 +120,55 @@ def test_create_zimfarm_notification_is_idempotent(
         assert key in response_doc["content"]
 
 
+def test_create_zimfarm_notifications_bulk(
+    client: TestClient,
+    zimfarm_notification: ZimfarmNotification,
+    access_token: str,
+):
+    """Test bulk create zimfarm_notification endpoint returns IDs of new ones"""
+    new_ids = [str(uuid4()) for _ in range(3)]
+    response = client.post(
+        "/v1/zimfarm-notifications/bulk",
+        json=[
+            {"id": str(zimfarm_notification.id), "foo": "bar"},
+            *({"id": new_id, "foo": "baz"} for new_id in new_ids),
+        ],
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.ACCEPTED
+    assert sorted(response.json()["created_ids"]) == sorted(new_ids)
+
+    for new_id in new_ids:
+        response = client.get(f"/v1/zimfarm-notifications/{new_id}")
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["content"] == {"foo": "baz"}
+
+
+@pytest.mark.parametrize(
+    "nb_notifications",
+    [pytest.param(0, id="empty"), pytest.param(1001, id="too-many")],
+)
+def test_create_zimfarm_notifications_bulk_size(
+    client: TestClient,
+    access_token: str,
+    nb_notifications: int,
+):
+    """Test bulk create zimfarm_notification endpoint rejects invalid sizes"""
+    response = client.post(
+        "/v1/zimfarm-notifications/bulk",
+        json=[{"id": str(uuid4())} for _ in range(nb_notifications)],
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_CONTENT
+
+
+def test_create_zimfarm_notifications_bulk_unauthorized(client: TestClient):
+    response = client.post(
+        "/v1/zimfarm-notifications/bulk", json=[{"id": str(uuid4())}]
+    )
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
 def test_get_zimfarm_notifications_empty(client: TestClient):
     """Test get zimfarm_notifications endpoint with no notifications"""
 
@@ -6,7 +6,14 @@ from uuid import UUID
 import jwt
 import pytest
 
-from cms_backend.api.token import OAuthTokenDecoder
+from cms_backend.api.context import Context
+from cms_backend.api.token import (
+    JWTClaims,
+    LocalTokenDecoder,
+    OAuthTokenDecoder,
+    TokenClaimsCache,
+    TokenDecoderChain,
+)
 from cms_backend.utils.datetime import getnow
 
 TEST_ISSUER = "https://foo.acme.org"
@@ -313,3 +320,72 @@ def test_verify_client_access_token_invalid_client_id(
 
         with pytest.raises(ValueError, match="Oauth client ID does not match"):
             decoder.decode(test_token)
+
+
+def test_token_claims_cache_evicts_least_recently_used():
+    cache = TokenClaimsCache(max_size=2, ttl=60)
+    claims = JWTClaims(
+        iss=TEST_ISSUER,
+        exp=getnow() + datetime.timedelta(hours=1),
+        iat=getnow(),
+        subject=UUID(int=0),
+    )
+    cache.set("token1", claims)
+    cache.set("token2", claims)
+    assert cache.get("token1") == claims
+    cache.set("token3", claims)
+    assert cache.get("token1") == claims
+    assert cache.get("token2") is None
+    assert cache.get("token3") == claims
+
+
+def test_token_claims_cache_capped_at_token_expiry():
+    cache = TokenClaimsCache(max_size=2, ttl=60)
+    cache.set(
+        "expired",
+        JWTClaims(
+            iss=TEST_ISSUER,
+            exp=getnow() - datetime.timedelta(seconds=1),
+            iat=getnow() - datetime.timedelta(hours=1),
+            subject=UUID(int=0),
+        ),
+    )
+    assert cache.get("expired") is None
+
+
+def test_token_decoder_chain_verifies_token_once(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr("cms_backend.api.context.Context.auth_modes", ["local"])
+    decoder = LocalTokenDecoder(secret="test-secret-of-at-least-32-bytes!")
+    chain = TokenDecoderChain(decoders=[decoder])
+    now = getnow()
+    token = jwt.encode(  # pyright: ignore[reportUnknownMemberType]
+        {
+            "iss": Context.jwt_token_issuer,
+            "exp": (now + datetime.timedelta(hours=1)).timestamp(),
+            "iat": now.timestamp(),
+            "subject": str(UUID(int=0)),
+        },
+        key="test-secret-of-at-least-32-bytes!",
+        algorithm="HS256",
+    )
+
+    with patch.object(decoder, "decode", wraps=decoder.decode) as mock_decode:
+        assert chain.decode(token).sub == UUID(int=0)
+        assert chain.decode(token).sub == UUID(int=0)
+        assert mock_decode.call_count == 1
+
+
+def test_token_decoder_chain_does_not_cache_invalid_token(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr("cms_backend.api.context.Context.auth_modes", ["local"])
+    chain = TokenDecoderChain(
+        decoders=[LocalTokenDecoder(secret="test-secret-of-at-least-32-bytes!")]
+    )
+    token = create_test_session_jwt_token(issuer=Context.jwt_token_issuer)
+
+    for _ in range(2):
+        with pytest.raises(jwt.InvalidSignatureError):
+            chain.decode(token)
@@ -2,6 +2,7 @@ from collections.abc import Callable, Generator
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from unittest.mock import MagicMock
 from uuid import UUID, uuid4
 
 import pytest
@@ -12,6 +13,10 @@ from werkzeug.security import generate_password_hash
 from cms_backend.api.token import generate_access_token
 from cms_backend.context import Context
 from cms_backend.db import Session
+from cms_backend.db.illustration import (
+    set_book_zim_metadata,
+    set_illustration_48x48_at_1,
+)
 from cms_backend.db.models import (
     Account,
     Base,
@@ -28,6 +33,11 @@ from cms_backend.db.models import (
     Warehouse,
     ZimfarmNotification,
 )
+from cms_backend.db.reference_data import invalidate_reference_data
+from cms_backend.db.response_cache import (
+    MemoryResponseCacheStore,
+    clear_cached_responses,
+)
 from cms_backend.roles import RoleEnum
 from cms_backend.utils.datetime import getnow
 
@@ -39,11 +49,33 @@ def dbsession() -> Generator[OrmSession]:
     engine = session.get_bind()
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    # Cached reference data is about records of the previous test
+    invalidate_reference_data()
+    clear_cached_responses()
     yield session
     session.rollback()
     session.close()
 
 
+@pytest.fixture
+def unavailable_response_cache(
+    dbsession: OrmSession,  # noqa: ARG001 # cache is cleared when session is set up
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Make every operation of the response cache fail"""
+    store = MagicMock(spec=MemoryResponseCacheStore)
+    for method in ("get", "set", "get_generations", "bump_generations", "clear"):
+        getattr(store, method).side_effect = ConnectionError(
+            "response cache is unavailable"
+        )
+    monkeypatch.setattr(
+        "cms_backend.db.response_cache.get_response_cache", lambda: store
+    )
+    monkeypatch.setattr(
+        "cms_backend.api.routes.models.get_response_cache", lambda: store
+    )
+
+
 @pytest.fixture
 def faker(faker: Faker) -> Faker:
     """Sets up faker to generate random data for testing."""
@@ -64,14 +96,12 @@ def create_zimfarm_notification(
         _id: UUID | None = None,
         received_at: datetime | None = None,
         content: dict[str, Any] | None = None,
-        events: list[str] | None = None,
     ) -> ZimfarmNotification:
         zimfarm_notification = ZimfarmNotification(
             id=_id if _id is not None else uuid4(),
             received_at=received_at if received_at is not None else getnow(),
             content=content if content is not None else {"key": "value"},
         )
-        zimfarm_notification.events = events if events is not None else []
         dbsession.add(zimfarm_notification)
         dbsession.flush()
         return zimfarm_notification
@@ -134,7 +164,7 @@ def create_book(
             ),
             media_count=media_count if media_count is not None else faker.random_int(),
             size=size if size is not None else faker.random_int(),
-            zim_metadata=zim_metadata,
+            zim_metadata={},
             zimcheck_result_url=zimcheck_result_url,
             name=name,
             date=date,
@@ -144,6 +174,7 @@ def create_book(
             if zimfarm_notification and zimfarm_notification.content.get("recipe_id")
             else None,
         )
+        set_book_zim_metadata(dbsession, book, zim_metadata)
         book.filename = filename
         book.title_id = title_id
         book.location_kind = location_kind
@@ -202,12 +233,12 @@ def create_title(
             publisher=publisher,
             description=description,
             language=language,
-            illustration_48x48_at_1=illustration_48x48_at_1,
             long_description=long_description,
             license=license,
             relation=relation,
             source=source,
         )
+        set_illustration_48x48_at_1(dbsession, db_title, illustration_48x48_at_1)
         if flavours:
             for flavour in flavours:
                 title_flavour = TitleFlavour(
@@ -224,7 +255,7 @@ def create_title(
             publisher=publisher,
             description=description,
             language=language,
-            illustration_48x48_at_1=illustration_48x48_at_1,
+            illustration_48x48_at_1_id=db_title.illustration_48x48_at_1_id,
             long_description=long_description,
             license=license,
             relation=relation,
@@ -13,7 +13,11 @@ from cms_backend.db.account import (
     get_accounts,
     update_account,
 )
-from cms_backend.db.collection_permission import get_accessible_collection_ids
+from cms_backend.db.collection_permission import (
+    create_collection_permission,
+    get_accessible_collection_ids,
+    get_account_with_collection_ids_or_none,
+)
 from cms_backend.db.exceptions import (
     RecordDoesNotExistError,
 )
@@ -172,3 +176,54 @@ def test_update_account_set_permission_collections(
     accessible_collections = get_accessible_collection_ids(dbsession, account)
     assert accessible_collections is not None
     assert set(accessible_collections) == {collection.id}
+
+
+@pytest.mark.parametrize(
+    ["role", "expected"],
+    [
+        pytest.param(RoleEnum.ADMIN, None, id="admin"),
+        pytest.param(RoleEnum.COLLECTION_EDITOR, {"permitted"}, id="collection-editor"),
+        pytest.param(RoleEnum.VIEWER, {"public", "permitted"}, id="viewer"),
+    ],
+)
+def test_get_account_with_collection_ids_or_none(
+    dbsession: OrmSession,
+    create_account: Callable[..., Account],
+    create_collection: Callable[..., Collection],
+    role: RoleEnum,
+    expected: set[str] | None,
+):
+    account = create_account(permission=role)
+    create_collection(name="public")
+    permitted = create_collection(name="permitted")
+    create_collection(name="private", is_private=True)
+    create_collection_permission(dbsession, permitted.id, account.id)
+
+    assert account.idp_sub is not None
+    result = get_account_with_collection_ids_or_none(
+        dbsession, account_id=account.idp_sub
+    )
+    assert result is not None
+    found_account, accessible_collection_ids = result
+    assert found_account.id == account.id
+    if expected is None:
+        assert accessible_collection_ids is None
+    else:
+        assert accessible_collection_ids is not None
+        assert {
+            dbsession.get_one(Collection, collection_id).name
+            for collection_id in accessible_collection_ids
+        } == expected
+
+
+def test_get_account_with_collection_ids_or_none_no_permission(
+    dbsession: OrmSession,
+    create_account: Callable[..., Account],
+):
+    account = create_account(permission=RoleEnum.COLLECTION_EDITOR)
+    assert get_account_with_collection_ids_or_none(
+        dbsession, account_id=account.id
+    ) == (account, [])
+    assert get_account_with_collection_ids_or_none(dbsession, account_id=uuid4()) is (
+        None
+    )
@@ -17,26 +17,34 @@ from cms_backend.db.book import (
     get_book_history,
     get_book_history_entry_or_none,
     get_book_metadata_issues,
+    get_book_or_none,
     get_differing_metadata_keys,
+    get_latest_prod_book,
+    get_latest_prod_books,
     get_zimcheck_errors,
     recover_book,
     remove_book_backup,
     revert_book,
     update_book,
     update_book_issues,
+    update_books_issues,
 )
 from cms_backend.db.book import create_book as db_create_book
+from cms_backend.db.event_log import get_all_events
 from cms_backend.db.exceptions import RecordDoesNotExistError
+from cms_backend.db.loader_options import LoadProfile
 from cms_backend.db.models import (
     Account,
     Book,
     BookLocation,
     Collection,
+    CollectionTitle,
     Title,
     TitleFlavour,
     Warehouse,
     ZimfarmNotification,
 )
+from cms_backend.db.query_budget import query_budget
 from cms_backend.schemas.models import BookUpdateSchema
 from cms_backend.utils.datetime import getnow
 
@@ -66,11 +74,13 @@ def test_create_book(
     assert zimfarm_notification.book == book
     assert any(
         event
-        for event in zimfarm_notification.events
+        for event in get_all_events(dbsession, zimfarm_notification)
         if "notification transformed into book" in event
     )
     assert any(
-        event for event in book.events if "created from Zimfarm notification" in event
+        event
+        for event in get_all_events(dbsession, book)
+        if "created from Zimfarm notification" in event
     )
 
 
@@ -179,6 +189,40 @@ def test_update_book_with_different_flavour(
     assert len(book.history_entries) == 2
 
 
+@pytest.mark.parametrize("load_profile", ["processing", "full_schema"])
+def test_get_book_or_none_load_profile(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_title: Callable[..., Title],
+    create_collection: Callable[..., Collection],
+    create_book_location: Callable[..., BookLocation],
+    load_profile: LoadProfile,
+):
+    """Relationships walked by the profile code path are loaded with the book"""
+    title = create_title(flavours=["maxi"])
+    for index in range(3):
+        collection = create_collection()
+        ct = CollectionTitle(path=Path(f"path{index}"))
+        ct.title = title
+        ct.collection = collection
+        dbsession.add(ct)
+    book = create_book(name=title.name, flavour="maxi")
+    book.title = title
+    for _ in range(3):
+        create_book_location(book=book)
+    dbsession.commit()
+
+    book = get_book_or_none(dbsession, book.id, load_profile=load_profile)
+    assert book is not None
+    assert book.title is not None
+    with query_budget(dbsession, label="walk", max_queries=0, raise_exceptions=True):
+        if load_profile == "processing":
+            assert [tf.flavour for tf in book.title.flavours] == ["maxi"]
+            assert len({tc.collection.name for tc in book.title.collections}) == 3
+        else:
+            assert len({loc.warehouse.name for loc in book.locations}) == 3
+
+
 @pytest.mark.parametrize(
     "skip, limit, expected_count",
     [
@@ -750,7 +794,7 @@ def test_recover_deleted_book_with_backup(
     assert book.location_kind != "deleted"
     assert book.needs_file_operation is True
     assert book.deletion_date is None
-    assert "Book restored from 'deleted'" in book.events[-1]
+    assert "Book restored from 'deleted'" in get_all_events(dbsession, book)[-1]
     # book now has two target locations and one current location
     assert len([loc for loc in book.locations if loc.status == "current"]) == 1
     assert len([loc for loc in book.locations if loc.status == "target"]) == 2
@@ -943,6 +987,116 @@ def test_update_book_issues_item_count_issues(
     assert set(book.issues) == expected_issues
 
 
+def test_get_latest_prod_books(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_title: Callable[..., Title],
+):
+    """Latest prod books are the same as when retrieved one by one"""
+    now = getnow()
+    titles = [create_title(name=f"test{index}_en_all") for index in range(2)]
+    books: list[Book] = []
+    for title in titles:
+        for index, (flavour, location_kind) in enumerate(
+            [
+                ("maxi", "prod"),
+                ("maxi", "prod"),
+                ("maxi", "prod"),
+                ("maxi", "staging"),
+                ("mini", "prod"),
+                ("mini", "quarantine"),
+                ("nopic", "staging"),
+            ]
+        ):
+            books.append(
+                create_book(
+                    created_at=now + datetime.timedelta(minutes=index),
+                    flavour=flavour,
+                    location_kind=location_kind,
+                    title_id=title.id,
+                )
+            )
+    dbsession.flush()
+
+    latest_books = get_latest_prod_books(dbsession, books)
+    assert latest_books == {
+        book.id: get_latest_prod_book(dbsession, book) for book in books
+    }
+    # the latest prod book of the latest prod book is the one before
+    assert latest_books[books[2].id] == books[1]
+    # the book itself when there is no other prod book
+    assert latest_books[books[4].id] == books[4]
+    assert latest_books[books[6].id] == books[6]
+
+
+@patch("cms_backend.db.book.get_zimcheck_errors")
+def test_update_books_issues(
+    mock_get_zimcheck_errors: MagicMock,
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_title: Callable[..., Title],
+):
+    """Issues of many books are the same as when updated one by one"""
+    mock_get_zimcheck_errors.return_value = []
+    content = {
+        "Name": "test_en_all",
+        "Title": "Test Article",
+        "Creator": "Test Creator",
+        "Publisher": "Test Publisher",
+        "Date": "2025-01-01",
+        "Description": "Test description",
+        "Language": "eng",
+        "Illustration_48x48@1": "iVBORw0KGgo=",
+    }
+    title = create_title(
+        name="test_en_all",
+        flavours=["maxi"],
+        title=content["Title"],
+        creator=content["Creator"],
+        publisher=content["Publisher"],
+        description=content["Description"],
+        language=content["Language"],
+        illustration_48x48_at_1=content["Illustration_48x48@1"],
+    )
+    create_book(
+        article_count=100,
+        media_count=100,
+        flavour="maxi",
+        title_id=title.id,
+        zim_metadata=content,
+        location_kind="prod",
+    )
+    books = [
+        create_book(
+            article_count=article_count,
+            media_count=100,
+            flavour=flavour,
+            title_id=title.id,
+            zim_metadata={**content, "Language": language},
+        )
+        for article_count, flavour, language in [
+            (100, "maxi", "eng"),
+            (300, "maxi", "eng"),
+            (100, "mini", "eng"),
+            (100, "maxi", "xxx"),
+        ]
+    ]
+    dbsession.flush()
+
+    books_issues = update_books_issues(dbsession, books)
+
+    for book in books:
+        issues = set(book.issues)
+        assert set(books_issues[book.id]) == issues
+        assert set(update_book_issues(dbsession, book)) == issues
+    assert [set(book.issues) for book in books] == [
+        set(),
+        {"article count"},
+        {"flavour mismatch"},
+        {"invalid language code", "metadata mismatch"},
+    ]
+
+
 @pytest.mark.parametrize(
     "title,description,flavour,name,event_regex,expected",
     [
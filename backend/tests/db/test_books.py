@@ -1,6 +1,7 @@
 import datetime
 from collections.abc import Callable
 from pathlib import Path
+from typing import get_args
 from uuid import UUID, uuid4
 
 import pytest
@@ -8,13 +9,23 @@ from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.context import Context
 from cms_backend.db.book import (
+    backup_books,
     delete_book,
+    delete_books,
     get_book,
     get_book_or_none,
     move_book,
+    move_books,
     recover_book,
+    recover_books,
 )
-from cms_backend.db.books import get_book_languages, get_books, get_zim_urls
+from cms_backend.db.books import (
+    export_books,
+    get_book_languages,
+    get_books,
+    get_zim_urls,
+)
+from cms_backend.db.event_log import get_all_events
 from cms_backend.db.exceptions import RecordDoesNotExistError
 from cms_backend.db.models import (
     Book,
@@ -24,7 +35,13 @@ from cms_backend.db.models import (
     Title,
     Warehouse,
 )
-from cms_backend.schemas.models import GetBooksSchema
+from cms_backend.schemas.models import BooksFilterSchema, GetBooksSchema
+from cms_backend.schemas.orms import (
+    BookLightField,
+    BookLightSchema,
+    TitleLightField,
+    TitleLightSchema,
+)
 from cms_backend.utils.datetime import getnow
 
 
@@ -76,6 +93,72 @@ def test_get_books_with_data(
     assert len(results.records) == 5
 
 
+@pytest.mark.parametrize(
+    "fields",
+    [
+        pytest.param(["id"], id="id"),
+        pytest.param(["title_name"], id="title-name-only"),
+        pytest.param(["name", "offliner", "issues"], id="several"),
+    ],
+)
+def test_get_books_fields(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_title: Callable[..., Title],
+    fields: list[BookLightField],
+):
+    title = create_title(name="wikipedia_en_all")
+    create_book(
+        name="wikipedia_en_all",
+        title_id=title.id,
+        zim_metadata={"Scraper": "mwoffliner 1.0"},
+    )
+
+    result = get_books(dbsession, GetBooksSchema(fields=fields))
+    assert result.nb_records == 1
+    record = dict(result.records[0])
+    assert set(record) == set(fields)
+    if "title_name" in fields:
+        assert record["title_name"] == "wikipedia_en_all"
+    if "offliner" in fields:
+        assert record["offliner"] == "mwoffliner 1.0"
+
+
+def test_export_books(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # several batches are fetched from the cursor
+    monkeypatch.setattr(Context, "export_batch_size", 2)
+    books = [create_book(name=f"wikipedia_en_{i}") for i in range(5)]
+    books[3].has_error = True
+    create_book(name="wiktionary_en_all")
+    dbsession.flush()
+
+    books = list(export_books(dbsession, BooksFilterSchema(name="wikipedia")))
+    assert [book.id for book in books] == [
+        book.id
+        for book in get_books(
+            dbsession, GetBooksSchema(name="wikipedia", limit=200)
+        ).records
+    ]
+    assert len(books) == 5
+    assert books[-1].has_error is True
+
+    books = list(export_books(dbsession, BooksFilterSchema(fields=["name"])))
+    assert {book.name for book in books} == {
+        *(f"wikipedia_en_{i}" for i in range(5)),
+        "wiktionary_en_all",
+    }
+    assert set(dict(books[0])) == {"name"}
+
+
+def test_light_fields_match_schemas():
+    assert set(get_args(BookLightField)) == set(BookLightSchema.model_fields)
+    assert set(get_args(TitleLightField)) == set(TitleLightSchema.model_fields)
+
+
 @pytest.mark.parametrize(
     "skip,limit,expected_count",
     [
@@ -1123,7 +1206,10 @@ def test_recover_book(
     assert book.location_kind == location_kind
     assert book.needs_file_operation is False
     assert book.deletion_date is None
-    assert f"Book restored from to_delete to {location_kind}" in book.events[-1]
+    assert (
+        f"Book restored from to_delete to {location_kind}"
+        in get_all_events(dbsession, book)[-1]
+    )
 
 
 def test_recover_book_with_past_deletion_date(
@@ -1203,6 +1289,165 @@ def test_recover_book_archived_title(
         recover_book(dbsession, book_id=book.id)
 
 
+def test_delete_books(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    """Test deleting many books reports the outcome of each of them"""
+    book1 = create_book(name="test_en_all", date="2024-01")
+    book2 = create_book(name="test_en_all", date="2024-02")
+    deleted_book = create_book(name="test_en_all", date="2024-03")
+    deleted_book.location_kind = "deleted"
+    dbsession.flush()
+    unknown_id = uuid4()
+
+    results = delete_books(
+        dbsession,
+        book_ids=[book1.id, deleted_book.id, book2.id, unknown_id, book1.id],
+    )
+
+    assert [(result.id, result.success) for result in results] == [
+        (book1.id, True),
+        (deleted_book.id, False),
+        (book2.id, True),
+        (unknown_id, False),
+    ]
+    assert results[1].message == (
+        f"Book {deleted_book.id} does not meet criteria to be marked as deleted or "
+        "is not accessible to you."
+    )
+    for book in (book1, book2):
+        assert book.location_kind == "to_delete"
+        assert book.needs_file_operation is True
+    assert deleted_book.location_kind == "deleted"
+
+
+def test_move_books_to_prod(
+    dbsession: OrmSession,
+    warehouse: Warehouse,
+    create_book: Callable[..., Book],
+    create_title: Callable[..., Title],
+    create_collection: Callable[..., Collection],
+    create_collection_title: Callable[..., CollectionTitle],
+    create_book_location: Callable[..., BookLocation],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test moving many books applies retention rules once per title"""
+    title = create_title(name="test_en_all", flavours=["maxi"])
+    collection = create_collection(warehouse=warehouse)
+    create_collection_title(title=title, collection=collection, path=Path("zim"))
+
+    books: list[Book] = []
+    for date, flavour in (
+        ("2024-01", "maxi"),
+        ("2024-02", "nopic"),
+        ("2024-03", "maxi"),
+    ):
+        book = create_book(name="test_en_all", date=date, flavour=flavour)
+        book.title = title
+        book.location_kind = "staging"
+        create_book_location(
+            book=book,
+            warehouse_id=Context.staging_warehouse_id,
+            path=Context.staging_base_path,
+            filename=f"test_en_all_{date}.zim",
+            status="current",
+        )
+        books.append(book)
+    dbsession.flush()
+
+    retained_titles: list[Title] = []
+
+    def fake_apply_retention_rules(_: OrmSession, title: Title) -> None:
+        retained_titles.append(title)
+
+    monkeypatch.setattr(
+        "cms_backend.db.book.apply_retention_rules", fake_apply_retention_rules
+    )
+    results = move_books(
+        dbsession, book_ids=[book.id for book in books], destination="prod"
+    )
+
+    assert [result.success for result in results] == [True, False, True]
+    assert (results[1].message or "").startswith("Book flavour 'nopic' is not in")
+    assert [book.location_kind for book in books] == ["prod", "staging", "prod"]
+    assert [book.needs_file_operation for book in books] == [True, False, True]
+    assert retained_titles == [title]
+
+
+def test_recover_books(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_book_location: Callable[..., BookLocation],
+    create_title: Callable[..., Title],
+    create_warehouse: Callable[..., Warehouse],
+):
+    """Test recovering many books, one of them belonging to an archived title"""
+    warehouse = create_warehouse()
+    archived_title = create_title(archived=True)
+    books: list[Book] = []
+    for date in ("2024-01", "2024-02"):
+        book = create_book(name="test_en_all", date=date)
+        create_book_location(
+            book=book,
+            warehouse_id=warehouse.id,
+            path=Path("zim"),
+            filename=f"test_en_all_{date}.zim",
+            status="current",
+        )
+        book.location_kind = "to_delete"
+        book.needs_file_operation = True
+        book.deletion_date = getnow() + datetime.timedelta(days=1)
+        books.append(book)
+    books[1].title = archived_title
+    dbsession.flush()
+
+    results = recover_books(dbsession, book_ids=[book.id for book in books])
+
+    assert [result.success for result in results] == [True, False]
+    assert results[1].message == (
+        f"Book title {archived_title.id} is currently archived"
+    )
+    assert [book.location_kind for book in books] == ["prod", "to_delete"]
+
+
+def test_backup_books(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_book_location: Callable[..., BookLocation],
+    create_title: Callable[..., Title],
+    create_warehouse: Callable[..., Warehouse],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test backing up many books, one of them having no title"""
+    backup_warehouse = create_warehouse()
+    monkeypatch.setattr(Context, "backup_warehouse_id", backup_warehouse.id)
+    monkeypatch.setattr(Context, "backup_base_path", Path("/backup"))
+    warehouse = create_warehouse()
+    title = create_title()
+    books: list[Book] = []
+    for date in ("2024-01", "2024-02"):
+        book = create_book(name="test_en_all", date=date)
+        book.location_kind = "staging"
+        create_book_location(
+            book=book,
+            warehouse_id=warehouse.id,
+            path=Path("zim"),
+            filename=f"test_en_all_{date}.zim",
+            status="current",
+        )
+        books.append(book)
+    books[0].title = title
+    dbsession.flush()
+
+    results = backup_books(dbsession, book_ids=[book.id for book in books])
+
+    assert [result.success for result in results] == [True, False]
+    assert results[1].message == "Book has no associated title."
+    assert books[0].needs_file_operation is True
+    assert any(loc.is_backup and loc.status == "target" for loc in books[0].locations)
+
+
 @pytest.mark.parametrize(
     "updated_after_hours,updated_before_hours,expected_count",
     [
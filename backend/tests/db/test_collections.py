@@ -16,8 +16,9 @@ from cms_backend.db.collection import (
     update_collection,
 )
 from cms_backend.db.collection_permission import create_collection_permission
+from cms_backend.db.event_log import get_all_events
 from cms_backend.db.exceptions import RecordDoesNotExistError
-from cms_backend.db.models import Account, Collection, Title, Warehouse
+from cms_backend.db.models import Account, Book, Collection, Title, Warehouse
 from cms_backend.roles import RoleEnum
 from cms_backend.schemas.models import CollectionUpdateSchema
 
@@ -195,6 +196,105 @@ def test_get_collectionhistory(
     assert len(results.records) == expected_count
 
 
+def test_update_collection_thresholds_reevaluates_staging_books(
+    dbsession: OrmSession,
+    create_collection: Callable[..., Collection],
+    create_title: Callable[..., Title],
+    create_book: Callable[..., Book],
+    account: Account,
+    illustration_48x48_at_1: str,
+):
+    """Count issues of staging books follow collection threshold changes"""
+    title = create_title(
+        title="Title",
+        creator="Creator",
+        publisher="openZIM",
+        description="Description",
+        language="eng",
+        illustration_48x48_at_1=illustration_48x48_at_1,
+    )
+    collection = create_collection(title_ids_with_paths=[(title.id, "zim")])
+    # lowest threshold of all title collections applies
+    create_collection(
+        title_ids_with_paths=[(title.id, "zim")], article_count_increase_threshold=0.3
+    )
+    create_book(
+        title_id=title.id,
+        flavour="maxi",
+        location_kind="prod",
+        article_count=100,
+        media_count=100,
+    )
+
+    def _create_book(
+        article_count: int,
+        media_count: int,
+        issues: list[str],
+        *,
+        flavour: str = "maxi",
+        location_kind: str = "staging",
+    ) -> Book:
+        book = create_book(
+            title_id=title.id,
+            flavour=flavour,
+            location_kind=location_kind,
+            article_count=article_count,
+            media_count=media_count,
+            zim_metadata={
+                "Name": "test_en_all",
+                "Title": "Title",
+                "Creator": "Creator",
+                "Publisher": "openZIM",
+                "Date": "2025-01-01",
+                "Description": "Description",
+                "Language": "eng",
+                "Illustration_48x48@1": illustration_48x48_at_1,
+            },
+        )
+        book.issues = issues
+        return book
+
+    more_articles = _create_book(125, 100, ["article count"])
+    unchanged = _create_book(105, 100, [])
+    more_media = _create_book(100, 105, [])
+    other_issues = _create_book(
+        125, 100, ["bad metadata", "article count", "zimcheck error"]
+    )
+    quarantine = _create_book(125, 105, ["article count"], location_kind="quarantine")
+    no_prod_flavour = _create_book(125, 105, [], flavour="mini")
+    # issues of books missing mandatory metadata are not computed
+    missing_metadata = _create_book(100, 105, [])
+    missing_metadata.zim_metadata = {
+        key: value
+        for key, value in missing_metadata.zim_metadata.items()
+        if key != "Creator"
+    }
+    dbsession.flush()
+
+    update_collection(
+        dbsession,
+        collection_id=str(collection.id),
+        author_id=account.id,
+        request=CollectionUpdateSchema(
+            article_count_increase_threshold=0.5,
+            media_count_increase_threshold=0.01,
+        ),
+    )
+
+    assert more_articles.issues == []
+    assert unchanged.issues == []
+    assert more_media.issues == ["media count"]
+    assert other_issues.issues == ["bad metadata", "zimcheck error"]
+    assert quarantine.issues == ["article count"]
+    assert no_prod_flavour.issues == []
+    assert missing_metadata.issues == []
+    assert (
+        "issues updated after collection thresholds change"
+        in (get_all_events(dbsession, more_media)[-1])
+    )
+    assert get_all_events(dbsession, unchanged) == []
+
+
 def test_get_collection_history_entry_or_none(
     dbsession: OrmSession,
     create_collection: Callable[..., Collection],
@@ -0,0 +1,94 @@
+from collections.abc import Callable
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.context import Context
+from cms_backend.db.event_log import (
+    delete_events,
+    get_all_events,
+    get_events,
+    get_latest_events,
+    log_event,
+    log_events,
+)
+from cms_backend.db.models import Book, Title
+from cms_backend.utils.datetime import getnow
+
+
+def test_log_event_is_formatted_with_timestamp(
+    dbsession: OrmSession, create_book: Callable[..., Book]
+):
+    book = create_book()
+    now = getnow()
+    log_event(book, "something happened", created_at=now)
+    dbsession.flush()
+
+    assert get_all_events(dbsession, book) == [f"{now}: something happened"]
+
+
+def test_log_events_in_bulk(dbsession: OrmSession, create_book: Callable[..., Book]):
+    book1 = create_book()
+    book2 = create_book()
+    other = create_book()
+    log_events(dbsession, "book", [(book1.id, "event 1"), (book2.id, "event 2")])
+
+    assert [event.split(": ", 1)[1] for event in get_all_events(dbsession, book1)] == [
+        "event 1"
+    ]
+    assert [event.split(": ", 1)[1] for event in get_all_events(dbsession, book2)] == [
+        "event 2"
+    ]
+    assert get_all_events(dbsession, other) == []
+
+
+def test_events_are_scoped_by_entity_type(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_title: Callable[..., Title],
+):
+    book = create_book()
+    title = create_title()
+    log_event(book, "book event")
+    log_event(title, "title event")
+    dbsession.flush()
+
+    delete_events(dbsession, title)
+
+    assert get_all_events(dbsession, title) == []
+    assert len(get_all_events(dbsession, book)) == 1
+
+
+def test_get_events_paginated(dbsession: OrmSession, create_book: Callable[..., Book]):
+    book = create_book()
+    now = getnow()
+    # logged out of order, read back in chronological order
+    for i in (3, 0, 2, 1, 4):
+        log_event(book, f"event {i}", created_at=now + timedelta(seconds=i))
+    dbsession.flush()
+
+    result = get_events(dbsession, book, skip=1, limit=3)
+    assert result.nb_records == 5
+    assert [event.split(": ", 1)[1] for event in result.records] == [
+        "event 1",
+        "event 2",
+        "event 3",
+    ]
+
+
+def test_get_latest_events(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(Context, "latest_events_limit", 2)
+    book = create_book()
+    now = getnow()
+    for i in range(4):
+        log_event(book, f"event {i}", created_at=now + timedelta(seconds=i))
+    dbsession.flush()
+
+    assert [
+        event.split(": ", 1)[1] for event in get_latest_events(dbsession, book)
+    ] == ["event 2", "event 3"]
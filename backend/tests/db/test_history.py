@@ -0,0 +1,191 @@
+from collections.abc import Callable
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.context import Context
+from cms_backend.db.collection import get_collection_history, update_collection
+from cms_backend.db.models import Account, Collection, Title, TitleHistory
+from cms_backend.db.title import (
+    get_title_history,
+    get_title_history_entry,
+    revert_title,
+    update_title,
+)
+from cms_backend.schemas.models import CollectionUpdateSchema, TitleUpdateSchema
+from cms_backend.utils.datetime import getnow
+
+
+@pytest.fixture
+def checkpoint_interval(monkeypatch: pytest.MonkeyPatch) -> int:
+    monkeypatch.setattr(Context, "history_checkpoint_interval", 3)
+    return 3
+
+
+def test_title_history_stores_changes_only(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    account: Account,
+    checkpoint_interval: int,  # noqa: ARG001
+):
+    title = create_title(name="wikipedia_en_test", description="Description")
+    for i in range(4):
+        update_title(
+            dbsession,
+            title_identifier=str(title.id),
+            author_id=account.id,
+            payload=TitleUpdateSchema(title=f"Wikipedia {i}"),
+        )
+
+    entries = dbsession.execute(
+        select(
+            TitleHistory.is_checkpoint,
+            TitleHistory.changed_fields,
+            TitleHistory.title,
+            TitleHistory.description,
+        )
+        .where(TitleHistory.title_id == title.id)
+        .order_by(TitleHistory.created_at)
+    ).all()
+    assert [tuple(entry) for entry in entries] == [
+        (True, None, None, "Description"),
+        (False, ["title"], "Wikipedia 0", None),
+        (False, ["title"], "Wikipedia 1", None),
+        (True, None, "Wikipedia 2", "Description"),
+        (False, ["title"], "Wikipedia 3", None),
+    ]
+
+
+def test_title_history_is_rebuilt_on_read(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    account: Account,
+    illustration_48x48_at_1: str,
+    checkpoint_interval: int,  # noqa: ARG001
+):
+    title = create_title(
+        name="wikipedia_en_test",
+        description="Description",
+        illustration_48x48_at_1=illustration_48x48_at_1,
+    )
+    for i in range(4):
+        update_title(
+            dbsession,
+            title_identifier=str(title.id),
+            author_id=account.id,
+            payload=TitleUpdateSchema(title=f"Wikipedia {i}", comment=f"Update {i}"),
+        )
+    dbsession.expire_all()
+
+    # a page starting after a checkpoint needs older entries to be rebuilt
+    records = get_title_history(
+        dbsession, title_identifier=str(title.id), skip=2, limit=2
+    ).records
+    assert [record.title for record in records] == ["Wikipedia 1", "Wikipedia 0"]
+    for record in records:
+        assert record.name == "wikipedia_en_test"
+        assert record.description == "Description"
+        assert record.illustration_48x48_at_1 == illustration_48x48_at_1
+        assert record.maturity == "unstable"
+
+
+def test_title_history_entries_created_at_same_time(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    account: Account,
+    checkpoint_interval: int,  # noqa: ARG001
+):
+    title = create_title(name="wikipedia_en_test", description="Description")
+    for i in range(4):
+        update_title(
+            dbsession,
+            title_identifier=str(title.id),
+            author_id=account.id,
+            payload=TitleUpdateSchema(title=f"Wikipedia {i}"),
+        )
+    dbsession.execute(
+        update(TitleHistory)
+        .where(TitleHistory.title_id == title.id)
+        .values(created_at=getnow())
+    )
+    dbsession.expire_all()
+
+    # entries are replayed in insertion order
+    records = get_title_history(
+        dbsession, title_identifier=str(title.id), skip=0, limit=10
+    ).records
+    assert [record.title for record in records] == [
+        "Wikipedia 3",
+        "Wikipedia 2",
+        "Wikipedia 1",
+        "Wikipedia 0",
+        None,
+    ]
+    for record in records:
+        assert record.description == "Description"
+
+
+def test_revert_title_to_diff_entry(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    account: Account,
+    checkpoint_interval: int,  # noqa: ARG001
+):
+    title = create_title(name="wikipedia_en_test", description="Description")
+    update_title(
+        dbsession,
+        title_identifier=str(title.id),
+        author_id=account.id,
+        payload=TitleUpdateSchema(title="Wikipedia"),
+    )
+    update_title(
+        dbsession,
+        title_identifier=str(title.id),
+        author_id=account.id,
+        payload=TitleUpdateSchema(title="Other", description="Other description"),
+    )
+    history = get_title_history(
+        dbsession, title_identifier=str(title.id), skip=0, limit=10
+    ).records
+
+    entry = get_title_history_entry(
+        dbsession, title_identifier=str(title.id), history_id=history[1].id
+    )
+    assert entry.changed_fields == ["title"]
+    assert entry.description == "Description"
+
+    revert_title(
+        dbsession,
+        title_identifier=str(title.id),
+        history_id=history[1].id,
+        author_id=account.id,
+    )
+    dbsession.refresh(title)
+    assert title.title == "Wikipedia"
+    assert title.description == "Description"
+
+
+def test_collection_history_is_rebuilt_on_read(
+    dbsession: OrmSession,
+    create_collection: Callable[..., Collection],
+    account: Account,
+):
+    collection = create_collection(name="wikipedia")
+    for i in range(3):
+        update_collection(
+            dbsession,
+            author_id=account.id,
+            collection_id=str(collection.id),
+            request=CollectionUpdateSchema(media_count_increase_threshold=(i + 1) / 10),
+        )
+
+    records = get_collection_history(
+        dbsession, collection_id=str(collection.id), skip=0, limit=10
+    ).records
+    assert [record.media_count_increase_threshold for record in records[:3]] == [
+        0.3,
+        0.2,
+        0.1,
+    ]
+    assert {record.name for record in records} == {"wikipedia"}
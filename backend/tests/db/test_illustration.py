@@ -0,0 +1,93 @@
+from collections.abc import Callable
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db.exceptions import RecordDoesNotExistError
+from cms_backend.db.illustration import (
+    get_book_zim_metadata,
+    get_illustration,
+    get_illustration_id,
+    get_illustration_or_none,
+    save_illustration,
+)
+from cms_backend.db.models import Account, Book, Illustration, Title
+from cms_backend.db.title import update_title
+from cms_backend.schemas.models import TitleUpdateSchema
+
+
+def test_save_illustration_none(dbsession: OrmSession):
+    assert save_illustration(dbsession, None) is None
+    assert dbsession.scalar(select(func.count()).select_from(Illustration)) == 0
+
+
+def test_save_illustration_deduplicates(dbsession: OrmSession):
+    first_id = save_illustration(dbsession, "AAAA")
+    second_id = save_illustration(dbsession, "AAAA")
+    other_id = save_illustration(dbsession, "BBBB")
+
+    assert first_id == second_id == get_illustration_id("AAAA")
+    assert other_id != first_id
+    assert dbsession.scalar(select(func.count()).select_from(Illustration)) == 2
+    assert first_id is not None
+    assert get_illustration(dbsession, first_id).content == "AAAA"
+
+
+def test_get_illustration_does_not_exist(dbsession: OrmSession):
+    assert get_illustration_or_none(dbsession, get_illustration_id("AAAA")) is None
+    with pytest.raises(RecordDoesNotExistError):
+        get_illustration(dbsession, get_illustration_id("AAAA"))
+
+
+def test_titles_share_illustration(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+):
+    title_a = create_title(name="a_en_all", illustration_48x48_at_1="AAAA")
+    title_b = create_title(name="b_en_all", illustration_48x48_at_1="AAAA")
+    dbsession.flush()
+
+    assert title_a.illustration_48x48_at_1_id == title_b.illustration_48x48_at_1_id
+    assert dbsession.scalar(select(func.count()).select_from(Illustration)) == 1
+
+    dbsession.expire_all()
+    assert title_a.illustration_48x48_at_1 == "AAAA"
+
+
+def test_update_title_illustration(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    account: Account,
+):
+    title = create_title(illustration_48x48_at_1="AAAA")
+    dbsession.flush()
+
+    update_title(
+        dbsession,
+        title_identifier=str(title.id),
+        author_id=account.id,
+        payload=TitleUpdateSchema(illustration_48x48_at_1="BBBB"),
+    )
+
+    assert title.illustration_48x48_at_1_id == get_illustration_id("BBBB")
+    assert title.illustration_48x48_at_1 == "BBBB"
+
+
+def test_books_share_illustration_out_of_zim_metadata(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    book_a = create_book(zim_metadata={"Name": "a", "Illustration_48x48@1": "AAAA"})
+    book_b = create_book(zim_metadata={"Name": "b", "Illustration_48x48@1": "AAAA"})
+    dbsession.flush()
+
+    assert book_a.zim_metadata == {"Name": "a"}
+    assert book_a.illustration_48x48_at_1_id == book_b.illustration_48x48_at_1_id
+    assert dbsession.scalar(select(func.count()).select_from(Illustration)) == 1
+
+    dbsession.expire_all()
+    assert get_book_zim_metadata(book_a) == {
+        "Name": "a",
+        "Illustration_48x48@1": "AAAA",
+    }
@@ -0,0 +1,102 @@
+from collections.abc import Callable
+from datetime import timedelta
+from unittest.mock import patch
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db import iter_batches
+from cms_backend.db.models import Book
+from cms_backend.utils.datetime import getnow
+
+
+def test_iter_batches_ordered_by_created_at_and_id(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    now = getnow()
+    # books sharing the same created_at must still be iterated exactly once
+    books = [create_book(created_at=now - timedelta(days=i // 2)) for i in range(7)]
+
+    batches = list(
+        iter_batches(
+            dbsession,
+            select(Book),
+            created_at_column=Book.created_at,
+            id_column=Book.id,
+            batch_size=3,
+        )
+    )
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [book.id for batch in batches for book in batch] == [
+        book.id for book in sorted(books, key=lambda book: (book.created_at, book.id))
+    ]
+
+
+def test_iter_batches_with_filter(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    prod_books = [create_book(location_kind="prod") for _ in range(4)]
+    create_book(location_kind="staging")
+
+    book_ids = {
+        book.id
+        for batch in iter_batches(
+            dbsession,
+            select(Book).where(Book.location_kind == "prod"),
+            created_at_column=Book.created_at,
+            id_column=Book.id,
+            batch_size=2,
+        )
+        for book in batch
+    }
+
+    assert book_ids == {book.id for book in prod_books}
+
+
+def test_iter_batches_records_modified_while_iterating(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    """Records no longer matching the filter do not shift the next batches"""
+    for _ in range(5):
+        create_book(location_kind="prod")
+
+    nb_processed = 0
+    for batch in iter_batches(
+        dbsession,
+        select(Book).where(Book.location_kind == "prod"),
+        created_at_column=Book.created_at,
+        id_column=Book.id,
+        batch_size=2,
+    ):
+        for book in batch:
+            book.location_kind = "deleted"
+            nb_processed += 1
+        dbsession.flush()
+
+    assert nb_processed == 5
+
+
+def test_iter_batches_commit_every(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    for _ in range(5):
+        create_book()
+
+    with patch.object(dbsession, "commit") as mock_commit:
+        for _ in iter_batches(
+            dbsession,
+            select(Book),
+            created_at_column=Book.created_at,
+            id_column=Book.id,
+            batch_size=1,
+            commit_every=2,
+        ):
+            pass
+
+    # two commits for the four first batches and a last one for the remaining one
+    assert mock_commit.call_count == 3
@@ -0,0 +1,55 @@
+import logging
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db.exceptions import QueryBudgetExceededError
+from cms_backend.db.models import Book, Title
+from cms_backend.db.query_budget import query_budget
+
+
+def test_query_budget_counts_statements(dbsession: OrmSession):
+    with query_budget(dbsession, label="test") as stats:
+        dbsession.execute(select(Book)).all()
+        dbsession.execute(select(Title)).all()
+
+    assert stats.nb_queries == 2
+    assert len(stats.statements) == 2
+    assert stats.duration > 0
+
+
+def test_query_budget_stops_counting_after_block(dbsession: OrmSession):
+    with query_budget(dbsession, label="test") as stats:
+        dbsession.execute(select(Book)).all()
+    dbsession.execute(select(Book)).all()
+
+    assert stats.nb_queries == 1
+
+
+def test_query_budget_within_budget(dbsession: OrmSession):
+    with query_budget(
+        dbsession, label="test", max_queries=1, raise_exceptions=True
+    ) as stats:
+        dbsession.execute(select(Book)).all()
+
+    assert stats.nb_queries == 1
+
+
+def test_query_budget_exceeded_raises(dbsession: OrmSession):
+    with pytest.raises(QueryBudgetExceededError, match="2 queries exceeds budget"):
+        with query_budget(
+            dbsession, label="test", max_queries=1, raise_exceptions=True
+        ):
+            dbsession.execute(select(Book)).all()
+            dbsession.execute(select(Book)).all()
+
+
+def test_query_budget_exceeded_logs(
+    dbsession: OrmSession, caplog: pytest.LogCaptureFixture
+):
+    with caplog.at_level(logging.WARNING, logger="backend"):
+        with query_budget(dbsession, label="test", max_queries=0):
+            dbsession.execute(select(Book)).all()
+
+    assert "test: 1 queries exceeds budget of 0" in caplog.text
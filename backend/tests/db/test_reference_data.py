@@ -0,0 +1,199 @@
+from collections.abc import Callable
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db.collection import update_collection
+from cms_backend.db.exceptions import RecordDoesNotExistError
+from cms_backend.db.models import Account, Collection, Warehouse
+from cms_backend.db.reference_data import (
+    ReferenceDataCache,
+    get_account_id_by_username,
+    get_collection_warehouse_id,
+    get_public_collection_ids,
+    get_warehouse_name_or_none,
+    invalidate_reference_data,
+    reference_data_cache,
+)
+from cms_backend.schemas.models import CollectionUpdateSchema
+
+
+def test_reference_data_cache_get_or_load():
+    cache = ReferenceDataCache(ttl=timedelta(minutes=1))
+    calls: list[str] = []
+
+    def loader() -> str:
+        calls.append("call")
+        return "value"
+
+    assert cache.get_or_load("key", loader) == "value"
+    assert cache.get_or_load("key", loader) == "value"
+    assert len(calls) == 1
+
+
+def test_reference_data_cache_expired():
+    cache = ReferenceDataCache(ttl=timedelta(seconds=0))
+    calls: list[str] = []
+
+    def loader() -> str:
+        calls.append("call")
+        return "value"
+
+    cache.get_or_load("key", loader)
+    cache.get_or_load("key", loader)
+    assert len(calls) == 2
+
+
+def test_reference_data_cache_ttl_of_key():
+    cache = ReferenceDataCache(ttl=timedelta(minutes=1))
+    calls: list[str] = []
+
+    def loader() -> str:
+        calls.append("call")
+        return "value"
+
+    cache.get_or_load("key", loader, ttl=timedelta(seconds=0))
+    cache.get_or_load("key", loader, ttl=timedelta(seconds=0))
+    assert len(calls) == 2
+
+
+def test_reference_data_cache_invalidate():
+    cache = ReferenceDataCache(ttl=timedelta(minutes=1))
+    assert cache.get_or_load("key", lambda: "old") == "old"
+    cache.invalidate()
+    assert cache.get_or_load("key", lambda: "new") == "new"
+
+
+def test_reference_data_cache_none_not_stored():
+    cache = ReferenceDataCache(ttl=timedelta(minutes=1))
+    assert cache.get_or_load("key", lambda: None) is None
+    assert cache.get_or_load("key", lambda: "value") == "value"
+
+
+def test_get_account_id_by_username(
+    dbsession: OrmSession,
+    create_account: Callable[..., Account],
+):
+    account = create_account(username="maint-scripts")
+    assert get_account_id_by_username(dbsession, username="maint-scripts") == (
+        account.id
+    )
+
+
+def test_get_account_id_by_username_cached(
+    dbsession: OrmSession,
+    create_account: Callable[..., Account],
+):
+    account = create_account(username="maint-scripts")
+    get_account_id_by_username(dbsession, username="maint-scripts")
+    account.username = "renamed"
+    dbsession.flush()
+    # still served from cache until invalidated
+    assert get_account_id_by_username(dbsession, username="maint-scripts") == (
+        account.id
+    )
+    invalidate_reference_data()
+    with pytest.raises(RecordDoesNotExistError):
+        get_account_id_by_username(dbsession, username="maint-scripts")
+
+
+def test_get_account_id_by_username_does_not_exist(dbsession: OrmSession):
+    with pytest.raises(RecordDoesNotExistError):
+        get_account_id_by_username(dbsession, username="maint-scripts")
+
+
+def test_get_warehouse_name_or_none(
+    dbsession: OrmSession,
+    create_warehouse: Callable[..., Warehouse],
+):
+    warehouse = create_warehouse(name="hidden")
+    assert get_warehouse_name_or_none(dbsession, warehouse_id=warehouse.id) == (
+        "hidden"
+    )
+    assert get_warehouse_name_or_none(dbsession, warehouse_id=uuid4()) is None
+    # warehouses created after the cache was loaded are found
+    new_warehouse = create_warehouse(name="new")
+    assert get_warehouse_name_or_none(dbsession, warehouse_id=new_warehouse.id) == (
+        "new"
+    )
+
+
+def test_get_collection_warehouse_id(
+    dbsession: OrmSession,
+    create_collection: Callable[..., Collection],
+):
+    collection = create_collection()
+    assert (
+        get_collection_warehouse_id(dbsession, collection_id=collection.id)
+        == collection.warehouse_id
+    )
+    new_collection = create_collection()
+    assert (
+        get_collection_warehouse_id(dbsession, collection_id=new_collection.id)
+        == new_collection.warehouse_id
+    )
+    with pytest.raises(RecordDoesNotExistError):
+        get_collection_warehouse_id(dbsession, collection_id=uuid4())
+
+
+def test_get_public_collection_ids(
+    dbsession: OrmSession,
+    account: Account,
+    create_collection: Callable[..., Collection],
+):
+    public = create_collection()
+    private = create_collection(is_private=True)
+    assert get_public_collection_ids(dbsession) == (public.id,)
+
+    # changing privacy of a collection drops the cache
+    update_collection(
+        dbsession,
+        collection_id=str(private.id),
+        author_id=account.id,
+        request=CollectionUpdateSchema(is_private=False),
+    )
+    assert set(get_public_collection_ids(dbsession)) == {public.id, private.id}
+
+
+def test_reference_data_invalidated_on_commit(
+    dbsession: OrmSession,
+    create_collection: Callable[..., Collection],
+):
+    public = create_collection()
+    invalidate_reference_data(dbsession)
+    # loaded before the change is committed
+    assert get_public_collection_ids(dbsession) == (public.id,)
+    dbsession.commit()
+    new_collection = create_collection()
+    assert set(get_public_collection_ids(dbsession)) == {public.id, new_collection.id}
+
+
+def test_reference_data_invalidated_once_per_transaction(dbsession: OrmSession):
+    invalidate_reference_data(dbsession)
+    invalidate_reference_data(dbsession)
+    generation = reference_data_cache.generation
+
+    dbsession.commit()
+    assert reference_data_cache.generation == generation + 1
+
+    # later transactions do not invalidate it again
+    dbsession.commit()
+    assert reference_data_cache.generation == generation + 1
+
+
+def test_reference_data_invalidated_on_rollback(
+    dbsession: OrmSession,
+    create_collection: Callable[..., Collection],
+):
+    create_collection()
+    invalidate_reference_data(dbsession)
+    generation = reference_data_cache.generation
+
+    dbsession.rollback()
+    assert reference_data_cache.generation == generation + 1
+
+    # later transactions do not invalidate it again
+    dbsession.commit()
+    assert reference_data_cache.generation == generation + 1
@@ -0,0 +1,93 @@
+from collections.abc import Callable
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db.models import Book, Collection
+from cms_backend.db.response_cache import (
+    MemoryResponseCacheStore,
+    get_response_cache,
+    get_response_cache_key,
+)
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryResponseCacheStore(max_entries=2, ttl=timedelta(minutes=1))
+    store.set("a", b"1")
+    store.set("b", b"2")
+    assert store.get("a") == b"1"
+    store.set("c", b"3")
+
+    assert store.get("a") == b"1"
+    assert store.get("b") is None
+    assert store.get("c") == b"3"
+
+
+def test_memory_store_entries_expire():
+    store = MemoryResponseCacheStore(max_entries=2, ttl=timedelta(0))
+    store.set("a", b"1")
+
+    assert store.get("a") is None
+
+
+def test_key_changes_when_records_of_kind_are_flushed(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+    create_collection: Callable[..., Collection],
+):
+    book = create_book()
+    create_collection()
+    dbsession.flush()
+    book_key = get_response_cache_key(("book",), "/books")
+    collection_key = get_response_cache_key(("collection",), "/collections")
+
+    book.zim_metadata = {"Language": "fra"}
+    dbsession.flush()
+
+    assert get_response_cache_key(("book",), "/books") != book_key
+    assert get_response_cache_key(("collection",), "/collections") == collection_key
+
+
+def test_key_changes_on_bulk_statements(
+    dbsession: OrmSession, create_book: Callable[..., Book]
+):
+    book = create_book()
+    dbsession.flush()
+    key = get_response_cache_key(("book",), "/books")
+
+    dbsession.execute(
+        update(Book).where(Book.id == book.id).values(location_kind="prod")
+    )
+
+    assert get_response_cache_key(("book",), "/books") != key
+
+
+def test_key_changes_again_on_commit(
+    dbsession: OrmSession, create_book: Callable[..., Book]
+):
+    create_book()
+    dbsession.flush()
+    # response rendered by another session before changes are committed
+    key = get_response_cache_key(("book",), "/books")
+    get_response_cache().set(key, b"stale")
+
+    dbsession.commit()
+
+    assert get_response_cache_key(("book",), "/books") != key
+
+
+@pytest.mark.usefixtures("unavailable_response_cache")
+def test_writes_succeed_when_store_is_unavailable(
+    dbsession: OrmSession, create_book: Callable[..., Book]
+):
+    book = create_book()
+    dbsession.flush()
+    dbsession.execute(
+        update(Book).where(Book.id == book.id).values(location_kind="prod")
+    )
+
+    dbsession.commit()
+
+    assert dbsession.get_one(Book, book.id).location_kind == "prod"
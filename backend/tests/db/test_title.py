@@ -6,6 +6,8 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend.context import Context
+from cms_backend.db.event_log import get_all_events
+from cms_backend.db.exceptions import RecordDoesNotExistError
 from cms_backend.db.models import (
     Account,
     Book,
@@ -18,6 +20,7 @@ from cms_backend.db.models import (
 )
 from cms_backend.db.title import (
     archive_title,
+    export_titles,
     get_title_by_id_or_none,
     get_title_by_name_or_none,
     get_title_history,
@@ -27,8 +30,9 @@ from cms_backend.db.title import (
     restore_title,
     revert_title,
     update_title,
+    upsert_titles,
 )
-from cms_backend.schemas.models import TitleUpdateSchema
+from cms_backend.schemas.models import TitleCreateSchema, TitleUpdateSchema
 from cms_backend.schemas.orms import BaseTitleCollectionSchema
 
 
@@ -81,6 +85,23 @@ def test_get_titles_search(
     assert len(results.records) <= limit
 
 
+def test_export_titles(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # several batches are fetched from the cursor
+    monkeypatch.setattr(Context, "export_batch_size", 2)
+    for i in (3, 0, 4, 1, 2):
+        create_title(name=f"wikipedia{i}_en_all")
+    create_title(name="wikibook_en_all")
+
+    titles = list(export_titles(dbsession, name="wikipedia", fields=["name"]))
+    assert [dict(title) for title in titles] == [
+        {"name": f"wikipedia{i}_en_all"} for i in range(5)
+    ]
+
+
 @pytest.mark.parametrize(
     "skip, limit, expected_count",
     [
@@ -756,3 +777,95 @@ def test_get_title_by_id_or_none_not_accessible(
         accessible_collection_ids=[other_collection.id],
     )
     assert result is None
+
+
+def test_upsert_titles(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    create_collection: Callable[..., Collection],
+    account: Account,
+    illustration_48x48_at_1: str,
+):
+    """Test that new titles are created at once and existing ones updated"""
+    collection = create_collection(name="wikipedia")
+    existing_title = create_title(name="wikipedia_en_all", description="Old")
+
+    created, updated = upsert_titles(
+        dbsession,
+        author_id=account.id,
+        payloads=[
+            TitleCreateSchema(name="wikipedia_en_all", description="New"),
+            *(
+                TitleCreateSchema(
+                    name=f"wikipedia_{lang}_all",
+                    illustration_48x48_at_1=illustration_48x48_at_1,
+                    collection_titles=[
+                        BaseTitleCollectionSchema(
+                            collection_name="wikipedia", path=f"wikipedia/{lang}"
+                        )
+                    ],
+                )
+                for lang in ("fr", "de")
+            ),
+        ],
+    )
+
+    assert [title.name for title in created] == ["wikipedia_fr_all", "wikipedia_de_all"]
+    assert updated == [existing_title]
+    assert existing_title.description == "New"
+    for title in created:
+        dbsession.refresh(title)
+        assert title.illustration_48x48_at_1 == illustration_48x48_at_1
+        assert [ct.collection_id for ct in title.collections] == [collection.id]
+        assert (
+            len(
+                get_title_history(
+                    dbsession, title_identifier=str(title.id), skip=0, limit=10
+                ).records
+            )
+            == 1
+        )
+        assert "title created" in get_all_events(dbsession, title)[0]
+
+    # a single event for the mill to process books of all created titles
+    events = dbsession.scalars(
+        select(Event).where(Event.topic == "title_modified")
+    ).all()
+    assert [event.payload for event in events] == [
+        {
+            "action": "created",
+            "titles": [{"id": str(title.id), "name": title.name} for title in created],
+        }
+    ]
+
+
+def test_upsert_titles_checks_all_payloads_first(
+    dbsession: OrmSession,
+    create_collection: Callable[..., Collection],
+    account: Account,
+):
+    """Test that nothing is written if any payload is invalid"""
+    create_collection(name="wikipedia")
+    payloads = [
+        TitleCreateSchema(
+            name="wikipedia_en_all",
+            collection_titles=[
+                BaseTitleCollectionSchema(collection_name="wikipedia", path="zim")
+            ],
+        ),
+        TitleCreateSchema(
+            name="wikipedia_fr_all",
+            collection_titles=[
+                BaseTitleCollectionSchema(collection_name="unknown", path="zim")
+            ],
+        ),
+    ]
+    with pytest.raises(RecordDoesNotExistError, match="Collection 'unknown'"):
+        upsert_titles(dbsession, author_id=account.id, payloads=payloads)
+
+    with pytest.raises(ValueError, match="wikipedia_en_all"):
+        upsert_titles(
+            dbsession, author_id=account.id, payloads=[payloads[0], payloads[0]]
+        )
+
+    assert dbsession.scalars(select(Title)).all() == []
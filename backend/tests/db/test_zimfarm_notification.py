@@ -1,3 +1,4 @@
+import re
 from collections.abc import Callable
 from datetime import timedelta
 from uuid import UUID, uuid4
@@ -12,7 +13,9 @@ from cms_backend.db.zimfarm_notification import (
     create_zimfarm_notification as db_create_zimfarm_notification,
 )
 from cms_backend.db.zimfarm_notification import (
+    create_zimfarm_notifications,
     get_next_notification_to_process_or_none,
+    get_pending_notifications_zimcheck_urls,
     get_zimfarm_notification,
     get_zimfarm_notification_or_none,
     get_zimfarm_notifications,
@@ -71,6 +74,33 @@ def test_create_zimfarm_notification(dbsession: OrmSession, faker: Faker):
     assert created_notification.content == content
 
 
+def test_create_zimfarm_notifications(
+    dbsession: OrmSession,
+    zimfarm_notification: ZimfarmNotification,
+):
+    """Create many notifications at once, ignoring already received ones"""
+    new_id = uuid4()
+    created_ids = create_zimfarm_notifications(
+        dbsession,
+        [
+            (zimfarm_notification.id, {"foo": "bar"}),
+            (new_id, {"foo": "baz"}),
+            (new_id, {"foo": "qux"}),
+        ],
+    )
+    assert created_ids == [new_id]
+
+    dbsession.expire_all()
+    assert zimfarm_notification.content != {"foo": "bar"}
+    created_notification = get_zimfarm_notification(dbsession, new_id)
+    assert created_notification.content == {"foo": "baz"}
+    assert created_notification.status == "pending"
+
+
+def test_create_zimfarm_notifications_empty(dbsession: OrmSession):
+    assert create_zimfarm_notifications(dbsession, []) == []
+
+
 def test_get_next_notification_to_process_or_none(
     dbsession: OrmSession,
     create_zimfarm_notification: Callable[..., ZimfarmNotification],
@@ -89,6 +119,52 @@ def test_get_next_notification_to_process_or_none(
     assert next_notification is None
 
 
+def test_get_pending_notifications_zimcheck_urls(
+    dbsession: OrmSession,
+    create_zimfarm_notification: Callable[..., ZimfarmNotification],
+):
+    for index in range(4):
+        create_zimfarm_notification(
+            content={"zimcheck_url": f"https://www.example.com/{index}.json"}
+        )
+    create_zimfarm_notification(content=GOOD_NOTIFICATION_CONTENT)
+    processed = create_zimfarm_notification(
+        content={"zimcheck_url": "https://www.example.com/processed.json"}
+    )
+    processed.status = "processed"
+    dbsession.flush()
+
+    assert get_pending_notifications_zimcheck_urls(dbsession, limit=3) == [
+        "https://www.example.com/0.json",
+        "https://www.example.com/1.json",
+        "https://www.example.com/2.json",
+    ]
+    assert len(get_pending_notifications_zimcheck_urls(dbsession, limit=10)) == 4
+
+
+def test_get_pending_notifications_zimcheck_urls_skips_whitelisted_scrapers(
+    dbsession: OrmSession,
+    create_zimfarm_notification: Callable[..., ZimfarmNotification],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(
+        "cms_backend.context.Context.zimcheck_scrapers_whitelist_regex",
+        re.compile(r"^sotoki"),
+    )
+    for scraper in ("mwoffliner 1.0", "sotoki 2.0"):
+        create_zimfarm_notification(
+            content={
+                "zimcheck_url": f"https://www.example.com/{scraper}.json",
+                "metadata": {"Scraper": scraper},
+            }
+        )
+    dbsession.flush()
+
+    assert get_pending_notifications_zimcheck_urls(dbsession, limit=10) == [
+        "https://www.example.com/mwoffliner 1.0.json"
+    ]
+
+
 @pytest.mark.parametrize(
     "has_book,status,expected_count",
     [
@@ -14,13 +14,13 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 from uuid import UUID, uuid4
 
-import pycountry
 import pytest
 from pytest import MonkeyPatch
 from sqlalchemy.orm import Session as OrmSession
 
 from cms_backend import update_language_codes
 from cms_backend.context import Context
+from cms_backend.db.event_log import get_all_events
 from cms_backend.db.models import (
     Book,
     Collection,
@@ -29,6 +29,7 @@ from cms_backend.db.models import (
     Warehouse,
     ZimfarmNotification,
 )
+from cms_backend.db.query_budget import query_budget
 from cms_backend.mill.processors.zimfarm_notification import process_notification
 from cms_backend.utils.requests import Response
 
@@ -60,24 +61,9 @@ VALID_NOTIFICATION_CONTENT: dict[str, Any] = {
 
 @pytest.fixture(autouse=True)
 def restore_language_codes():
-    """Fixture to restore pycountry language codes after test modifications."""
-    original_entries = list(pycountry.languages)  # pyright: ignore[reportUnknownVariableType]
+    """Fixture to restore supported language codes after test modifications."""
     yield
-    current_entries = list(pycountry.languages)  # pyright: ignore[reportUnknownVariableType]
-    for entry in current_entries:  # pyright: ignore[reportUnknownVariableType]
-        try:
-            pycountry.languages.remove_entry(alpha_3=entry.alpha_3)  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType]
-        except Exception:  # noqa: S110
-            pass
-
-    for entry in original_entries:  # pyright: ignore[reportUnknownVariableType]
-        try:
-            pycountry.languages.add_entry(  # pyright: ignore[reportUnknownMemberType]
-                alpha_3=entry.alpha_3,  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType]
-                name=entry.name,  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType]
-            )
-        except Exception:  # noqa: S110
-            pass
+    update_language_codes()
 
 
 class TestBadNotifications:
@@ -102,7 +88,10 @@ class TestBadNotifications:
         process_notification(dbsession, notification)
 
         assert notification.status == "bad_notification"
-        assert any("missing mandatory keys" in event for event in notification.events)
+        assert any(
+            "missing mandatory keys" in event
+            for event in get_all_events(dbsession, notification)
+        )
 
     def test_invalid_filename_type(
         self,
@@ -121,7 +110,7 @@ class TestBadNotifications:
         assert notification.status == "bad_notification"
         assert any(
             "filename must be a non-empty string" in event
-            for event in notification.events
+            for event in get_all_events(dbsession, notification)
         )
 
     def test_empty_filename(
@@ -156,7 +145,8 @@ class TestBadNotifications:
 
         assert notification.status == "bad_notification"
         assert any(
-            "folder_name must be a string" in event for event in notification.events
+            "folder_name must be a string" in event
+            for event in get_all_events(dbsession, notification)
         )
 
 
@@ -270,7 +260,10 @@ class TestValidNotificationMissingZimMetadata:
         assert book is not None
         assert book.location_kind == "quarantine"
         assert book.has_error is True
-        assert any("missing mandatory metadata" in event for event in book.events)
+        assert any(
+            "missing mandatory metadata" in event
+            for event in get_all_events(dbsession, book)
+        )
         assert book.needs_processing is False
         assert book.needs_file_operation is False
 
@@ -885,7 +878,7 @@ class TestValidNotificationWithMatchingTitleStableMaturity:
         dbsession.flush()
 
         with patch(
-            "cms_backend.db.book.query_api",
+            "cms_backend.db.book.fetch_zimcheck_result",
             return_value=Response(
                 status_code=HTTPStatus.OK,
                 success=True,
@@ -925,9 +918,9 @@ class TestValidNotificationWithMatchingTitleStableMaturity:
                     "retcode": 1,
                 },
             ),
-        ) as mock_query_api:
+        ) as mock_fetch_zimcheck_result:
             process_notification(dbsession, notification)
-            mock_query_api.assert_called_once()
+            mock_fetch_zimcheck_result.assert_called_once()
 
         assert notification.status == "processed"
 
@@ -981,5 +974,66 @@ class TestValidNotificationOnArchivedTitle:
         assert book.needs_processing is False
         assert any(
             "cannot add book to title because title is archived" in event
-            for event in book.events
+            for event in get_all_events(dbsession, book)
         )
+
+
+class TestNotificationQueryBudget:
+    """Processing a notification costs a fixed number of queries."""
+
+    # processing a notification, whatever the number of collections of the title
+    MAX_QUERIES = 25
+
+    @patch("cms_backend.db.book.get_zimcheck_errors")
+    @pytest.mark.parametrize("nb_collections", [1, 10])
+    def test_query_count_independent_of_collections(
+        self,
+        mock_get_zimcheck_errors: MagicMock,
+        nb_collections: int,
+        dbsession: OrmSession,
+        warehouse: Warehouse,  # noqa: ARG002
+        create_zimfarm_notification: Callable[..., ZimfarmNotification],
+        create_title: Callable[..., Title],
+        create_collection: Callable[..., Collection],
+        create_book: Callable[..., Book],
+    ):
+        mock_get_zimcheck_errors.return_value = []
+        title = create_title(
+            name="test_en_all",
+            flavours=[""],
+            recipe_id=UUID(VALID_NOTIFICATION_CONTENT["recipe_id"]),
+        )
+        title.maturity = "stable"
+        for index in range(nb_collections):
+            collection = create_collection()
+            ct = CollectionTitle(path=Path(f"wikipedia{index}"))
+            ct.title = title
+            ct.collection = collection
+            dbsession.add(ct)
+        # previous books of the title must not be loaded one by one
+        for _ in range(5):
+            book = create_book(
+                name="test_en_all",
+                location_kind="prod",
+                article_count=VALID_NOTIFICATION_CONTENT["article_count"],
+                media_count=VALID_NOTIFICATION_CONTENT["media_count"],
+            )
+            book.title = title
+        notification = create_zimfarm_notification(content=VALID_NOTIFICATION_CONTENT)
+        dbsession.commit()
+
+        with query_budget(
+            dbsession,
+            label="notification",
+            max_queries=self.MAX_QUERIES,
+            raise_exceptions=True,
+        ):
+            process_notification(dbsession, notification)
+            dbsession.flush()
+
+        book = dbsession.query(Book).filter_by(id=notification.id).first()
+        assert book is not None
+        assert len([loc for loc in book.locations if loc.status == "target"]) == (
+            nb_collections
+        )
+        assert book.location_kind == "prod"
@@ -0,0 +1,63 @@
+from collections.abc import Callable
+from datetime import timedelta
+
+from sqlalchemy.orm import Session as OrmSession
+
+from cms_backend.db.event_log import get_all_events
+from cms_backend.db.models import Book
+from cms_backend.mill.context import Context as MillContext
+from cms_backend.mill.mark_staging_books_for_deletion import (
+    mark_staging_books_for_deletion,
+)
+from cms_backend.utils.datetime import getnow
+
+
+def test_mark_staging_books_for_deletion(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    """Only staging books past their lifespan are marked for deletion"""
+    old_date = getnow() - MillContext.staging_books_lifespan - timedelta(days=1)
+    expired_books = [
+        create_book(location_kind="staging", created_at=old_date) for _ in range(3)
+    ]
+    recent_book = create_book(location_kind="staging")
+    prod_book = create_book(location_kind="prod", created_at=old_date)
+    processing_book = create_book(location_kind="staging", created_at=old_date)
+    processing_book.needs_processing = True
+    moving_book = create_book(location_kind="staging", created_at=old_date)
+    moving_book.needs_file_operation = True
+    dbsession.flush()
+
+    mark_staging_books_for_deletion(dbsession)
+
+    for book in expired_books:
+        dbsession.refresh(book)
+        assert book.location_kind == "to_delete"
+        assert book.needs_file_operation is True
+        assert book.deletion_date is not None
+        assert book.deletion_date > getnow()
+        assert any(
+            "marked for deletion" in event for event in get_all_events(dbsession, book)
+        )
+
+    for book in (recent_book, prod_book, processing_book):
+        dbsession.refresh(book)
+        assert book.location_kind != "to_delete"
+        assert book.deletion_date is None
+        assert get_all_events(dbsession, book) == []
+
+    dbsession.refresh(moving_book)
+    assert moving_book.location_kind == "staging"
+
+
+def test_mark_staging_books_for_deletion_no_books(
+    dbsession: OrmSession,
+    create_book: Callable[..., Book],
+):
+    book = create_book(location_kind="staging")
+
+    mark_staging_books_for_deletion(dbsession)
+
+    dbsession.refresh(book)
+    assert book.location_kind == "staging"
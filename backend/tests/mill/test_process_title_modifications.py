@@ -4,7 +4,10 @@ from uuid import uuid4
 from sqlalchemy import select
 from sqlalchemy.orm import Session as OrmSession
 
-from cms_backend.db.event import create_title_modified_event
+from cms_backend.db.event import (
+    create_title_modified_event,
+    create_titles_modified_event,
+)
 from cms_backend.db.models import Book, Event, Title
 from cms_backend.mill.process_title_modifications import process_title_modifications
 from cms_backend.utils.datetime import getnow
@@ -191,3 +194,43 @@ def test_process_title_modifications_processes_matching_book(
     process_title_modifications(dbsession)
     dbsession.refresh(book)
     assert book.title_id == title.id
+
+
+def test_process_titles_modifications_processes_books_of_all_titles(
+    dbsession: OrmSession,
+    create_title: Callable[..., Title],
+    create_book: Callable[..., Book],
+    illustration_48x48_at_1: str,
+):
+    """Test that books matching any title of a coalesced event are processed"""
+    titles = [
+        create_title(name="wikipedia_en_all"),
+        create_title(name="wikipedia_fr_all"),
+        create_title(name="wikipedia_de_all", archived=True),
+    ]
+    books = [
+        create_book(
+            name=title.name,
+            date="2024-01",
+            zim_metadata={
+                "Name": title.name,
+                "Title": "Wikipedia",
+                "Creator": "Wikipedia Contributors",
+                "Publisher": "Kiwix",
+                "Date": "2025-01",
+                "Description": "Wikipedia Encyclopedia",
+                "Language": "eng",
+                "Illustration_48x48@1": illustration_48x48_at_1,
+            },
+        )
+        for title in titles
+    ]
+
+    event = create_titles_modified_event(dbsession, action="created", titles=titles)
+    process_title_modifications(dbsession)
+
+    assert [book.title_id for book in books] == [titles[0].id, titles[1].id, None]
+    assert (
+        dbsession.scalars(select(Event).where(Event.id == event.id)).one_or_none()
+        is None
+    )
@@ -6,6 +6,7 @@ from unittest.mock import patch
 
 from sqlalchemy.orm import Session as OrmSession
 
+from cms_backend.db.event_log import get_all_events
 from cms_backend.db.models import Book, BookLocation, Warehouse
 from cms_backend.shuttle.delete_files import (
     delete_book_files,
@@ -72,7 +73,7 @@ def test_delete_files_inaccessible_warehouse(
 
     assert book.location_kind == "to_delete"
     assert book.needs_file_operation is True
-    assert len(book.events) == 0
+    assert len(get_all_events(dbsession, book)) == 0
 
 
 def test_delete_files_handles_file_deletion_error(
@@ -110,7 +111,8 @@ def test_delete_files_handles_file_deletion_error(
     # Book should be marked with error
     assert book.location_kind == "to_delete"
     assert any(
-        "error encountered while deleting files" in event for event in book.events
+        "error encountered while deleting files" in event
+        for event in get_all_events(dbsession, book)
     )
 
 
@@ -156,7 +158,8 @@ def test_delete_files_handles_errors_and_continues_processing(
 
     # book2 is processed first (older deletion_date) and should have error
     assert any(
-        "error encountered while deleting files" in event for event in book2.events
+        "error encountered while deleting files" in event
+        for event in get_all_events(dbsession, book2)
     )
 
     # book1 is processed second and should succeed
@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 from sqlalchemy.orm import Session as OrmSession
 
+from cms_backend.db.event_log import get_all_events
 from cms_backend.db.models import Book, BookLocation, Title, Warehouse
 from cms_backend.shuttle.move_files import move_book_files
 
@@ -35,7 +36,7 @@ def test_move_book_files_inaccessible_warehouse(
     assert book.has_error is False
     assert book.needs_processing is False
     assert book.needs_file_operation is True
-    assert len(book.events) == 0
+    assert len(get_all_events(dbsession, book)) == 0
 
 
 def test_move_book_files_no_current_location(
@@ -68,7 +69,9 @@ def test_move_book_files_no_current_location(
     assert book.has_error is True
     assert book.needs_processing is False
     assert book.needs_file_operation is True
-    assert any("no current location" in event for event in book.events)
+    assert any(
+        "no current location" in event for event in get_all_events(dbsession, book)
+    )
 
 
 def test_move_book_files_no_target_location(
@@ -95,7 +98,9 @@ def test_move_book_files_no_target_location(
     assert book.needs_processing is False
     assert book.has_error is False
     assert book.needs_file_operation is False
-    assert any("no target location set" in event for event in book.events)
+    assert any(
+        "no target location set" in event for event in get_all_events(dbsession, book)
+    )
 
 
 def test_move_book_files_copy_operation(
@@ -144,8 +149,8 @@ def test_move_book_files_copy_operation(
     assert book.has_error is False
     assert book.needs_file_operation is False
     assert sum(1 for loc in book.locations if loc.status == "current") == 2
-    assert any("copied book from" in event for event in book.events)
-    assert any("deleted book" in event for event in book.events)
+    assert any("copied book from" in event for event in get_all_events(dbsession, book))
+    assert any("deleted book" in event for event in get_all_events(dbsession, book))
 
 
 def test_move_book_files_move_operation(
@@ -191,8 +196,8 @@ def test_move_book_files_move_operation(
     assert book.needs_processing is False
     assert book.has_error is False
     assert book.needs_file_operation is False
-    assert any("copied book from" in event for event in book.events)
-    assert any("deleted book" in event for event in book.events)
+    assert any("copied book from" in event for event in get_all_events(dbsession, book))
+    assert any("deleted book" in event for event in get_all_events(dbsession, book))
     # Current location should be removed
     assert len([loc for loc in book.locations if loc.status == "current"]) == 1
 
@@ -243,8 +248,8 @@ def test_move_book_files_delete_operation(
     assert book.needs_processing is False
     assert book.has_error is False
     assert book.needs_file_operation is False
-    assert any("copied book from" in event for event in book.events)
-    assert any("deleted book" in event for event in book.events)
+    assert any("copied book from" in event for event in get_all_events(dbsession, book))
+    assert any("deleted book" in event for event in get_all_events(dbsession, book))
     assert len([loc for loc in book.locations if loc.status == "current"]) == 1
 
 
@@ -300,8 +305,8 @@ def test_move_book_files_identical_source_and_target_paths(
     assert book.has_error is False
     assert book.needs_file_operation is False
     assert sum(1 for loc in book.locations if loc.status == "current") == 2
-    assert any("left book at" in event for event in book.events)
-    assert any("copied book from" in event for event in book.events)
+    assert any("left book at" in event for event in get_all_events(dbsession, book))
+    assert any("copied book from" in event for event in get_all_events(dbsession, book))
 
 
 def test_move_book_files_updates_book_locations(
@@ -412,8 +417,8 @@ def test_move_book_files_does_not_delete_backup_locations(
     assert book.needs_processing is False
     assert book.has_error is False
     assert book.needs_file_operation is False
-    assert any("copied book from" in event for event in book.events)
-    assert any("deleted book" in event for event in book.events)
+    assert any("copied book from" in event for event in get_all_events(dbsession, book))
+    assert any("deleted book" in event for event in get_all_events(dbsession, book))
     # book still has backup location in addition to the target locations
     assert len([loc for loc in book.locations if loc.status == "current"]) == 2
 
@@ -484,7 +489,7 @@ def test_backup_book_files_does_not_delete_existing_current_locations(
     assert book.needs_processing is False
     assert book.has_error is False
     assert book.needs_file_operation is False
-    assert any("copied book from" in event for event in book.events)
-    assert not any("deleted book" in event for event in book.events)
+    assert any("copied book from" in event for event in get_all_events(dbsession, book))
+    assert not any("deleted book" in event for event in get_all_events(dbsession, book))
     assert len([loc for loc in book.locations if loc.status == "current"]) == 2
     assert len([loc for loc in book.locations if loc.status == "target"]) == 0
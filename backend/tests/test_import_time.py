@@ -0,0 +1,35 @@
+"""Tests that entry points do not import modules only needed on specific paths"""
+
+import subprocess
+import sys
+
+import pytest
+
+# slow to import modules which must only be imported when actually used
+DEFERRED_MODULES = ("alembic", "boto3", "kiwixstorage", "pycountry", "regex")
+
+
+def get_imported_modules(module: str) -> set[str]:
+    """Top-level modules imported by a fresh interpreter importing module"""
+    # -X importtime reports every module imported, on stderr
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        line.rsplit("|", 1)[-1].strip().split(".", 1)[0]
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+
+@pytest.mark.parametrize(
+    "entrypoint",
+    ["cms_backend.api.main", "cms_backend.mill.main", "cms_backend.shuttle.main"],
+)
+def test_entrypoint_does_not_import_deferred_modules(entrypoint: str):
+    imported_modules = get_imported_modules(entrypoint)
+    assert entrypoint.split(".", 1)[0] in imported_modules
+    assert imported_modules.isdisjoint(DEFERRED_MODULES)
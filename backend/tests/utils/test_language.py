@@ -0,0 +1,52 @@
+"""Tests for language codes validation."""
+
+import pytest
+from pytest import MonkeyPatch
+
+from cms_backend import update_language_codes
+from cms_backend.utils.language import (
+    get_supported_language_codes,
+    is_iso_language_code,
+    is_supported_language_code,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_language_codes():
+    yield
+    update_language_codes()
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        pytest.param("eng", True, id="eng"),
+        pytest.param("FRA", True, id="uppercase"),
+        pytest.param("en", False, id="alpha-2"),
+        pytest.param("xyz", False, id="unknown"),
+        pytest.param("", False, id="empty"),
+    ],
+)
+def test_is_supported_language_code(code: str, *, expected: bool):
+    assert is_supported_language_code(code) is expected
+
+
+def test_supported_language_codes_are_computed_once():
+    assert get_supported_language_codes() is get_supported_language_codes()
+
+
+def test_update_language_codes_refreshes_supported_codes(monkeypatch: MonkeyPatch):
+    assert not is_supported_language_code("xyz")
+    assert is_supported_language_code("fra")
+
+    monkeypatch.setattr("cms_backend.context.Context.custom_language_codes", ["xyz"])
+    monkeypatch.setattr(
+        "cms_backend.context.Context.disallowed_language_codes", ["fra"]
+    )
+    update_language_codes()
+
+    assert is_supported_language_code("xyz")
+    assert not is_supported_language_code("fra")
+    # customizations do not alter the list of ISO codes
+    assert not is_iso_language_code("xyz")
+    assert is_iso_language_code("fra")
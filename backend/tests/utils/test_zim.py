@@ -1,6 +1,28 @@
+import json
+
 import pytest
 
-from cms_backend.utils.zim import convert_tags, get_missing_keys
+from cms_backend.utils.zim import (
+    convert_tags,
+    get_missing_keys,
+    parse_zimcheck_log,
+    parse_zimcheck_result,
+)
+
+ZIMCHECK_OUTPUT = json.dumps(
+    {
+        "zimcheck_version": "3.6.0",
+        "checks": ["checksum", "integrity", "url_internal"],
+        "status": False,
+        "logs": [
+            {"check": "url_internal", "level": "ERROR", "message": "not found"},
+            {"check": "url_internal", "level": "ERROR", "message": "not found"},
+            {"check": "redirect", "level": "WARNING", "message": "loop"},
+            {"check": "redirect", "level": "INFO", "message": "loop"},
+        ],
+    },
+    indent=2,
+)
 
 
 @pytest.mark.parametrize(
@@ -49,3 +71,37 @@ def test_libkiwix_convert_tags():
         "_videos:yes",
         "_details:yes",
     ]
+
+
+@pytest.mark.parametrize(
+    "log",
+    [
+        pytest.param(ZIMCHECK_OUTPUT, id="valid"),
+        pytest.param(ZIMCHECK_OUTPUT[:-10], id="truncated"),
+        pytest.param(json.dumps(ZIMCHECK_OUTPUT), id="escaped-quotes"),
+    ],
+)
+def test_parse_zimcheck_log(log: str):
+    summary = parse_zimcheck_log(log, retcode=1)
+    assert summary.zimcheck_version == "3.6.0"
+    assert summary.status is False
+    assert summary.error_count == 2
+    assert summary.warning_count == 1
+    assert summary.retcode == 1
+    assert summary.checks is not None
+    assert len(summary.checks) == 3
+
+
+def test_parse_zimcheck_log_missing_values():
+    summary = parse_zimcheck_log('"level": "error", "LEVEL": warning', retcode=None)
+    assert summary.zimcheck_version is None
+    assert summary.status is None
+    assert summary.checks is None
+    assert summary.error_count == 1
+    assert summary.warning_count == 1
+
+
+def test_parse_zimcheck_result_from_log():
+    summary = parse_zimcheck_result({"log": ZIMCHECK_OUTPUT, "retcode": 1})
+    assert summary.checks == ["checksum", "integrity", "url_internal"]
+    assert summary.error_count == 2
@@ -0,0 +1,98 @@
+"""Tests for zimcheck results fetcher."""
+
+import os
+from datetime import timedelta
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cms_backend.utils.requests import Response
+from cms_backend.utils.zimcheck_fetcher import ZimcheckFetcher
+
+RESULT: dict[str, Any] = {
+    "result": {"status": True, "checks": [], "logs": []},
+    "retcode": 0,
+}
+
+
+@pytest.fixture(params=["memory", "disk"])
+def fetcher(request: pytest.FixtureRequest, tmp_path: Path) -> ZimcheckFetcher:
+    return ZimcheckFetcher(
+        cache_path=tmp_path / "zimcheck" if request.param == "disk" else None,
+        cache_ttl=timedelta(hours=1),
+        concurrency=4,
+        timeout=1,
+    )
+
+
+@pytest.fixture
+def mock_query_api():
+    with patch(
+        "cms_backend.utils.zimcheck_fetcher.query_api",
+        return_value=Response(status_code=HTTPStatus.OK, success=True, json=RESULT),
+    ) as mock:
+        yield mock
+
+
+class TestFetch:
+    def test_result_is_downloaded_once(
+        self, fetcher: ZimcheckFetcher, mock_query_api: MagicMock
+    ):
+        for _ in range(3):
+            response = fetcher.fetch("https://www.example.com/zimcheck.json")
+            assert response.success
+            assert response.json == RESULT
+        mock_query_api.assert_called_once()
+        assert mock_query_api.call_args.kwargs["http_session"] is fetcher.http_session
+
+    def test_failures_are_not_cached(
+        self, fetcher: ZimcheckFetcher, mock_query_api: MagicMock
+    ):
+        mock_query_api.return_value = Response(
+            status_code=HTTPStatus.NOT_FOUND, success=False, json={}
+        )
+        for _ in range(2):
+            assert not fetcher.fetch("https://www.example.com/zimcheck.json").success
+        assert mock_query_api.call_count == 2
+        assert fetcher.get_cached("https://www.example.com/zimcheck.json") is None
+
+    def test_expired_results_are_downloaded_again(
+        self, fetcher: ZimcheckFetcher, mock_query_api: MagicMock
+    ):
+        url = "https://www.example.com/zimcheck.json"
+        fetcher.fetch(url)
+        fetcher.cache_ttl = timedelta(0)
+        if fetcher.cache_path:
+            # file modification time has a coarse resolution on some filesystems
+            cache_file = next(fetcher.cache_path.glob("*.json"))
+            os.utime(cache_file, (0, 0))
+        fetcher.fetch(url)
+        assert mock_query_api.call_count == 2
+
+    def test_clear(self, fetcher: ZimcheckFetcher, mock_query_api: MagicMock):
+        url = "https://www.example.com/zimcheck.json"
+        fetcher.fetch(url)
+        fetcher.clear()
+        assert fetcher.get_cached(url) is None
+        fetcher.fetch(url)
+        assert mock_query_api.call_count == 2
+
+
+class TestPrefetch:
+    def test_prefetch_downloads_missing_results(
+        self, fetcher: ZimcheckFetcher, mock_query_api: MagicMock
+    ):
+        urls = [f"https://www.example.com/{index}.json" for index in range(10)]
+        fetcher.fetch(urls[0])
+
+        # duplicates are only downloaded once, cached results are not downloaded
+        assert fetcher.prefetch([*urls, *urls]) == 9
+        assert mock_query_api.call_count == 10
+
+        assert fetcher.prefetch(urls) == 0
+        for url in urls:
+            assert fetcher.fetch(url).json == RESULT
+        assert mock_query_api.call_count == 10
@@ -27,6 +27,7 @@ async def check_books_need_move() -> Result[PendingBooksNeedOperation]:
         method="GET",
         params={
             "limit": 1,
+            "fields": ["id"],
             "location_kinds": ["quarantine", "staging"],
             "needs_file_operation": "true",
             "updated_before": updated_before.isoformat(timespec="seconds"),
@@ -73,6 +74,7 @@ async def check_books_need_deletion() -> Result[PendingBooksNeedOperation]:
         method="GET",
         params={
             "limit": 1,
+            "fields": ["id"],
             "location_kinds": ["to_delete"],
             "needs_file_operation": "true",
             "updated_before": updated_before.isoformat(timespec="seconds"),